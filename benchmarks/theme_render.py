@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for status message rendering with the bot themes.
+
+Compares the legacy per-fragment BotTheme path (new WZMLStyle instance,
+getattr and format_map for every fragment) with the precompiled
+ThemeTemplates block rendering, for a batch of synthetic tasks.
+
+Usage: python3 benchmarks/theme_render.py [tasks] [rounds]
+"""
+
+from importlib.util import module_from_spec, spec_from_file_location
+from os import path as ospath
+from sys import argv
+from timeit import repeat
+
+THEMES_DIR = ospath.join(
+    ospath.dirname(ospath.abspath(__file__)), "..", "bot", "helper", "themes"
+)
+
+
+def load_module(name):
+    spec = spec_from_file_location(name, ospath.join(THEMES_DIR, f"{name}.py"))
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+wzml_minimal = load_module("wzml_minimal")
+ThemeTemplates = load_module("template_cache").ThemeTemplates
+
+FRAGMENTS = [
+    "STATUS_NAME",
+    "BAR",
+    "PROCESSED",
+    "STATUS",
+    "ETA",
+    "SPEED",
+    "ELAPSED",
+    "ENGINE",
+    "STA_MODE",
+    "SEEDERS",
+    "LEECHERS",
+    "USER",
+    "ID",
+    "BTSEL",
+    "CANCEL",
+]
+
+
+def synthetic_tasks(count):
+    return [
+        {
+            "Name": f"Synthetic.Task.{index}.2160p.WEB-DL.mkv",
+            "Bar": "[■■■■■■▤□□□□□□] 52.3%",
+            "Processed": "1.20GB of 2.30GB",
+            "Status": "Download",
+            "Url": f"https://t.me/c/1000/{index}",
+            "Eta": "3m12s",
+            "Speed": "12.34MB/s",
+            "Elapsed": "1m5s",
+            "Engine": "qBit v4.6.0",
+            "Mode": " #Leech | #qBit",
+            "Seeders": 42,
+            "Leechers": 7,
+            "User": f'<a href="tg://user?id={index}">User {index}</a>',
+            "Id": index,
+            "Btsel": f"/btsel_{index:012d}",
+            "Cancel": f"/cancel_{index:012d}",
+        }
+        for index in range(count)
+    ]
+
+
+def legacy_theme(var_name, **format_vars):
+    return getattr(wzml_minimal.WZMLStyle(), var_name).format_map(format_vars)
+
+
+def render_legacy(tasks):
+    msg = ""
+    for task in tasks:
+        for var_name in FRAGMENTS:
+            msg += legacy_theme(var_name, **task)
+    return msg
+
+
+def render_compiled(tasks, templates):
+    msg = ""
+    for task in tasks:
+        msg += templates.render_block(FRAGMENTS, **task)
+    return msg
+
+
+def main():
+    count = int(argv[1]) if len(argv) > 1 else 500
+    rounds = int(argv[2]) if len(argv) > 2 else 20
+    tasks = synthetic_tasks(count)
+    templates = ThemeTemplates(wzml_minimal.WZMLStyle)
+    assert render_legacy(tasks) == render_compiled(tasks, templates)
+
+    legacy = min(repeat(lambda: render_legacy(tasks), number=1, repeat=rounds))
+    compiled = min(
+        repeat(lambda: render_compiled(tasks, templates), number=1, repeat=rounds)
+    )
+    print(f"Tasks: {count} | Fragments per task: {len(FRAGMENTS)} | Rounds: {rounds}")
+    print(f"Legacy BotTheme   : {legacy * 1000:.2f} ms per render")
+    print(f"Compiled templates: {compiled * 1000:.2f} ms per render")
+    print(f"Speedup           : {legacy / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,9 @@ from logging import (
 )
 from uvloop import install
 
+from bot.helper.ext_utils.task_registry import TaskRegistry
+from bot.helper.ext_utils.task_queue import TaskQueue
+
 # from faulthandler import enable as faulthandler_enable
 # faulthandler_enable()
 
@@ -56,6 +59,7 @@ load_dotenv("config.env", override=True)
 
 Interval = []
 QbInterval = []
+EngineInterval = []
 QbTorrents = {}
 GLOBAL_EXTENSION_FILTER = ["aria2", "!qB"]
 user_data = {}
@@ -65,8 +69,8 @@ shorteners_list = []
 categories_dict = {}
 aria2_options = {}
 qbit_options = {}
-queued_dl = {}
-queued_up = {}
+queued_dl = TaskQueue()
+queued_up = TaskQueue()
 bot_cache = {}
 bot_cache["pkgs"] = ["7z", "rclone", "ffmpeg"]
 non_queued_dl = set()
@@ -85,7 +89,7 @@ status_reply_dict_lock = Lock()
 queue_dict_lock = Lock()
 qb_listener_lock = Lock()
 status_reply_dict = {}
-download_dict = {}
+download_dict = TaskRegistry()
 rss_dict = {}
 
 BOT_TOKEN = environ.get("BOT_TOKEN", "")
@@ -260,6 +264,8 @@ if len(USER_SESSION_STRING) != 0:
         log_error(f"Failed making client from USER_SESSION_STRING : {e}")
         user = ""
 
+HELPER_BOT_TOKENS = environ.get("HELPER_BOT_TOKENS", "")
+
 MEGA_EMAIL = environ.get("MEGA_EMAIL", "")
 MEGA_PASSWORD = environ.get("MEGA_PASSWORD", "")
 if len(MEGA_EMAIL) == 0 or len(MEGA_PASSWORD) == 0:
@@ -388,12 +394,33 @@ QUEUE_DOWNLOAD = "" if len(QUEUE_DOWNLOAD) == 0 else int(QUEUE_DOWNLOAD)
 QUEUE_UPLOAD = environ.get("QUEUE_UPLOAD", "")
 QUEUE_UPLOAD = "" if len(QUEUE_UPLOAD) == 0 else int(QUEUE_UPLOAD)
 
+QUEUE_SJF = environ.get("QUEUE_SJF", "")
+QUEUE_SJF = QUEUE_SJF.lower() == "true"
+
+QUEUE_AGING = environ.get("QUEUE_AGING", "")
+QUEUE_AGING = 600 if len(QUEUE_AGING) == 0 else int(QUEUE_AGING)
+
+QUEUE_MAX_CPU = environ.get("QUEUE_MAX_CPU", "")
+QUEUE_MAX_CPU = "" if len(QUEUE_MAX_CPU) == 0 else int(QUEUE_MAX_CPU)
+
+LINK_CAPACITY = environ.get("LINK_CAPACITY", "")
+LINK_CAPACITY = "" if len(LINK_CAPACITY) == 0 else int(LINK_CAPACITY)
+
+QUEUE_STRETCH = environ.get("QUEUE_STRETCH", "")
+QUEUE_STRETCH = QUEUE_STRETCH.lower() == "true"
+
 INCOMPLETE_TASK_NOTIFIER = environ.get("INCOMPLETE_TASK_NOTIFIER", "")
 INCOMPLETE_TASK_NOTIFIER = INCOMPLETE_TASK_NOTIFIER.lower() == "true"
 
+RESUME_TASKS = environ.get("RESUME_TASKS", "")
+RESUME_TASKS = RESUME_TASKS.lower() == "true"
+
 STOP_DUPLICATE = environ.get("STOP_DUPLICATE", "")
 STOP_DUPLICATE = STOP_DUPLICATE.lower() == "true"
 
+DRIVE_INDEX = environ.get("DRIVE_INDEX", "")
+DRIVE_INDEX = DRIVE_INDEX.lower() == "true"
+
 IS_TEAM_DRIVE = environ.get("IS_TEAM_DRIVE", "")
 IS_TEAM_DRIVE = IS_TEAM_DRIVE.lower() == "true"
 
@@ -427,6 +454,56 @@ DELETE_LINKS = DELETE_LINKS.lower() == "true"
 EQUAL_SPLITS = environ.get("EQUAL_SPLITS", "")
 EQUAL_SPLITS = EQUAL_SPLITS.lower() == "true"
 
+LEECH_SPLIT_LOOKAHEAD = environ.get("LEECH_SPLIT_LOOKAHEAD", "")
+LEECH_SPLIT_LOOKAHEAD = (
+    "" if len(LEECH_SPLIT_LOOKAHEAD) == 0 else int(LEECH_SPLIT_LOOKAHEAD)
+)
+
+LEECH_PARALLEL_UPLOADS = environ.get("LEECH_PARALLEL_UPLOADS", "")
+LEECH_PARALLEL_UPLOADS = (
+    "" if len(LEECH_PARALLEL_UPLOADS) == 0 else int(LEECH_PARALLEL_UPLOADS)
+)
+
+LEECH_PARALLEL_UPLOADS_ALL = environ.get("LEECH_PARALLEL_UPLOADS_ALL", "")
+LEECH_PARALLEL_UPLOADS_ALL = (
+    "" if len(LEECH_PARALLEL_UPLOADS_ALL) == 0 else int(LEECH_PARALLEL_UPLOADS_ALL)
+)
+
+TG_DOWNLOAD_CONNECTIONS = environ.get("TG_DOWNLOAD_CONNECTIONS", "")
+TG_DOWNLOAD_CONNECTIONS = (
+    "" if len(TG_DOWNLOAD_CONNECTIONS) == 0 else int(TG_DOWNLOAD_CONNECTIONS)
+)
+
+TG_DOWNLOAD_CONNECTIONS_ALL = environ.get("TG_DOWNLOAD_CONNECTIONS_ALL", "")
+TG_DOWNLOAD_CONNECTIONS_ALL = (
+    "" if len(TG_DOWNLOAD_CONNECTIONS_ALL) == 0 else int(TG_DOWNLOAD_CONNECTIONS_ALL)
+)
+
+GDRIVE_PARALLEL_UPLOADS = environ.get("GDRIVE_PARALLEL_UPLOADS", "")
+GDRIVE_PARALLEL_UPLOADS = (
+    "" if len(GDRIVE_PARALLEL_UPLOADS) == 0 else int(GDRIVE_PARALLEL_UPLOADS)
+)
+
+GDRIVE_PARALLEL_UPLOADS_ALL = environ.get("GDRIVE_PARALLEL_UPLOADS_ALL", "")
+GDRIVE_PARALLEL_UPLOADS_ALL = (
+    "" if len(GDRIVE_PARALLEL_UPLOADS_ALL) == 0 else int(GDRIVE_PARALLEL_UPLOADS_ALL)
+)
+
+GDRIVE_PARALLEL_COPIES = environ.get("GDRIVE_PARALLEL_COPIES", "")
+GDRIVE_PARALLEL_COPIES = (
+    "" if len(GDRIVE_PARALLEL_COPIES) == 0 else int(GDRIVE_PARALLEL_COPIES)
+)
+
+GDRIVE_PARALLEL_DOWNLOADS = environ.get("GDRIVE_PARALLEL_DOWNLOADS", "")
+GDRIVE_PARALLEL_DOWNLOADS = (
+    "" if len(GDRIVE_PARALLEL_DOWNLOADS) == 0 else int(GDRIVE_PARALLEL_DOWNLOADS)
+)
+
+GDRIVE_DOWNLOAD_MEMORY = environ.get("GDRIVE_DOWNLOAD_MEMORY", "")
+GDRIVE_DOWNLOAD_MEMORY = (
+    "" if len(GDRIVE_DOWNLOAD_MEMORY) == 0 else int(GDRIVE_DOWNLOAD_MEMORY)
+)
+
 MEDIA_GROUP = environ.get("MEDIA_GROUP", "")
 MEDIA_GROUP = MEDIA_GROUP.lower() == "true"
 
@@ -691,9 +768,20 @@ config_dict = {
     "GDTOT_CRYPT": GDTOT_CRYPT,
     "JIODRIVE_TOKEN": JIODRIVE_TOKEN,
     "EQUAL_SPLITS": EQUAL_SPLITS,
+    "LEECH_SPLIT_LOOKAHEAD": LEECH_SPLIT_LOOKAHEAD,
+    "LEECH_PARALLEL_UPLOADS": LEECH_PARALLEL_UPLOADS,
+    "LEECH_PARALLEL_UPLOADS_ALL": LEECH_PARALLEL_UPLOADS_ALL,
+    "TG_DOWNLOAD_CONNECTIONS": TG_DOWNLOAD_CONNECTIONS,
+    "TG_DOWNLOAD_CONNECTIONS_ALL": TG_DOWNLOAD_CONNECTIONS_ALL,
+    "GDRIVE_PARALLEL_UPLOADS": GDRIVE_PARALLEL_UPLOADS,
+    "GDRIVE_PARALLEL_UPLOADS_ALL": GDRIVE_PARALLEL_UPLOADS_ALL,
+    "GDRIVE_PARALLEL_COPIES": GDRIVE_PARALLEL_COPIES,
+    "GDRIVE_PARALLEL_DOWNLOADS": GDRIVE_PARALLEL_DOWNLOADS,
+    "GDRIVE_DOWNLOAD_MEMORY": GDRIVE_DOWNLOAD_MEMORY,
     "EXTENSION_FILTER": EXTENSION_FILTER,
     "GDRIVE_ID": GDRIVE_ID,
     "INCOMPLETE_TASK_NOTIFIER": INCOMPLETE_TASK_NOTIFIER,
+    "RESUME_TASKS": RESUME_TASKS,
     "INDEX_URL": INDEX_URL,
     "IS_TEAM_DRIVE": IS_TEAM_DRIVE,
     "LEECH_FILENAME_PREFIX": LEECH_FILENAME_PREFIX,
@@ -715,6 +803,11 @@ config_dict = {
     "QUEUE_ALL": QUEUE_ALL,
     "QUEUE_DOWNLOAD": QUEUE_DOWNLOAD,
     "QUEUE_UPLOAD": QUEUE_UPLOAD,
+    "QUEUE_SJF": QUEUE_SJF,
+    "QUEUE_AGING": QUEUE_AGING,
+    "QUEUE_MAX_CPU": QUEUE_MAX_CPU,
+    "LINK_CAPACITY": LINK_CAPACITY,
+    "QUEUE_STRETCH": QUEUE_STRETCH,
     "RCLONE_FLAGS": RCLONE_FLAGS,
     "RCLONE_PATH": RCLONE_PATH,
     "RCLONE_SERVE_URL": RCLONE_SERVE_URL,
@@ -737,6 +830,7 @@ config_dict = {
     "STATUS_LIMIT": STATUS_LIMIT,
     "STATUS_UPDATE_INTERVAL": STATUS_UPDATE_INTERVAL,
     "STOP_DUPLICATE": STOP_DUPLICATE,
+    "DRIVE_INDEX": DRIVE_INDEX,
     "SUDO_USERS": SUDO_USERS,
     "TELEGRAM_API": TELEGRAM_API,
     "TELEGRAM_HASH": TELEGRAM_HASH,
@@ -745,6 +839,7 @@ config_dict = {
     "UPSTREAM_BRANCH": UPSTREAM_BRANCH,
     "UPGRADE_PACKAGES": UPGRADE_PACKAGES,
     "USER_SESSION_STRING": USER_SESSION_STRING,
+    "HELPER_BOT_TOKENS": HELPER_BOT_TOKENS,
     "USER_TD_MODE": USER_TD_MODE,
     "USER_TD_SA": USER_TD_SA,
     "USE_SERVICE_ACCOUNTS": USE_SERVICE_ACCOUNTS,
@@ -899,6 +994,25 @@ bot = wztgClient(
     parse_mode=enums.ParseMode.HTML,
 ).start()
 bot_loop = bot.loop
+
+helper_bots = []
+if len(HELPER_BOT_TOKENS) != 0:
+    log_info("Creating helper clients from HELPER_BOT_TOKENS")
+    for index, token in enumerate(HELPER_BOT_TOKENS.split()):
+        try:
+            helper_bots.append(
+                wztgClient(
+                    f"helper{index}",
+                    TELEGRAM_API,
+                    TELEGRAM_HASH,
+                    bot_token=token,
+                    parse_mode=enums.ParseMode.HTML,
+                    no_updates=True,
+                    in_memory=True,
+                ).start()
+            )
+        except Exception as e:
+            log_error(f"Failed making helper client {index} : {e}")
 bot_name = bot.me.username
 scheduler = AsyncIOScheduler(timezone=str(get_localzone()), event_loop=bot_loop)
 
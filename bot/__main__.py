@@ -31,6 +31,7 @@ from time import time
 from bot import (
     bot,
     user,
+    helper_bots,
     bot_name,
     config_dict,
     user_data,
@@ -39,11 +40,23 @@ from bot import (
     Interval,
     DATABASE_URL,
     QbInterval,
+    EngineInterval,
     INCOMPLETE_TASK_NOTIFIER,
     scheduler,
+    aria2,
+    get_client,
+    download_dict,
+    download_dict_lock,
+    non_queued_dl,
+    queue_dict_lock,
 )
 from bot.version import get_version
-from .helper.ext_utils.fs_utils import start_cleanup, clean_all, exit_clean_up
+from .helper.ext_utils.fs_utils import (
+    start_cleanup,
+    clean_all,
+    exit_clean_up,
+    get_path_size,
+)
 from .helper.ext_utils.bot_utils import (
     get_readable_time,
     cmd_exec,
@@ -54,7 +67,18 @@ from .helper.ext_utils.bot_utils import (
     get_stats,
 )
 from .helper.ext_utils.db_handler import DbManger
+from .helper.ext_utils.task_journal import (
+    journal_enabled,
+    DOWNLOAD_STAGES,
+    UPLOAD_STAGES,
+)
+from .helper.ext_utils.batch_engine import batch_options
+from .helper.ext_utils.engine_poller import start_engine_poller
+from .helper.ext_utils.sys_metrics import start_metrics_sampler, get_metrics
 from .helper.telegram_helper.bot_commands import BotCommands
+from .helper.telegram_helper.client_pool import upload_clients
+from .helper.telegram_helper.copy_sender import copy_sender
+from .helper.telegram_helper.session_pool import user_sessions
 from .helper.telegram_helper.message_utils import (
     sendMessage,
     editMessage,
@@ -62,10 +86,18 @@ from .helper.telegram_helper.message_utils import (
     sendFile,
     deleteMessage,
     delete_all_messages,
+    status_editor,
+    sendStatusMessage,
 )
 from .helper.telegram_helper.filters import CustomFilters
 from .helper.telegram_helper.button_build import ButtonMaker
 from .helper.listeners.aria2_listener import start_aria2_listener
+from .helper.listeners.qbit_listener import onDownloadStart as qb_download_start
+from .helper.listeners.tasks_listener import MirrorLeechListener
+from .helper.mirror_utils.upload_utils.gdriveTools import start_drive_index
+from .helper.mirror_utils.status_utils.aria2_status import Aria2Status
+from .helper.mirror_utils.status_utils.qbit_status import QbittorrentStatus
+from .helper.mirror_utils.status_utils.queue_status import QueueStatus
 from .helper.themes import BotTheme
 from .modules import (
     authorize,
@@ -180,7 +212,7 @@ async def restart(client, message):
     if scheduler.running:
         scheduler.shutdown(wait=False)
     await delete_all_messages()
-    for interval in [QbInterval, Interval]:
+    for interval in [QbInterval, Interval, EngineInterval]:
         if interval:
             interval[0].cancel()
     await sync_to_async(clean_all)
@@ -335,6 +367,93 @@ async def restart_notification():
         await aioremove(".restartmsg")
 
 
+async def reattach_download(listener, row):
+    if row["engine"] == "aria2":
+        try:
+            download = await sync_to_async(aria2.get_download, row["handle"])
+            while download.followed_by_ids:
+                download = await sync_to_async(
+                    aria2.get_download, download.followed_by_ids[0]
+                )
+        except Exception:
+            return False
+        if download.is_removed or download.has_failed:
+            return False
+        async with download_dict_lock:
+            download_dict[listener.uid] = Aria2Status(download.gid, listener)
+        async with queue_dict_lock:
+            non_queued_dl.add(listener.uid)
+        if download.is_complete:
+            create_task(listener.onDownloadComplete())
+        elif download.is_paused:
+            await sync_to_async(aria2.client.unpause, download.gid)
+    elif row["engine"] == "qbit":
+        client = await sync_to_async(get_client)
+        tag = f"{listener.uid}"
+        if not await sync_to_async(client.torrents_info, tag=tag):
+            return False
+        async with download_dict_lock:
+            download_dict[listener.uid] = QbittorrentStatus(listener)
+        async with queue_dict_lock:
+            non_queued_dl.add(listener.uid)
+        await qb_download_start(tag)
+        await sync_to_async(client.torrents_resume, torrent_hashes=row["handle"])
+    else:
+        return False
+    LOGGER.info(f"Reattached to {row['engine']} download: {row['handle']}")
+    return True
+
+
+async def resume_task(row):
+    message = await bot.get_messages(row["cid"], row["msg_id"])
+    if message is None or message.empty or not message.text:
+        LOGGER.warning(f"Task {row['_id']} not resumed, command message not found")
+        await DbManger().rm_journal(row["_id"])
+        return
+    if message.from_user is None or message.from_user.id != row["user_id"]:
+        message.from_user = await bot.get_users(row["user_id"])
+    options = row["options"]
+    LOGGER.info(f"Resuming Task {row['_id']} from {row['stage']}")
+    listener = MirrorLeechListener(message, **options)
+    if row["stage"] in DOWNLOAD_STAGES:
+        if await reattach_download(listener, row):
+            await sendStatusMessage(message)
+            return
+        # run the command again, the downloaders continue the partial files
+        await DbManger().rm_journal(row["_id"])
+        text = message.text.split("\n")
+        input_list = text[0].split(" ")
+        text[0] = " ".join([input_list[0], *batch_options(input_list[1:])])
+        message.text = "\n".join(text)
+        if options["isYtdlp"]:
+            ytdlp._ytdl(bot, message, isLeech=options["isLeech"])
+        else:
+            mirror_leech._mirror_leech(
+                bot, message, isQbit=options["isQbit"], isLeech=options["isLeech"]
+            )
+        return
+    listener.resumed_uploads = row.get("uploaded", [])
+    size = await get_path_size(listener.dir)
+    async with download_dict_lock:
+        download_dict[listener.uid] = QueueStatus(
+            row["name"], size, row["gid"], listener, "Up"
+        )
+    await sendStatusMessage(message)
+    if row["stage"] in UPLOAD_STAGES and row.get("up_path"):
+        create_task(listener.start_upload(row["up_path"], row["name"], row["gid"]))
+    else:
+        create_task(listener.onDownloadComplete())
+
+
+async def resume_tasks(journal):
+    for row in journal:
+        try:
+            await resume_task(row)
+        except Exception as e:
+            LOGGER.error(f"Task {row['_id']} not resumed: {e}")
+            await DbManger().rm_journal(row["_id"])
+
+
 async def log_check():
     if config_dict["LEECH_LOG_ID"]:
         for chat_id in config_dict["LEECH_LOG_ID"].split():
@@ -595,13 +714,27 @@ def verify_api_signature(func):
 def api_get_status():
     """Get bot status information"""
     try:
-        # Get real bot stats using the existing stats function
-        downloads = 0  # Will be updated with real data
-        
+        from bot import download_dict, bot_cache
+
+        downloads = len(download_dict)
+        speed_totals = bot_cache.get("speed_totals", {})
+        metrics = get_metrics()
+
         return jsonify({
             "status": "success",
             "bot_status": "online",
             "active_downloads": downloads,
+            "dl_speed": speed_totals.get("dl", 0),
+            "up_speed": speed_totals.get("up", 0),
+            "status_edits": status_editor.stats,
+            "upload_clients": upload_clients.stats(),
+            "leech_copies": copy_sender.stats,
+            "system": {
+                "cpu": metrics["cpu"],
+                "ram": metrics["memory"].percent,
+                "disk_free": metrics["dl_disk"].free,
+                **metrics["rates"],
+            },
             "bot_available": True,
             "download_dir": "/usr/src/app/downloads",
             "message": "Bot status retrieved successfully",
@@ -732,7 +865,7 @@ def api_leech():
                 async def execute_leech():
                     """Wrapper to execute leech command with proper error handling"""
                     try:
-                        await _mirror_leech(bot, fake_message, isQbit=False, isLeech=True, sameDir=None, bulk=[])
+                        await _mirror_leech(bot, fake_message, isQbit=False, isLeech=True, sameDir=None)
                         LOGGER.info(f"Leech command executed successfully for task: {task_id}")
                     except Exception as e:
                         LOGGER.error(f"Error in leech execution: {e}")
@@ -789,6 +922,10 @@ def api_get_downloads():
                 "speed": getattr(task, 'speed', lambda: '0 B/s')() if callable(getattr(task, 'speed', None)) else getattr(task, 'speed', '0 B/s'),
                 "eta": getattr(task, 'eta', lambda: 'Unknown')() if callable(getattr(task, 'eta', None)) else getattr(task, 'eta', 'Unknown'),
                 "status": getattr(task, 'status', lambda: 'Unknown')() if callable(getattr(task, 'status', None)) else getattr(task, 'status', 'Unknown'),
+                "processed_bytes": task.processed_raw() if hasattr(task, 'processed_raw') else 0,
+                "size_bytes": task.size_raw() if hasattr(task, 'size_raw') else 0,
+                "speed_bytes": task.speed_raw() if hasattr(task, 'speed_raw') else 0,
+                "eta_seconds": task.eta_raw() if hasattr(task, 'eta_raw') else None,
                 "task_id": task_id
             })
         
@@ -881,7 +1018,7 @@ def api_mirror():
                 async def execute_mirror():
                     """Wrapper to execute mirror command with proper error handling"""
                     try:
-                        await _mirror_leech(bot, mock_message, isQbit=False, isLeech=False, sameDir=None, bulk=[])
+                        await _mirror_leech(bot, mock_message, isQbit=False, isLeech=False, sameDir=None)
                         LOGGER.info(f"Mirror command executed successfully for task: {task_id}")
                     except Exception as e:
                         LOGGER.error(f"Error in mirror execution: {e}")
@@ -1027,15 +1164,22 @@ async def main():
     
     # Store bot loop for API access
     bot_loop = bot.loop
+    journal = await DbManger().get_journal() if journal_enabled() else []
     await gather(
-        start_cleanup(),
+        start_cleanup([row["_id"] for row in journal]),
         torrent_search.initiate_search_tools(),
         restart_notification(),
         search_images(),
         set_commands(bot),
         log_check(),
+        upload_clients.verify(config_dict["LEECH_LOG_ID"]),
     )
     await sync_to_async(start_aria2_listener, wait=False)
+    start_engine_poller()
+    start_metrics_sampler()
+    start_drive_index()
+    if journal:
+        create_task(resume_tasks(journal))
 
     api_thread = Thread(target=start_integrated_api, daemon=True)
     api_thread.start()
@@ -1085,6 +1229,8 @@ async def main():
     LOGGER.info(f"WZML-X Bot [@{bot_name}] Started!")
     if user:
         LOGGER.info(f"WZ's User [@{user.me.username}] Ready!")
+    for helper in helper_bots:
+        LOGGER.info(f"Helper Bot [@{helper.me.username}] Ready!")
     
     # Register signal handlers
     signal(SIGINT, exit_with_cleanup)
@@ -1093,10 +1239,10 @@ async def main():
 
 async def stop_signals():
     # Call the shutdown handler when stopping signals are received
+    clients = [bot, *helper_bots]
     if user:
-        await gather(bot.stop(), user.stop())
-    else:
-        await bot.stop()
+        clients.append(user)
+    await gather(*(client.stop() for client in clients), user_sessions.stop_all())
 
 
 bot_run = bot.loop.run_until_complete
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+from asyncio import sleep
+from re import match as re_match
+
+from bot import download_dict, LOGGER
+from bot.helper.ext_utils.bot_utils import new_task
+from bot.helper.telegram_helper.message_utils import sendMessage, editMessage
+from bot.helper.telegram_helper.copy_sender import copy_sender
+
+BATCH_EDIT_INTERVAL = 5
+
+batches = {}
+
+
+class BatchJob:
+    def __init__(self, message, title, total, sameDir=None):
+        self.message = message
+        self.title = title
+        self.total = total
+        self.started = 0
+        self.done = 0
+        self.failed = 0
+        self.__sameDir = sameDir
+        self.__running = set()
+        self.__status_msg = None
+        self.__updating = False
+        self.__dirty = False
+
+    def add(self, uid, task):
+        batches[uid] = self
+        self.__running.add(uid)
+        self.started += 1
+        task.add_done_callback(lambda _: self.__check_started(uid))
+        self.refresh()
+
+    @new_task
+    async def start_items(self, items, start):
+        futures = [
+            copy_sender.submit(reply_to.chat.id, sendMessage, reply_to, text)
+            for reply_to, text in items
+        ]
+        for future in futures:
+            try:
+                nextmsg = await future
+            except Exception as e:
+                nextmsg = str(e)
+            if isinstance(nextmsg, str):
+                LOGGER.error(f"Batch task not started: {nextmsg}")
+                self.finish(None, False)
+                continue
+            nextmsg.from_user = self.message.from_user
+            if self.__sameDir:
+                self.__sameDir["tasks"].add(nextmsg.id)
+            self.add(nextmsg.id, start(nextmsg))
+
+    def __check_started(self, uid):
+        # the command returned without creating a task, e.g. invalid link
+        if uid in self.__running and uid not in download_dict:
+            if self.__sameDir and uid in self.__sameDir["tasks"]:
+                self.__sameDir["tasks"].remove(uid)
+                self.__sameDir["total"] -= 1
+            self.finish(uid, False)
+
+    def finish(self, uid, success):
+        if uid is not None:
+            if uid not in self.__running:
+                return
+            self.__running.discard(uid)
+            batches.pop(uid, None)
+        elif self.__sameDir:
+            self.__sameDir["total"] -= 1
+        if success:
+            self.done += 1
+        else:
+            self.failed += 1
+        self.refresh()
+
+    def refresh(self):
+        self.__dirty = True
+        if not self.__updating:
+            self.__updating = True
+            self.__update()
+
+    @new_task
+    async def __update(self):
+        try:
+            while self.__dirty:
+                self.__dirty = False
+                if self.__status_msg is None:
+                    self.__status_msg = await sendMessage(self.message, self.__text())
+                    if isinstance(self.__status_msg, str):
+                        self.__status_msg = None
+                        break
+                else:
+                    await editMessage(self.__status_msg, self.__text())
+                await sleep(BATCH_EDIT_INTERVAL)
+        except Exception as e:
+            LOGGER.error(f"Batch status error: {e}")
+        finally:
+            self.__updating = False
+
+    def __text(self):
+        msg = f"<b>{self.title}</b>\n"
+        msg += f"┠ <b>Started:</b> {self.started}/{self.total}\n"
+        msg += f"┠ <b>Running:</b> {len(self.__running)}\n"
+        msg += f"┠ <b>Completed:</b> {self.done}\n"
+        msg += f"┖ <b>Failed:</b> {self.failed}"
+        if self.done + self.failed >= self.total:
+            msg += "\n\n<i>Batch Finished!</i>"
+        return msg
+
+
+def batch_finished(uid, success):
+    if (batch := batches.get(uid)) is not None:
+        batch.finish(uid, success)
+
+
+def batch_options(tokens):
+    # command args without -i and -b and their values
+    options = []
+    tokens = [token.strip() for token in tokens if token.strip()]
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token == "-i":
+            i += 2
+            continue
+        if token in ["-b", "-bulk"]:
+            i += 1
+            if i < len(tokens) and re_match(r"^(\d+:?\d*|:\d+)$", tokens[i]):
+                i += 1
+            continue
+        options.append(token)
+        i += 1
+    return options
+
+
+def bulk_commands(input_list, links):
+    options = batch_options(input_list[1:])
+    commands = []
+    for line in links:
+        parts = line.split()
+        index = next((i for i, part in enumerate(parts) if part.startswith("-")), None)
+        if index is None:
+            index = len(parts)
+        # options written next to a link override the shared ones
+        command = [input_list[0], *parts[:index], *options]
+        command.extend(batch_options(parts[index:]))
+        commands.append(" ".join(command))
+    return commands
+
+
+async def multi_commands(client, message, input_list, multi):
+    if not message.reply_to_message_id:
+        return []
+    command = " ".join([input_list[0], *batch_options(input_list[1:])])
+    msgs = await client.get_messages(
+        chat_id=message.chat.id,
+        message_ids=[message.reply_to_message_id + index for index in range(1, multi)],
+    )
+    return [(msg, command) for msg in msgs if msg and not msg.empty]
+
+
+def run_batch(message, title, items, start, sameDir=None, current=None):
+    """
+    items: (reply_to, text) of the command message sent for every task, start
+    is called with that message once it is sent. current is the task of the
+    running command when it is the first task of the batch.
+    """
+    batch = BatchJob(message, title, len(items) + int(current is not None), sameDir)
+    if sameDir:
+        sameDir["total"] = batch.total
+    if current is not None:
+        batch.add(message.id, current)
+    batch.start_items(items, start)
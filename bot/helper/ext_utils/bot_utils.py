@@ -11,19 +11,6 @@ from time import time
 from html import escape
 from uuid import uuid4
 from subprocess import run as srun
-from psutil import (
-    disk_usage,
-    disk_io_counters,
-    Process,
-    cpu_percent,
-    swap_memory,
-    cpu_count,
-    cpu_freq,
-    getloadavg,
-    virtual_memory,
-    net_io_counters,
-    boot_time,
-)
 from asyncio import (
     create_subprocess_exec,
     create_subprocess_shell,
@@ -35,7 +22,6 @@ from functools import partial, wraps
 from concurrent.futures import ThreadPoolExecutor
 
 from aiohttp import ClientSession as aioClientSession
-from psutil import virtual_memory, cpu_percent, disk_usage
 from requests import get as rget
 try:
     from mega import MegaApi
@@ -46,7 +32,8 @@ from pyrogram.types import BotCommand
 from pyrogram.errors import PeerIdInvalid
 
 from bot.helper.ext_utils.db_handler import DbManger
-from bot.helper.themes import BotTheme
+from bot.helper.themes import BotTheme, BotThemeBlock
+from bot.helper.ext_utils.sys_metrics import get_metrics
 from bot.version import get_version
 from bot import (
     OWNER_ID,
@@ -74,6 +61,7 @@ THREADPOOL = ThreadPoolExecutor(max_workers=1000)
 MAGNET_REGEX = r"magnet:\?xt=urn:(btih|btmh):[a-zA-Z0-9]*\s*"
 URL_REGEX = r"^(?!\/)(rtmps?:\/\/|mms:\/\/|rtsp:\/\/|https?:\/\/|ftp:\/\/)?([^\/:]+:[^\/@]+@)?(www\.)?(?=[^\/:\s]+\.[^\/:\s]+)([^\/:\s]+\.[^\/:\s]+)(:\d+)?(\/[^#\s]*[\s\S]*)?(\?[^#\s]*)?(#.*)?$"
 SIZE_UNITS = ["B", "KB", "MB", "GB", "TB", "PB", "EB"]
+TIME_UNITS = {"w": 604800, "d": 86400, "h": 3600, "m": 60, "s": 1}
 STATUS_START = 0
 PAGES = 1
 PAGE_NO = 1
@@ -121,26 +109,41 @@ def get_readable_file_size(size_in_bytes):
     )
 
 
+def text_size_to_bytes(size_text):
+    size_text = size_text.strip().rstrip("/s").replace("i", "").replace(" ", "")
+    unit = size_text.lstrip("0123456789.").upper() or "B"
+    try:
+        return float(size_text[: len(size_text) - len(unit)] or 0) * 1024 ** (
+            SIZE_UNITS.index(unit if unit.endswith("B") else f"{unit}B")
+        )
+    except ValueError:
+        return 0
+
+
+def time_to_seconds(time_text):
+    seconds, value = 0, ""
+    for char in time_text.strip():
+        if char.isdigit() or char == ".":
+            value += char
+        elif char in TIME_UNITS and value:
+            seconds += float(value) * TIME_UNITS[char]
+            value = ""
+    return seconds
+
+
 async def getDownloadByGid(gid):
     async with download_dict_lock:
-        return next((dl for dl in download_dict.values() if dl.gid() == gid), None)
+        return download_dict.get_by_gid(gid)
 
 
 async def getAllDownload(req_status, user_id=None):
-    dls = []
     async with download_dict_lock:
-        for dl in list(download_dict.values()):
-            if user_id and user_id != dl.message.from_user.id:
-                continue
-            status = dl.status()
-            if req_status in ["all", status]:
-                dls.append(dl)
-    return dls
+        return download_dict.get_tasks(req_status, user_id)
 
 
 async def get_user_tasks(user_id, maxtask):
-    if tasks := await getAllDownload("all", user_id):
-        return len(tasks) >= maxtask
+    async with download_dict_lock:
+        return download_dict.count(user_id=user_id) >= maxtask
 
 
 def bt_selection_buttons(id_):
@@ -276,129 +279,139 @@ def get_readable_message():
             else ""
         )
         elapsed = time() - download.message.date.timestamp()
-        msg += BotTheme(
-            "STATUS_NAME",
-            Name=(
+        tstatus = download.status()
+        fragments = ["STATUS_NAME"]
+        values = {
+            "Name": (
                 "Task is being Processed!"
                 if config_dict["SAFE_MODE"]
                 and elapsed >= config_dict["STATUS_UPDATE_INTERVAL"]
                 else escape(f"{download.name()}")
             ),
-        )
-        if download.status() not in [
+            "Status": tstatus,
+            "Url": msg_link,
+            "Engine": download.eng(),
+        }
+        if tstatus not in [
             MirrorStatus.STATUS_SPLITTING,
             MirrorStatus.STATUS_SEEDING,
             MirrorStatus.STATUS_METADATA,
         ]:
-            msg += BotTheme(
+            progress = download.progress()
+            fragments += [
                 "BAR",
-                Bar=f"{get_progress_bar_string(download.progress())} {download.progress()}",
-            )
-            msg += BotTheme(
                 "PROCESSED",
+                "STATUS",
+                "ETA",
+                "SPEED",
+                "ELAPSED",
+                "ENGINE",
+                "STA_MODE",
+            ]
+            values.update(
+                Bar=f"{get_progress_bar_string(progress)} {progress}",
                 Processed=f"{download.processed_bytes()} of {download.size()}",
+                Eta=download.eta(),
+                Speed=download.speed(),
+                Elapsed=get_readable_time(elapsed),
+                Mode=download.upload_details["mode"],
             )
-            msg += BotTheme("STATUS", Status=download.status(), Url=msg_link)
-            msg += BotTheme("ETA", Eta=download.eta())
-            msg += BotTheme("SPEED", Speed=download.speed())
-            msg += BotTheme("ELAPSED", Elapsed=get_readable_time(elapsed))
-            msg += BotTheme("ENGINE", Engine=download.eng())
-            msg += BotTheme("STA_MODE", Mode=download.upload_details["mode"])
             if hasattr(download, "seeders_num"):
                 try:
-                    msg += BotTheme("SEEDERS", Seeders=download.seeders_num())
-                    msg += BotTheme("LEECHERS", Leechers=download.leechers_num())
+                    values.update(
+                        Seeders=download.seeders_num(),
+                        Leechers=download.leechers_num(),
+                    )
+                    fragments += ["SEEDERS", "LEECHERS"]
                 except Exception:
                     pass
-        elif download.status() == MirrorStatus.STATUS_SEEDING:
-            msg += BotTheme("STATUS", Status=download.status(), Url=msg_link)
-            msg += BotTheme("SEED_SIZE", Size=download.size())
-            msg += BotTheme("SEED_SPEED", Speed=download.upload_speed())
-            msg += BotTheme("UPLOADED", Upload=download.uploaded_bytes())
-            msg += BotTheme("RATIO", Ratio=download.ratio())
-            msg += BotTheme("TIME", Time=download.seeding_time())
-            msg += BotTheme("SEED_ENGINE", Engine=download.eng())
-        else:
-            msg += BotTheme("STATUS", Status=download.status(), Url=msg_link)
-            msg += BotTheme("STATUS_SIZE", Size=download.size())
-            msg += BotTheme("NON_ENGINE", Engine=download.eng())
-
-        msg += BotTheme("USER", User=download.message.from_user.mention(style="html"))
-        msg += BotTheme("ID", Id=download.message.from_user.id)
-        if (download.eng()).startswith("qBit"):
-            msg += BotTheme(
-                "BTSEL", Btsel=f"/{BotCommands.BtSelectCommand}_{download.gid()}"
+        elif tstatus == MirrorStatus.STATUS_SEEDING:
+            fragments += [
+                "STATUS",
+                "SEED_SIZE",
+                "SEED_SPEED",
+                "UPLOADED",
+                "RATIO",
+                "TIME",
+                "SEED_ENGINE",
+            ]
+            values.update(
+                Size=download.size(),
+                Speed=download.upload_speed(),
+                Upload=download.uploaded_bytes(),
+                Ratio=download.ratio(),
+                Time=download.seeding_time(),
             )
-        msg += BotTheme(
-            "CANCEL", Cancel=f"/{BotCommands.CancelMirror}_{download.gid()}"
+        else:
+            fragments += ["STATUS", "STATUS_SIZE", "NON_ENGINE"]
+            values["Size"] = download.size()
+
+        fragments += ["USER", "ID"]
+        values.update(
+            User=download.message.from_user.mention(style="html"),
+            Id=download.message.from_user.id,
+            Cancel=f"/{BotCommands.CancelMirror}_{download.gid()}",
         )
+        if values["Engine"].startswith("qBit"):
+            fragments.append("BTSEL")
+            values["Btsel"] = f"/{BotCommands.BtSelectCommand}_{download.gid()}"
+        fragments.append("CANCEL")
+        msg += BotThemeBlock(fragments, **values)
 
     if len(msg) == 0:
         return None, None
 
-    dl_speed = 0
-
-    def convert_speed_to_bytes_per_second(spd):
-        if "K" in spd:
-            return float(spd.split("K")[0]) * 1024
-        elif "M" in spd:
-            return float(spd.split("M")[0]) * 1048576
-        elif "G" in spd:
-            return float(spd.split("G")[0]) * 1073741824
-        elif "T" in spd:
-            return float(spd.split("T")[0]) * 1099511627776
-        else:
-            return 0
-
-    dl_speed = 0
-    up_speed = 0
-    for download in download_dict.values():
-        tstatus = download.status()
-        spd = (
-            download.speed()
-            if tstatus != MirrorStatus.STATUS_SEEDING
-            else download.upload_speed()
-        )
-        speed_in_bytes_per_second = convert_speed_to_bytes_per_second(spd)
-        if tstatus == MirrorStatus.STATUS_DOWNLOADING:
-            dl_speed += speed_in_bytes_per_second
-        elif tstatus in [
-            MirrorStatus.STATUS_UPLOADING,
-            MirrorStatus.STATUS_SEEDING,
-        ]:
-            up_speed += speed_in_bytes_per_second
-
-    msg += BotTheme("FOOTER")
+    speed_totals = get_speed_totals()
+    footer = ["FOOTER"]
     buttons = ButtonMaker()
     buttons.ibutton(BotTheme("REFRESH", Page=f"{PAGE_NO}/{PAGES}"), "status ref")
     if tasks > STATUS_LIMIT:
-        if config_dict["BOT_MAX_TASKS"]:
-            msg += BotTheme(
-                "BOT_TASKS",
-                Tasks=tasks,
-                Ttask=config_dict["BOT_MAX_TASKS"],
-                Free=config_dict["BOT_MAX_TASKS"] - tasks,
-            )
-        else:
-            msg += BotTheme("TASKS", Tasks=tasks)
+        footer.append("BOT_TASKS" if config_dict["BOT_MAX_TASKS"] else "TASKS")
         buttons = ButtonMaker()
         buttons.ibutton(BotTheme("PREVIOUS"), "status pre")
         buttons.ibutton(BotTheme("REFRESH", Page=f"{PAGE_NO}/{PAGES}"), "status ref")
         buttons.ibutton(BotTheme("NEXT"), "status nex")
     button = buttons.build_menu(3)
-    msg += BotTheme("Cpu", cpu=cpu_percent())
-    msg += BotTheme(
-        "FREE",
-        free=get_readable_file_size(disk_usage(config_dict["DOWNLOAD_DIR"]).free),
-        free_p=round(100 - disk_usage(config_dict["DOWNLOAD_DIR"]).percent, 1),
+    metrics = get_metrics()
+    disk = metrics["dl_disk"]
+    msg += BotThemeBlock(
+        footer + ["Cpu", "FREE", "Ram", "uptime", "DL", "UL"],
+        Tasks=tasks,
+        Ttask=config_dict["BOT_MAX_TASKS"],
+        Free=(config_dict["BOT_MAX_TASKS"] or 0) - tasks,
+        cpu=metrics["cpu"],
+        free=get_readable_file_size(disk.free),
+        free_p=round(100 - disk.percent, 1),
+        ram=metrics["memory"].percent,
+        uptime=get_readable_time(time() - botStartTime),
+        DL=get_readable_file_size(speed_totals["dl"]),
+        UL=get_readable_file_size(speed_totals["up"]),
     )
-    msg += BotTheme("Ram", ram=virtual_memory().percent)
-    msg += BotTheme("uptime", uptime=get_readable_time(time() - botStartTime))
-    msg += BotTheme("DL", DL=get_readable_file_size(dl_speed))
-    msg += BotTheme("UL", UL=get_readable_file_size(up_speed))
     return msg, button
 
 
+def get_speed_totals():
+    totals = {"dl": 0, "up": 0, "engines": {}, "users": {}}
+    for download in list(download_dict.values()):
+        tstatus = download.status()
+        if tstatus == MirrorStatus.STATUS_DOWNLOADING:
+            direction, speed = "dl", download.speed_raw()
+        elif tstatus == MirrorStatus.STATUS_UPLOADING:
+            direction, speed = "up", download.speed_raw()
+        elif tstatus == MirrorStatus.STATUS_SEEDING:
+            direction, speed = "up", download.upload_speed_raw()
+        else:
+            continue
+        totals[direction] += speed
+        for group, key in (
+            ("engines", download.eng()),
+            ("users", download.message.from_user.id),
+        ):
+            totals[group].setdefault(key, {"dl": 0, "up": 0})[direction] += speed
+    bot_cache["speed_totals"] = totals
+    return totals
+
+
 async def turn_page(data):
     STATUS_LIMIT = config_dict["STATUS_LIMIT"]
     global STATUS_START, PAGE_NO
@@ -634,10 +647,13 @@ async def get_stats(event, key="home"):
         btns.ibutton("Bot Limits", f"wzmlx {user_id} stats botlimits")
         msg = "⌬ <b><i>Bot & OS Statistics!</i></b>"
     elif key == "stbot":
-        total, used, free, disk = disk_usage("/")
-        swap = swap_memory()
-        memory = virtual_memory()
-        disk_io = disk_io_counters()
+        from bot.helper.ext_utils.disk_ledger import disk_ledger
+
+        metrics = get_metrics()
+        total, used, free, disk = metrics["disk"]
+        swap = metrics["swap"]
+        memory = metrics["memory"]
+        disk_io = metrics["disk_io"]
         msg = BotTheme(
             "BOT_STATS",
             bot_uptime=get_readable_time(time() - botStartTime),
@@ -666,36 +682,39 @@ async def get_stats(event, key="home"):
             disk_t=get_readable_file_size(total),
             disk_u=get_readable_file_size(used),
             disk_f=get_readable_file_size(free),
+            disk_rsv=get_readable_file_size(disk_ledger.outstanding()),
+            disk_rsv_t=disk_ledger.tasks(),
         )
     elif key == "stsys":
-        cpuUsage = cpu_percent(interval=0.5)
+        metrics = get_metrics()
+        cpuUsage = metrics["cpu"]
+        net = metrics["net"]
         msg = BotTheme(
             "SYS_STATS",
-            os_uptime=get_readable_time(time() - boot_time()),
+            os_uptime=get_readable_time(time() - metrics["boot_time"]),
             os_version=platform.version(),
             os_arch=platform.platform(),
-            up_data=get_readable_file_size(net_io_counters().bytes_sent),
-            dl_data=get_readable_file_size(net_io_counters().bytes_recv),
-            pkt_sent=str(net_io_counters().packets_sent)[:-3],
-            pkt_recv=str(net_io_counters().packets_recv)[:-3],
-            tl_data=get_readable_file_size(
-                net_io_counters().bytes_recv + net_io_counters().bytes_sent
-            ),
+            up_data=get_readable_file_size(net.bytes_sent),
+            dl_data=get_readable_file_size(net.bytes_recv),
+            pkt_sent=str(net.packets_sent)[:-3],
+            pkt_recv=str(net.packets_recv)[:-3],
+            tl_data=get_readable_file_size(net.bytes_recv + net.bytes_sent),
             cpu=cpuUsage,
             cpu_bar=get_progress_bar_string(cpuUsage),
             cpu_freq=(
-                f"{cpu_freq(percpu=False).current / 1000:.2f} GHz"
-                if cpu_freq()
+                f"{freq.current / 1000:.2f} GHz"
+                if (freq := metrics["cpu_freq"])
                 else "Access Denied"
             ),
             sys_load="%, ".join(
-                str(round((x / cpu_count() * 100), 2)) for x in getloadavg()
+                str(round((x / metrics["total_core"] * 100), 2))
+                for x in metrics["loadavg"]
             )
             + "%, (1m, 5m, 15m)",
-            p_core=cpu_count(logical=False),
-            v_core=cpu_count(logical=True) - cpu_count(logical=False),
-            total_core=cpu_count(logical=True),
-            cpu_use=len(Process().cpu_affinity()),
+            p_core=metrics["p_core"],
+            v_core=metrics["total_core"] - metrics["p_core"],
+            total_core=metrics["total_core"],
+            cpu_use=metrics["cpu_use"],
         )
     elif key == "strepo":
         last_commit, changelog = "No Data", "N/A"
@@ -241,6 +241,37 @@ class DbManger:
         self.__conn.close
         return notifier_dict  # return a dict ==> {cid: {tag: [{_id: source}, {_id, source}, ...]}}
 
+    async def update_journal(self, uid, data):
+        if self.__err:
+            return
+        await self.__db.journal[bot_id].update_one(
+            {"_id": uid}, {"$set": data}, upsert=True
+        )
+        self.__conn.close
+
+    async def add_journal_upload(self, uid, upload):
+        if self.__err:
+            return
+        await self.__db.journal[bot_id].update_one(
+            {"_id": uid}, {"$push": {"uploaded": upload}}
+        )
+        self.__conn.close
+
+    async def rm_journal(self, uid):
+        if self.__err:
+            return
+        await self.__db.journal[bot_id].delete_one({"_id": uid})
+        self.__conn.close
+
+    async def get_journal(self):
+        rows = []
+        if self.__err:
+            return rows
+        async for row in self.__db.journal[bot_id].find({}):
+            rows.append(row)
+        self.__conn.close
+        return rows
+
     async def trunc_table(self, name):
         if self.__err:
             return
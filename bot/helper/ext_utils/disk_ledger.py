@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+from shutil import disk_usage
+from threading import Lock
+
+from bot import DOWNLOAD_DIR, download_dict, config_dict
+from bot.helper.ext_utils.bot_utils import EngineStatus, MirrorStatus, sync_to_async
+
+
+class DiskLedger:
+    """
+    Bytes promised to running tasks but not written to disk yet. Every
+    admission check reads free space minus these reservations under one
+    lock, so concurrent tasks can't all pass against the same free space.
+    Written bytes come from sample(), which the engine poller runs in a
+    thread, so admission checks never ask a download engine for progress.
+    """
+
+    def __init__(self, path):
+        self.__path = path
+        self.__lock = Lock()
+        self.__entries = {}
+
+    @staticmethod
+    def __written(uid, preallocating):
+        # bytes of a running download are already counted in disk free space
+        if (task := download_dict.get(uid)) is None:
+            return 0
+        try:
+            if task.status() != MirrorStatus.STATUS_DOWNLOADING:
+                return 0
+            if task.eng() in preallocating:
+                # aria2 and qbittorrent allocate the whole download when it starts
+                return task.size_raw() or 0
+            return task.processed_raw() or 0
+        except Exception:
+            return 0
+
+    def __outstanding(self):
+        return sum(
+            max(entry["size"] - entry["released"] - entry["written"], 0)
+            for entry in self.__entries.values()
+        )
+
+    def outstanding(self):
+        with self.__lock:
+            return self.__outstanding()
+
+    def tasks(self):
+        return len(self.__entries)
+
+    def reserve(self, uid, size, threshold=0, force=False):
+        with self.__lock:
+            self.__entries.pop(uid, None)
+            free = disk_usage(self.__path).free - self.__outstanding()
+            if not force and free - size < threshold:
+                return False
+            self.__entries[uid] = {"size": size, "released": 0, "written": 0}
+            return True
+
+    def release(self, uid, size=None):
+        with self.__lock:
+            if size is None:
+                self.__entries.pop(uid, None)
+            elif (entry := self.__entries.get(uid)) is not None:
+                entry["released"] += size
+                entry["written"] = 0
+
+    def sample(self):
+        """Blocking, run it in a thread."""
+        with self.__lock:
+            released = {uid: entry["released"] for uid, entry in self.__entries.items()}
+        engines = EngineStatus()
+        preallocating = (engines.STATUS_ARIA, engines.STATUS_QB)
+        written = {uid: self.__written(uid, preallocating) for uid in released}
+        with self.__lock:
+            for uid, size in written.items():
+                # a release while sampling means the task left the download stage
+                entry = self.__entries.get(uid)
+                if entry is not None and entry["released"] == released[uid]:
+                    entry["written"] = size
+
+
+disk_ledger = DiskLedger(DOWNLOAD_DIR)
+
+
+def reserve_size(size, listener):
+    # archives and extraction keep the source until done, leech splits copy it
+    reserved = size
+    if listener.compress or listener.extract:
+        reserved += size
+    elif listener.isLeech and size > (
+        listener.user_dict.get("split_size", False) or config_dict["LEECH_SPLIT_SIZE"]
+    ):
+        reserved += size
+    return reserved
+
+
+async def reserve_task(listener, size):
+    # aria2 and qbittorrent tasks reserve when admitted, again once the size is known
+    await sync_to_async(
+        disk_ledger.reserve, listener.uid, reserve_size(size, listener), force=True
+    )
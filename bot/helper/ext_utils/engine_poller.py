@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+from time import time
+from aria2p.downloads import Download
+
+from bot import (
+    aria2,
+    bot_cache,
+    get_client,
+    download_dict,
+    download_dict_lock,
+    EngineInterval,
+    LOGGER,
+    queued_dl,
+    queued_up,
+)
+from bot.helper.ext_utils.bot_utils import get_speed_totals, setInterval, sync_to_async
+from bot.helper.ext_utils.disk_ledger import disk_ledger
+from bot.helper.ext_utils.task_manager import start_from_queued
+
+POLL_INTERVAL = 2
+STALE_AFTER = POLL_INTERVAL * 3
+
+__aria2_snapshot = {}
+__qbit_snapshot = {}
+__snapshot_time = {"aria2": 0, "qbit": 0}
+__qb_client = None
+
+
+def __fetch_aria2():
+    calls = [
+        (aria2.client.TELL_ACTIVE, []),
+        (aria2.client.TELL_WAITING, [0, 1000]),
+    ]
+    snapshot = {}
+    for result in aria2.client.multicall2(calls):
+        # system.multicall wraps every successful result in a single item list
+        if (
+            isinstance(result, list)
+            and len(result) == 1
+            and isinstance(result[0], list)
+        ):
+            result = result[0]
+        if not isinstance(result, list):
+            LOGGER.error(f"Aria2c snapshot error: {result}")
+            continue
+        for struct in result:
+            snapshot[struct["gid"]] = Download(aria2, struct)
+    return snapshot
+
+
+def __fetch_qbit():
+    global __qb_client
+    if __qb_client is None:
+        __qb_client = get_client()
+    return {tor.tags: tor for tor in __qb_client.torrents_info()}
+
+
+async def poll_engines():
+    global __aria2_snapshot, __qbit_snapshot, __qb_client
+    if not download_dict:
+        bot_cache.pop("speed_totals", None)
+        return
+    try:
+        __aria2_snapshot = await sync_to_async(__fetch_aria2)
+        __snapshot_time["aria2"] = time()
+    except Exception as e:
+        LOGGER.error(f"{e}: Aria2c, Error while polling downloads")
+    try:
+        __qbit_snapshot = await sync_to_async(__fetch_qbit)
+        __snapshot_time["qbit"] = time()
+    except Exception as e:
+        LOGGER.error(f"{e}: Qbittorrent, Error while polling torrents")
+        __qb_client = None
+    async with download_dict_lock:
+        download_dict.refresh()
+    # keeps the totals read by the api current without a status message
+    get_speed_totals()
+    await sync_to_async(disk_ledger.sample)
+    if queued_dl or queued_up:
+        # resources may have been freed without any task finishing
+        await start_from_queued()
+
+
+def start_engine_poller():
+    if not EngineInterval:
+        EngineInterval.append(setInterval(POLL_INTERVAL, poll_engines))
+
+
+def get_aria2_download(gid):
+    if time() - __snapshot_time["aria2"] > STALE_AFTER:
+        return None
+    return __aria2_snapshot.get(gid)
+
+
+def get_qbit_torrent(tag):
+    if time() - __snapshot_time["qbit"] > STALE_AFTER:
+        return None
+    return __qbit_snapshot.get(tag)
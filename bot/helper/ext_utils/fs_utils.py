@@ -4,9 +4,9 @@ from aiofiles.os import remove as aioremove, path as aiopath, listdir, rmdir, ma
 from aioshutil import rmtree as aiormtree, move
 from asyncio import create_subprocess_exec
 from asyncio.subprocess import PIPE
-from shutil import rmtree, disk_usage
+from shutil import rmtree
 from magic import Magic
-from re import split as re_split, I, search as re_search
+from re import split as re_split, I, search as re_search, sub as re_sub, fullmatch
 from subprocess import run as srun
 from sys import exit as sexit
 from bot import bot_cache
@@ -14,6 +14,7 @@ from bot import bot_cache
 from .exceptions import NotSupportedExtractionArchive
 from bot import aria2, LOGGER, DOWNLOAD_DIR, get_client, GLOBAL_EXTENSION_FILTER
 from bot.helper.ext_utils.bot_utils import sync_to_async, cmd_exec
+from bot.helper.ext_utils.task_journal import journal_enabled
 
 ARCH_EXT = [
     ".tar.bz2",
@@ -72,6 +73,20 @@ def is_archive_split(file):
     return bool(re_search(SPLIT_REGEX, file))
 
 
+def archive_volumes(first, files):
+    # first volume plus the rest of its set, e.g. .part2.rar, .r00, .z01, .7z.002
+    base = re_sub(r"((\.|_)part0*1\.rar|(\.|_)(7z|zip)\.0*1|\.rar|\.zip)$", "", first)
+    return [
+        file
+        for file in files
+        if file == first
+        or file.startswith(base)
+        and fullmatch(
+            r"(\.|_)part\d+\.rar|\.r\d+|\.z\d+|(\.|_)(7z|zip)\.\d+", file[len(base) :]
+        )
+    ]
+
+
 async def clean_target(path):
     if await aiopath.exists(path):
         LOGGER.info(f"Cleaning Target: {path}")
@@ -96,16 +111,36 @@ async def clean_download(path):
             pass
 
 
-async def start_cleanup():
-    get_client().torrents_delete(torrent_hashes="all")
-    try:
-        await aiormtree(DOWNLOAD_DIR)
-    except Exception:
-        pass
+async def start_cleanup(keep=()):
+    if not (keep := [str(uid) for uid in keep]):
+        get_client().torrents_delete(torrent_hashes="all")
+        try:
+            await aiormtree(DOWNLOAD_DIR)
+        except Exception:
+            pass
+        await makedirs(DOWNLOAD_DIR, exist_ok=True)
+        return
+    # downloads of journaled tasks are kept for resuming, torrents are tagged by uid
+    client = get_client()
+    torrents = await sync_to_async(client.torrents_info)
+    if hashes := [tor.hash for tor in torrents if tor.tags not in keep]:
+        await sync_to_async(client.torrents_delete, torrent_hashes=hashes)
     await makedirs(DOWNLOAD_DIR, exist_ok=True)
+    for entry in await listdir(DOWNLOAD_DIR):
+        if entry in keep or entry.removesuffix("10000") in keep:
+            continue
+        try:
+            if await aiopath.isdir(f"{DOWNLOAD_DIR}{entry}"):
+                await aiormtree(f"{DOWNLOAD_DIR}{entry}")
+            else:
+                await aioremove(f"{DOWNLOAD_DIR}{entry}")
+        except Exception:
+            pass
 
 
 def clean_all():
+    if journal_enabled():
+        return
     aria2.remove_all(True)
     get_client().torrents_delete(torrent_hashes="all")
     try:
@@ -183,24 +218,6 @@ def get_mime_type(file_path):
     return mime_type
 
 
-def check_storage_threshold(size, threshold, arch=False, alloc=False):
-    free = disk_usage(DOWNLOAD_DIR).free
-    if not alloc:
-        if (
-            not arch
-            and free - size < threshold
-            or arch
-            and free - (size * 2) < threshold
-        ):
-            return False
-    elif not arch:
-        if free < threshold:
-            return False
-    elif free - size < threshold:
-        return False
-    return True
-
-
 async def join_files(path):
     files = await listdir(path)
     results = []
@@ -227,6 +244,25 @@ async def join_files(path):
                     await aioremove(f"{path}/{file_}")
 
 
+async def run_7z(listener, cmd, status, done=0, weight=0):
+    # weight: bytes covered by this call, done: bytes handled by earlier calls
+    listener.suproc = await create_subprocess_exec(
+        *cmd, "-bso0", "-bsp1", stdout=PIPE
+    )
+    buffer = b""
+    while chunk := await listener.suproc.stdout.read(1024):
+        parts = re_split(rb"[\b\r\n]+", buffer + chunk)
+        buffer = parts.pop()[-256:]
+        for part in reversed(parts):
+            if match := re_search(rb"(\d+)%", part):
+                status.update_progress(done + weight * int(match.group(1)) / 100)
+                break
+    code = await listener.suproc.wait()
+    if code == 0:
+        status.update_progress(done + weight)
+    return code
+
+
 async def edit_metadata(
     listener, base_dir: str, media_file: str, outfile: str, metadata: str = ""
 ):
@@ -486,9 +486,20 @@ default_desp = {
     "LEECH_LOG_ID": "Chat ID to where leeched files would be uploaded. Int. NOTE: Only available for superGroup/channel. Add -100 before channel/superGroup id. In short don't add bot id or your id!",
     "MIRROR_LOG_ID": "Chat ID to where Mirror files would be Send. Int. NOTE: Only available for superGroup/channel. Add -100 before channel/superGroup id. In short don't add bot id or your id!. For Multiple id Separate them by space.",
     "EQUAL_SPLITS": "Split files larger than LEECH_SPLIT_SIZE into equal parts size (Not working with zip cmd). Default is False.",
+    "LEECH_SPLIT_LOOKAHEAD": "Upload the parts of files larger than LEECH_SPLIT_SIZE while they are being split, keeping at most this number of finished parts waiting on disk. Empty to split everything before the upload starts. Int",
+    "LEECH_PARALLEL_UPLOADS": "Number of files of one leech task uploaded to Telegram at the same time. Messages keep the original file order. Default is 1. Int",
+    "LEECH_PARALLEL_UPLOADS_ALL": "Number of files uploaded to Telegram at the same time across all leech tasks. Empty for no limit. Int",
+    "TG_DOWNLOAD_CONNECTIONS": "Number of connections one Telegram file download uses. Parts of the file are fetched at the same time by the bot, helper bots and user session that can access the message. Default is 1. Int",
+    "TG_DOWNLOAD_CONNECTIONS_ALL": "Number of Telegram download connections across all tasks. Empty for no limit. Int",
+    "GDRIVE_PARALLEL_UPLOADS": "Number of files of one task uploaded to Google Drive at the same time. With USE_SERVICE_ACCOUNTS the uploads are spread over the service accounts. Default is 1. Int",
+    "GDRIVE_PARALLEL_UPLOADS_ALL": "Number of files uploaded to Google Drive at the same time across all tasks. Empty for no limit. Int",
+    "GDRIVE_PARALLEL_COPIES": "Number of files of one clone task copied on Google Drive at the same time. Folders are listed and created by as many workers. Default is 1. Int",
+    "GDRIVE_PARALLEL_DOWNLOADS": "Number of parallel range requests of one Google Drive download task. Files are split in 16MB ranges written directly at their offsets, so small files download together and big files in parts. Default is 1. Int",
+    "GDRIVE_DOWNLOAD_MEMORY": "Memory in MB that downloaded Google Drive ranges can take at once across all tasks. Empty for no limit besides 16MB per range request. Int",
     "EXTENSION_FILTER": "File extensions that won't upload/clone. Separate them by space.",
     "GDRIVE_ID": "This is the Folder/TeamDrive ID of the Google Drive OR root to which you want to upload all the mirrors using google-api-python-client.",
     "INCOMPLETE_TASK_NOTIFIER": "Get incomplete task messages after restart. Require database and superGroup. Default is False",
+    "RESUME_TASKS": "Keep a journal of running mirror/leech tasks in database and resume them after restart. Downloads reattach to aria2/qBittorrent or start again from the partial files, leech uploads continue from the next file not uploaded. Require database. Default is False",
     "INDEX_URL": "Refer to https://gitlab.com/ParveenBhadooOfficial/Google-Drive-Index.",
     "IS_TEAM_DRIVE": "Set True if uploading to TeamDrive using google-api-python-client. Default is False",
     "SHOW_MEDIAINFO": "Add Button to Show MediaInfo in Leeched file. Bool",
@@ -510,6 +521,11 @@ default_desp = {
     "QUEUE_ALL": "Number of parallel tasks of downloads and uploads. For example if 20 task added and QUEUE_ALL is 8, then the summation of uploading and downloading tasks are 8 and the rest in queue. Int. NOTE: if you want to fill QUEUE_DOWNLOAD or QUEUE_UPLOAD, then QUEUE_ALL value must be greater than or equal to the greatest one and less than or equal to summation of QUEUE_UPLOAD and QUEUE_DOWNLOAD",
     "QUEUE_DOWNLOAD": "Number of all parallel downloading tasks. Int",
     "QUEUE_UPLOAD": "Number of all parallel uploading tasks. Int",
+    "QUEUE_SJF": "Start smaller queued tasks first among tasks with the same priority. Queued tasks are always released by priority (owner, sudo, others) and fair share between users. Default is False",
+    "QUEUE_AGING": "Seconds a queued task has to wait before its priority is raised by one level, so no task waits forever. 0 to disable. Default is 600. Int",
+    "QUEUE_MAX_CPU": "Keep tasks queued while CPU usage is at or above this percent, for example while ffmpeg or 7z jobs are running. Int",
+    "LINK_CAPACITY": "Link speed of the server in Mbps. Tasks stay queued while the link is more than 90% used. Int",
+    "QUEUE_STRETCH": "Allow up to twice the QUEUE_* limits while the link is less than half of LINK_CAPACITY used, so slow tasks don't hold every slot. Default is False",
     "RCLONE_FLAGS": "key:value|key|key|key:value . Check here all RcloneFlags.",
     "RCLONE_PATH": "Default rclone path to which you want to upload all the mirrors using rclone.",
     "RCLONE_SERVE_URL": "Valid URL where the bot is deployed to use rclone serve. Format of URL should be http://myip, where myip is the IP/Domain(public) of your bot or if you have chosen port other than 80 so write it in this format http://myip:port (http and not https)",
@@ -524,6 +540,7 @@ default_desp = {
     "STATUS_LIMIT": "Limit the no. of tasks shown in status message with buttons. Default is 10. NOTE: Recommended limit is 4 tasks.",
     "STATUS_UPDATE_INTERVAL": "Time in seconds after which the progress/status message will be updated. Recommended 10 seconds at least.",
     "STOP_DUPLICATE": "Bot will check file/folder name in Drive incase uploading to GDRIVE_ID. If it's present in Drive then downloading or cloning will be stopped. (NOTE: Item will be checked using name and not hash, so this feature is not perfect yet). Default is False",
+    "DRIVE_INDEX": "Keep a local index of the shared drives in list of drives, updated through the Drive changes feed. Drive search, duplicate check and index link paths of those drives are looked up in the index instead of querying Drive. Default is False",
     "SUDO_USERS": "Fill user_id of users whom you want to give sudo permission. Separate them by space. Int",
     "TELEGRAM_API": "This is to authenticate your Telegram account for downloading Telegram files. You can get this from https://my.telegram.org.",
     "TELEGRAM_HASH": "This is to authenticate your Telegram account for downloading Telegram files. You can get this from https://my.telegram.org.",
@@ -538,6 +555,7 @@ default_desp = {
     "USER_TD_MODE": "Enable User GDrive TD to Use. Default is False",
     "USER_TD_SA": "Add Global SA mail for User to give Permissions to Bot for UserTD Upload. Like wzmlx@googlegroups.com. Str",
     "USER_SESSION_STRING": "To download/upload from your telegram account and to send rss. To generate session string use this command <code>python3 generate_string_session.py</code> after mounting repo folder for sure.\n\n<b>NOTE:</b> You can't use bot with private message. Use it with superGroup.",
+    "HELPER_BOT_TOKENS": "Extra bot tokens separated by space. Leech uploads to LEECH_LOG_ID chats are spread across the main bot and the helper bots that are admin there, then copied back by the main bot. Uploads to other chats always use the main bot.\n\n<b>NOTE:</b> Restart required.",
     "USE_SERVICE_ACCOUNTS": "Whether to use Service Accounts or not, with google-api-python-client. For this to work see Using Service Accounts section below. Default is False",
     "WEB_PINCODE": " Whether to ask for pincode before selecting files from torrent in web or not. Default is False. Bool.",
     "YT_DLP_OPTIONS": 'Default yt-dlp options. Check all possible options HERE or use this script to convert cli arguments to api options. Format: key:value|key:value|key:value. Add ^ before integer or float, some numbers must be numeric and some string. \nExample: "format:bv*+mergeall[vcodec=none]|nocheckcertificate:True"',
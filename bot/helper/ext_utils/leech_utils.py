@@ -1,6 +1,11 @@
 from hashlib import md5
 from time import strftime, gmtime, time
-from re import sub as re_sub, search as re_search
+from re import (
+    sub as re_sub,
+    search as re_search,
+    match as re_match,
+    escape as re_escape,
+)
 from shlex import split as ssplit
 from natsort import natsorted
 from os import path as ospath
@@ -245,6 +250,7 @@ async def split_file(
     i=1,
     inLoop=False,
     multi_streams=True,
+    on_part=None,
 ):
     if (
         listener.suproc == "cancelled"
@@ -332,6 +338,7 @@ async def split_file(
                         i,
                         True,
                         False,
+                        on_part=on_part,
                     )
                 else:
                     LOGGER.warning(
@@ -353,8 +360,14 @@ async def split_file(
                     start_time,
                     i,
                     True,
+                    on_part=on_part,
                 )
             lpd = (await get_media_info(out_path))[0]
+            if lpd <= 3 and lpd != 0 and duration != lpd:
+                await aioremove(out_path)
+                break
+            if on_part is not None:
+                await on_part(out_path)
             if lpd == 0:
                 LOGGER.error(
                     f"Something went wrong while splitting, mostly file is corrupted. Path: {path}"
@@ -365,9 +378,6 @@ async def split_file(
                     f"This file has been splitted with default stream and audio, so you will only see one part with less size from orginal one because it doesn't have all streams and audios. This happens mostly with MKV videos. Path: {path}"
                 )
                 break
-            elif lpd <= 3:
-                await aioremove(out_path)
-                break
             start_time += lpd - 3
             i += 1
     else:
@@ -387,6 +397,10 @@ async def split_file(
         elif code != 0:
             err = (await listener.suproc.stderr.read()).decode().strip()
             LOGGER.error(err)
+        elif on_part is not None:
+            for part in natsorted(await listdir(dirpath)):
+                if re_match(rf"{re_escape(file_)}\.\d+$", part):
+                    await on_part(ospath.join(dirpath, part))
     return True
 
 
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+from collections import deque
+from threading import Thread, Lock
+from time import sleep, time
+from psutil import (
+    disk_usage,
+    disk_io_counters,
+    Process,
+    cpu_percent,
+    swap_memory,
+    cpu_count,
+    cpu_freq,
+    getloadavg,
+    virtual_memory,
+    net_io_counters,
+    boot_time,
+)
+
+from bot import config_dict, LOGGER
+
+SAMPLE_INTERVAL = 3
+HISTORY_SIZE = 20
+
+__snapshot = {}
+__history = deque(maxlen=HISTORY_SIZE)
+__lock = Lock()
+__sampler = None
+
+
+def __static_info():
+    try:
+        cpu_use = len(Process().cpu_affinity())
+    except Exception:
+        cpu_use = cpu_count(logical=True)
+    return {
+        "boot_time": boot_time(),
+        "p_core": cpu_count(logical=False),
+        "total_core": cpu_count(logical=True),
+        "cpu_use": cpu_use,
+    }
+
+
+def __rates(history):
+    if len(history) < 2:
+        return {"net_up": 0, "net_dl": 0, "disk_read": 0, "disk_write": 0}
+    (t0, first), (t1, last) = history[0], history[-1]
+    elapsed = (t1 - t0) or 1
+    return {key: max(last[key] - first[key], 0) / elapsed for key in first}
+
+
+def sample_metrics():
+    now = time()
+    net = net_io_counters()
+    try:
+        disk_io = disk_io_counters()
+    except Exception:
+        disk_io = None
+    try:
+        freq = cpu_freq()
+    except Exception:
+        freq = None
+    snapshot = {
+        "time": now,
+        "cpu": cpu_percent(),
+        "memory": virtual_memory(),
+        "swap": swap_memory(),
+        "disk": disk_usage("/"),
+        "dl_disk": disk_usage(config_dict["DOWNLOAD_DIR"]),
+        "disk_io": disk_io,
+        "net": net,
+        "cpu_freq": freq,
+        "loadavg": getloadavg(),
+    }
+    counters = {
+        "net_up": net.bytes_sent,
+        "net_dl": net.bytes_recv,
+        "disk_read": disk_io.read_bytes if disk_io else 0,
+        "disk_write": disk_io.write_bytes if disk_io else 0,
+    }
+    with __lock:
+        if not __snapshot:
+            __snapshot.update(__static_info())
+        __history.append((now, counters))
+        snapshot["rates"] = __rates(__history)
+        __snapshot.update(snapshot)
+
+
+def __sample_loop():
+    while True:
+        try:
+            sample_metrics()
+        except Exception as e:
+            LOGGER.error(f"System metrics sampler: {e}")
+        sleep(SAMPLE_INTERVAL)
+
+
+def start_metrics_sampler():
+    global __sampler
+    if __sampler is None:
+        __sampler = Thread(target=__sample_loop, daemon=True)
+        __sampler.start()
+
+
+def get_metrics():
+    if not __snapshot:
+        sample_metrics()
+    with __lock:
+        return dict(__snapshot)
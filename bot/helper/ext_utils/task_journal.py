@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+from bot import DATABASE_URL, LOGGER, config_dict
+from bot.helper.ext_utils.db_handler import DbManger
+
+# queued, downloading -> reattach to the engine or start the command again
+# extracting, metadata, archiving -> process the downloaded files again
+# splitting, uploading -> upload up_path, skipping the files uploaded already
+DOWNLOAD_STAGES = ["queued", "downloading"]
+UPLOAD_STAGES = ["splitting", "uploading"]
+
+
+def journal_enabled(listener=None):
+    if not DATABASE_URL or not config_dict["RESUME_TASKS"]:
+        return False
+    # tasks sharing a folder with other links and clones are not journaled
+    return listener is None or not (listener.sameDir or listener.isClone)
+
+
+def listener_options(listener):
+    return {
+        "compress": listener.compress,
+        "extract": listener.extract,
+        "isQbit": listener.isQbit,
+        "isLeech": listener.isLeech,
+        "tag": listener.tag,
+        "seed": listener.seed,
+        "rcFlags": listener.rcFlags,
+        "upPath": listener.upPath,
+        "join": listener.join,
+        "drive_id": listener.drive_id,
+        "index_link": listener.index_link,
+        "isYtdlp": listener.isYtdlp,
+        "source_url": listener.source_url,
+        "leech_utils": listener.leech_utils,
+    }
+
+
+async def journal_task(listener, stage, **data):
+    if not journal_enabled(listener):
+        return
+    data["stage"] = stage
+    try:
+        await DbManger().update_journal(listener.uid, data)
+    except Exception as e:
+        LOGGER.error(f"Task journal error: {e}")
+
+
+async def journal_upload(listener, path, link, name):
+    if not journal_enabled(listener):
+        return
+    try:
+        await DbManger().add_journal_upload(
+            listener.uid, {"path": path, "link": link, "name": name}
+        )
+    except Exception as e:
+        LOGGER.error(f"Task journal error: {e}")
+
+
+async def journal_done(listener):
+    if not journal_enabled(listener):
+        return
+    try:
+        await DbManger().rm_journal(listener.uid)
+    except Exception as e:
+        LOGGER.error(f"Task journal error: {e}")
@@ -3,6 +3,7 @@ from time import time
 from asyncio import Event
 
 from bot import (
+    OWNER_ID,
     bot_cache,
     config_dict,
     queued_dl,
@@ -15,7 +16,9 @@ from bot import (
     download_dict,
 )
 from bot.helper.mirror_utils.upload_utils.gdriveTools import GoogleDriveHelper
-from bot.helper.ext_utils.fs_utils import get_base_name, check_storage_threshold
+from bot.helper.ext_utils.fs_utils import get_base_name
+from bot.helper.ext_utils.disk_ledger import disk_ledger, reserve_size
+from bot.helper.ext_utils.sys_metrics import get_metrics
 from bot.helper.ext_utils.bot_utils import (
     get_user_tasks,
     getdailytasks,
@@ -29,6 +32,9 @@ from bot.helper.telegram_helper.message_utils import forcesub, check_botpm
 from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.themes import BotTheme
 
+LINK_IDLE_RATIO = 0.5
+LINK_BUSY_RATIO = 0.9
+
 
 async def stop_duplicate_check(name, listener):
     if (
@@ -67,24 +73,126 @@ async def timeval_check(user_id):
     return None
 
 
-async def is_queued(uid):
+def __link_idle(direction):
+    if not config_dict["QUEUE_STRETCH"] or not (
+        capacity := config_dict["LINK_CAPACITY"]
+    ):
+        return False
+    rate = get_metrics()["rates"]["net_dl" if direction == "dl" else "net_up"]
+    return rate < capacity * 125000 * LINK_IDLE_RATIO
+
+
+def __slots_full(direction, dl, up):
+    limit = config_dict["QUEUE_DOWNLOAD" if direction == "dl" else "QUEUE_UPLOAD"]
     all_limit = config_dict["QUEUE_ALL"]
-    dl_limit = config_dict["QUEUE_DOWNLOAD"]
+    if not (limit or all_limit):
+        return False
+    running = dl if direction == "dl" else up
+    # slow tasks may hold every slot while the link is mostly idle
+    stretch = 2 if __link_idle(direction) else 1
+    return bool(
+        all_limit
+        and dl + up >= all_limit * stretch
+        and (not limit or running >= limit * stretch)
+        or limit
+        and running >= limit * stretch
+    )
+
+
+def __resources_busy(direction, size=0, admitted=0):
+    metrics = get_metrics()
+    if (max_cpu := config_dict["QUEUE_MAX_CPU"]) and metrics["cpu"] >= max_cpu:
+        return "cpu"
+    if direction == "dl":
+        threshold = (config_dict["STORAGE_THRESHOLD"] or 0) * 1024**3
+        free = metrics["dl_disk"].free - disk_ledger.outstanding()
+        if free - admitted - threshold < max(size, 1):
+            return "disk"
+    if (capacity := config_dict["LINK_CAPACITY"]) and metrics["rates"][
+        "net_dl" if direction == "dl" else "net_up"
+    ] >= capacity * 125000 * LINK_BUSY_RATIO:
+        return "bandwidth"
+    return None
+
+
+def should_queue(direction, size=0, admitted=0, started=None):
+    """Call with queue_dict_lock held."""
+    started = started or {}
+    dl = len(non_queued_dl) + started.get("dl", 0)
+    up = len(non_queued_up) + started.get("up", 0)
+    if __slots_full(direction, dl, up):
+        return True
+    # never hold everything back, the next start_from_queued would not come
+    return bool(dl + up and __resources_busy(direction, size, admitted))
+
+
+async def is_queued(uid):
     event = None
     added_to_queue = False
-    if all_limit or dl_limit:
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            if (
-                all_limit and dl + up >= all_limit and (not dl_limit or dl >= dl_limit)
-            ) or (dl_limit and dl >= dl_limit):
-                added_to_queue = True
-                event = Event()
-                queued_dl[uid] = event
+    async with queue_dict_lock:
+        if should_queue("dl"):
+            added_to_queue = True
+            event = Event()
+            queued_dl[uid] = event
     return added_to_queue, event
 
 
+def __queue_entry(uid):
+    if (task := download_dict.get(uid)) is None:
+        return None, 2, 0
+    user_id = task.message.from_user.id
+    if user_id == OWNER_ID:
+        priority = 0
+    elif user_data.get(user_id, {}).get("is_sudo"):
+        priority = 1
+    else:
+        priority = 2
+    try:
+        size = int(task.size_raw() or 0)
+    except Exception:
+        size = 0
+    return user_id, priority, size
+
+
+def __running_per_user():
+    running = {}
+    for uid in list(non_queued_dl) + list(non_queued_up):
+        if (task := download_dict.get(uid)) is not None:
+            user_id = task.message.from_user.id
+            running[user_id] = running.get(user_id, 0) + 1
+    return running
+
+
+def get_queue_order(queue):
+    return queue.ordered(
+        __queue_entry,
+        __running_per_user(),
+        config_dict["QUEUE_SJF"],
+        config_dict["QUEUE_AGING"],
+    )
+
+
+def queue_position(uid):
+    for queue, running in ((queued_dl, non_queued_dl), (queued_up, non_queued_up)):
+        if uid not in queue:
+            continue
+        try:
+            position = get_queue_order(queue).index(uid) + 1
+        except ValueError:
+            return None, None
+        etas = []
+        for r_uid in list(running):
+            if (task := download_dict.get(r_uid)) is not None:
+                try:
+                    if (eta := task.eta_raw()) is not None:
+                        etas.append(eta)
+                except Exception:
+                    pass
+        etas.sort()
+        return position, etas[position - 1] if position <= len(etas) else None
+    return None, None
+
+
 def start_dl_from_queued(uid):
     queued_dl[uid].set()
     del queued_dl[uid]
@@ -96,58 +204,22 @@ def start_up_from_queued(uid):
 
 
 async def start_from_queued():
-    if all_limit := config_dict["QUEUE_ALL"]:
-        dl_limit = config_dict["QUEUE_DOWNLOAD"]
-        up_limit = config_dict["QUEUE_UPLOAD"]
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            all_ = dl + up
-            if all_ < all_limit:
-                f_tasks = all_limit - all_
-                if queued_up and (not up_limit or up < up_limit):
-                    for index, uid in enumerate(list(queued_up.keys()), start=1):
-                        f_tasks = all_limit - all_
-                        start_up_from_queued(uid)
-                        f_tasks -= 1
-                        if f_tasks == 0 or (up_limit and index >= up_limit - up):
-                            break
-                if queued_dl and (not dl_limit or dl < dl_limit) and f_tasks != 0:
-                    for index, uid in enumerate(list(queued_dl.keys()), start=1):
-                        start_dl_from_queued(uid)
-                        if (dl_limit and index >= dl_limit - dl) or index == f_tasks:
-                            break
-        return
-
-    if up_limit := config_dict["QUEUE_UPLOAD"]:
-        async with queue_dict_lock:
-            up = len(non_queued_up)
-            if queued_up and up < up_limit:
-                f_tasks = up_limit - up
-                for index, uid in enumerate(list(queued_up.keys()), start=1):
-                    start_up_from_queued(uid)
-                    if index == f_tasks:
-                        break
-    else:
-        async with queue_dict_lock:
-            if queued_up:
-                for uid in list(queued_up.keys()):
-                    start_up_from_queued(uid)
-
-    if dl_limit := config_dict["QUEUE_DOWNLOAD"]:
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            if queued_dl and dl < dl_limit:
-                f_tasks = dl_limit - dl
-                for index, uid in enumerate(list(queued_dl.keys()), start=1):
-                    start_dl_from_queued(uid)
-                    if index == f_tasks:
-                        break
-    else:
-        async with queue_dict_lock:
-            if queued_dl:
-                for uid in list(queued_dl.keys()):
-                    start_dl_from_queued(uid)
+    async with queue_dict_lock:
+        started = {"dl": 0, "up": 0}
+        admitted = 0
+        for direction, queue, start in (
+            ("up", queued_up, start_up_from_queued),
+            ("dl", queued_dl, start_dl_from_queued),
+        ):
+            if not queue:
+                continue
+            for uid in get_queue_order(queue):
+                size = __queue_entry(uid)[2] if direction == "dl" else 0
+                if should_queue(direction, size, admitted, started):
+                    break
+                start(uid)
+                started[direction] += 1
+                admitted += size
 
 
 async def limit_checker(
@@ -162,6 +234,13 @@ async def limit_checker(
     LOGGER.info("Checking Size Limit of link/file/folder/tasks...")
     user_id = listener.message.from_user.id
     if await CustomFilters.sudo("", listener.message):
+        if not listener.isClone:
+            await sync_to_async(
+                disk_ledger.reserve,
+                listener.uid,
+                reserve_size(size, listener),
+                force=True,
+            )
         return
     limit_exceeded = ""
     if listener.isClone:
@@ -205,17 +284,6 @@ async def limit_checker(
             if size > limit:
                 limit_exceeded = f"Leech limit is {get_readable_file_size(limit)}"
 
-        if (
-            STORAGE_THRESHOLD := config_dict["STORAGE_THRESHOLD"]
-        ) and not listener.isClone:
-            arch = any([listener.compress, listener.extract])
-            limit = STORAGE_THRESHOLD * 1024**3
-            acpt = await sync_to_async(check_storage_threshold, size, limit, arch)
-            if not acpt:
-                limit_exceeded = (
-                    f"You must leave {get_readable_file_size(limit)} free storage."
-                )
-
         if config_dict["DAILY_TASK_LIMIT"] and config_dict[
             "DAILY_TASK_LIMIT"
         ] <= await getdailytasks(user_id):
@@ -247,7 +315,23 @@ async def limit_checker(
                 LOGGER.info(
                     f"User : {user_id} | Daily Leech Size : {get_readable_file_size(lsize)}"
                 )
+        # only a task passing every other limit holds disk space
+        if not limit_exceeded and not listener.isClone:
+            limit = (config_dict["STORAGE_THRESHOLD"] or 0) * 1024**3
+            acpt = await sync_to_async(
+                disk_ledger.reserve,
+                listener.uid,
+                reserve_size(size, listener),
+                limit,
+                not limit,
+            )
+            if not acpt:
+                limit_exceeded = (
+                    f"You must leave {get_readable_file_size(limit)} free storage."
+                )
     if limit_exceeded:
+        # most callers only send the message, nothing else releases the task
+        disk_ledger.release(listener.uid)
         if size:
             return f"{limit_exceeded}.\nYour List/File/Folder size is {get_readable_file_size(size)}."
         elif isPlayList != 0:
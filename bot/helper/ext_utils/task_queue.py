@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+from time import time
+
+
+class TaskQueue(dict):
+    """
+    queued_dl/queued_up: uid -> Event, released in fair-share order
+    instead of insertion order.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__since = {}
+
+    def __setitem__(self, uid, event):
+        super().__setitem__(uid, event)
+        self.__since.setdefault(uid, time())
+
+    def __delitem__(self, uid):
+        super().__delitem__(uid)
+        self.__since.pop(uid, None)
+
+    def pop(self, uid, *args):
+        self.__since.pop(uid, None)
+        return super().pop(uid, *args)
+
+    def clear(self):
+        super().clear()
+        self.__since.clear()
+
+    def waited(self, uid):
+        return time() - self.__since.get(uid, time())
+
+    def ordered(self, resolve, running, sjf=False, aging=0):
+        """
+        resolve(uid) returns (user_id, priority, size), lower priority first.
+        running maps user_id to the number of tasks the user already runs.
+        A user with fewer running tasks goes first within the same priority,
+        waiting aging seconds raises the priority of a task by one level.
+        """
+        users = {}
+        for uid in list(self):
+            user_id, priority, size = resolve(uid)
+            if aging:
+                priority = max(priority - int(self.waited(uid) // aging), 0)
+            users.setdefault(user_id, []).append(
+                (priority, size if sjf else 0, self.__since.get(uid, 0), uid)
+            )
+        for entries in users.values():
+            entries.sort(reverse=True)
+        running = dict(running)
+        order = []
+        while users:
+            user_id = min(
+                users,
+                key=lambda user: (
+                    users[user][-1][0],
+                    running.get(user, 0),
+                    *users[user][-1][1:3],
+                ),
+            )
+            order.append(users[user_id].pop()[3])
+            if not users[user_id]:
+                del users[user_id]
+            running[user_id] = running.get(user_id, 0) + 1
+        return order
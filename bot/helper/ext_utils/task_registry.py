@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+class TaskRegistry(dict):
+    """
+    download_dict with secondary indexes by gid, user id, chat id and status.
+
+    Entries are indexed when stored. Status objects are replaced on every
+    stage change (download, extract, upload...). Engine tasks which change
+    status or gid in place expose index_keys(), which reads the poller
+    snapshot instead of the engine, and are re-indexed by refresh() on every
+    poller tick or by reindex() where the bot changes them itself.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__keys = {}
+        self.__by_gid = {}
+        self.__by_user = {}
+        self.__by_chat = {}
+        self.__by_status = {}
+
+    @staticmethod
+    def __index_keys(task):
+        message = task.message
+        user_id = message.from_user.id if message.from_user else message.chat.id
+        try:
+            if (index_keys := getattr(task, "index_keys", None)) is not None:
+                gid, status = index_keys()
+            else:
+                gid, status = task.gid(), task.status()
+        except Exception:
+            gid = status = None
+        return gid, user_id, message.chat.id, status
+
+    def __add(self, uid, keys):
+        gid, user_id, chat_id, status = keys
+        self.__keys[uid] = keys
+        if gid:
+            self.__by_gid[gid] = uid
+        self.__by_user.setdefault(user_id, set()).add(uid)
+        self.__by_chat.setdefault(chat_id, set()).add(uid)
+        self.__by_status.setdefault(status, set()).add(uid)
+
+    def __discard(self, uid):
+        if (keys := self.__keys.pop(uid, None)) is None:
+            return
+        gid, user_id, chat_id, status = keys
+        if gid and self.__by_gid.get(gid) == uid:
+            del self.__by_gid[gid]
+        for index, key in (
+            (self.__by_user, user_id),
+            (self.__by_chat, chat_id),
+            (self.__by_status, status),
+        ):
+            if (uids := index.get(key)) is not None:
+                uids.discard(uid)
+                if not uids:
+                    del index[key]
+
+    def __setitem__(self, uid, task):
+        self.__discard(uid)
+        super().__setitem__(uid, task)
+        self.__add(uid, self.__index_keys(task))
+
+    def __delitem__(self, uid):
+        super().__delitem__(uid)
+        self.__discard(uid)
+
+    def pop(self, uid, *args):
+        self.__discard(uid)
+        return super().pop(uid, *args)
+
+    def clear(self):
+        super().clear()
+        for index in (
+            self.__keys,
+            self.__by_gid,
+            self.__by_user,
+            self.__by_chat,
+            self.__by_status,
+        ):
+            index.clear()
+
+    def reindex(self, uid):
+        if (task := self.get(uid)) is None:
+            return
+        if (keys := self.__index_keys(task)) != self.__keys.get(uid):
+            self.__discard(uid)
+            self.__add(uid, keys)
+
+    def refresh(self):
+        for uid in list(self.keys()):
+            self.reindex(uid)
+
+    def get_by_gid(self, gid):
+        if (uid := self.__by_gid.get(gid)) is not None and uid in self:
+            return self[uid]
+        # aria2 and qbittorrent tasks may get a new gid after metadata
+        self.refresh()
+        if (uid := self.__by_gid.get(gid)) is not None and uid in self:
+            return self[uid]
+        return None
+
+    def __select(self, uids, status):
+        if status == "all":
+            return [self[uid] for uid in uids if uid in self]
+        return [
+            self[uid] for uid in uids if uid in self and self.__keys[uid][3] == status
+        ]
+
+    def get_tasks(self, status="all", user_id=None, chat_id=None):
+        if user_id:
+            return self.__select(self.__by_user.get(user_id, ()), status)
+        if chat_id:
+            return self.__select(self.__by_chat.get(chat_id, ()), status)
+        if status == "all":
+            return list(self.values())
+        return self.__select(self.__by_status.get(status, ()), "all")
+
+    def count(self, status="all", user_id=None):
+        if user_id:
+            if status == "all":
+                return len(self.__by_user.get(user_id, ()))
+            return len(self.get_tasks(status, user_id))
+        if status == "all":
+            return len(self)
+        return len(self.__by_status.get(status, ()))
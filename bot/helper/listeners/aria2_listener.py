@@ -4,6 +4,7 @@ from time import time
 from aiofiles.os import remove as aioremove, path as aiopath
 
 from bot import aria2, download_dict_lock, download_dict, LOGGER, config_dict
+from bot.helper.ext_utils.disk_ledger import reserve_task
 from bot.helper.ext_utils.task_manager import limit_checker
 from bot.helper.mirror_utils.upload_utils.gdriveTools import GoogleDriveHelper
 from bot.helper.mirror_utils.status_utils.aria2_status import Aria2Status
@@ -45,37 +46,38 @@ async def __onDownloadStarted(api, gid):
         return
     else:
         LOGGER.info(f"onDownloadStarted: {download.name} - Gid: {gid}")
-    dl = None
-    if any(
-        [
-            config_dict["DIRECT_LIMIT"],
-            config_dict["TORRENT_LIMIT"],
-            config_dict["LEECH_LIMIT"],
-            config_dict["STORAGE_THRESHOLD"],
-            config_dict["DAILY_TASK_LIMIT"],
-            config_dict["DAILY_MIRROR_LIMIT"],
-            config_dict["DAILY_LEECH_LIMIT"],
-        ]
-    ):
-        await sleep(1)
-        if dl is None:
-            dl = await getDownloadByGid(gid)
-        if dl:
-            if not hasattr(dl, "listener"):
-                LOGGER.warning(
-                    f"onDownloadStart: {gid}. at Download limit didn't pass since download completed earlier!"
-                )
-                return
-            listener = dl.listener()
-            download = await sync_to_async(api.get_download, gid)
-            if not download.is_torrent:
-                await sleep(3)
-                download = download.live
-            size = download.total_length
-            LOGGER.info(f"listener size : {size}")
+    await sleep(1)
+    dl = await getDownloadByGid(gid)
+    if dl:
+        if not hasattr(dl, "listener"):
+            LOGGER.warning(
+                f"onDownloadStart: {gid}. at Download limit didn't pass since download completed earlier!"
+            )
+            return
+        listener = dl.listener()
+        download = await sync_to_async(api.get_download, gid)
+        if not download.is_torrent:
+            await sleep(3)
+            download = download.live
+        size = download.total_length
+        LOGGER.info(f"listener size : {size}")
+        if any(
+            [
+                config_dict["DIRECT_LIMIT"],
+                config_dict["TORRENT_LIMIT"],
+                config_dict["LEECH_LIMIT"],
+                config_dict["STORAGE_THRESHOLD"],
+                config_dict["DAILY_TASK_LIMIT"],
+                config_dict["DAILY_MIRROR_LIMIT"],
+                config_dict["DAILY_LEECH_LIMIT"],
+            ]
+        ):
             if limit_exceeded := await limit_checker(size, listener):
                 await listener.onDownloadError(limit_exceeded)
                 await sync_to_async(api.remove, [download], force=True, files=True)
+        else:
+            # the size was unknown when the task was admitted
+            await reserve_task(listener, size)
     if config_dict["STOP_DUPLICATE"]:
         await sleep(1)
         if dl is None:
@@ -22,6 +22,7 @@ from bot.helper.ext_utils.bot_utils import (
     sync_to_async,
 )
 from bot.helper.ext_utils.fs_utils import clean_unwanted
+from bot.helper.ext_utils.disk_ledger import reserve_task
 from bot.helper.ext_utils.task_manager import limit_checker, stop_duplicate_check
 
 
@@ -80,7 +81,19 @@ async def __size_checked(tor):
     if hasattr(download, "listener"):
         listener = download.listener()
         size = tor.size
-        if limit_exceeded := await limit_checker(size, listener, isTorrent=True):
+        if not any(
+            [
+                config_dict["STORAGE_THRESHOLD"],
+                config_dict["TORRENT_LIMIT"],
+                config_dict["LEECH_LIMIT"],
+                config_dict["DAILY_LEECH_LIMIT"],
+                config_dict["DAILY_MIRROR_LIMIT"],
+                config_dict["DAILY_TASK_LIMIT"],
+            ]
+        ):
+            # the size of a magnet was unknown when the task was admitted
+            await reserve_task(listener, size)
+        elif limit_exceeded := await limit_checker(size, listener, isTorrent=True):
             await __onDownloadError(limit_exceeded, tor)
 
 
@@ -127,11 +140,12 @@ async def __qb_listener():
     while True:
         async with qb_listener_lock:
             try:
-                if len(await sync_to_async(client.torrents_info)) == 0:
+                torrents = await sync_to_async(client.torrents_info)
+                if len(torrents) == 0:
                     QbInterval.clear()
                     await sync_to_async(client.auth_log_out)
                     break
-                for tor_info in await sync_to_async(client.torrents_info):
+                for tor_info in torrents:
                     tag = tor_info.tags
                     if tag not in QbTorrents:
                         continue
@@ -156,19 +170,7 @@ async def __qb_listener():
                         ):
                             QbTorrents[tag]["stop_dup_check"] = True
                             __stop_duplicate(tor_info)
-                        if (
-                            any(
-                                [
-                                    config_dict["STORAGE_THRESHOLD"],
-                                    config_dict["TORRENT_LIMIT"],
-                                    config_dict["LEECH_LIMIT"],
-                                    config_dict["DAILY_LEECH_LIMIT"],
-                                    config_dict["DAILY_MIRROR_LIMIT"],
-                                    config_dict["DAILY_TASK_LIMIT"],
-                                ]
-                            )
-                            and not QbTorrents[tag]["size_checked"]
-                        ):
+                        if not QbTorrents[tag]["size_checked"]:
                             QbTorrents[tag]["size_checked"] = True
                             __size_checked(tor_info)
                     elif state == "stalledDL":
@@ -10,7 +10,9 @@ from aiofiles.os import path as aiopath, remove as aioremove, listdir, makedirs
 from os import walk, path as ospath
 from html import escape
 from aioshutil import move
-from asyncio import create_subprocess_exec, sleep, Event
+from asyncio import sleep, Event, Queue, create_task
+from contextlib import suppress
+from natsort import natsort_key
 from pyrogram.enums import ChatType
 
 from bot import (
@@ -51,8 +53,10 @@ from bot.helper.ext_utils.fs_utils import (
     is_first_archive_split,
     is_archive,
     is_archive_split,
+    archive_volumes,
     join_files,
     edit_metadata,
+    run_7z,
 )
 from bot.helper.ext_utils.leech_utils import (
     split_file,
@@ -60,7 +64,17 @@ from bot.helper.ext_utils.leech_utils import (
     get_document_type,
 )
 from bot.helper.ext_utils.exceptions import NotSupportedExtractionArchive
-from bot.helper.ext_utils.task_manager import start_from_queued
+from bot.helper.ext_utils.task_manager import start_from_queued, should_queue
+from bot.helper.ext_utils.disk_ledger import disk_ledger
+from bot.helper.ext_utils.batch_engine import batch_finished
+from bot.helper.ext_utils.task_journal import (
+    journal_enabled,
+    journal_task,
+    journal_done,
+    listener_options,
+)
+from bot.helper.mirror_utils.status_utils.aria2_status import Aria2Status
+from bot.helper.mirror_utils.status_utils.qbit_status import QbittorrentStatus
 from bot.helper.mirror_utils.status_utils.extract_status import ExtractStatus
 from bot.helper.mirror_utils.status_utils.zip_status import ZipStatus
 from bot.helper.mirror_utils.status_utils.split_status import SplitStatus
@@ -150,6 +164,7 @@ class MirrorLeechListener:
         self.botpmmsg = None
         self.upload_details = {}
         self.leech_utils = leech_utils
+        self.resumed_uploads = []
         self.source_url = (
             source_url
             if source_url and source_url.startswith("http")
@@ -239,6 +254,23 @@ class MirrorLeechListener:
                 self.source_url,
                 self.message.text,
             )
+        if journal_enabled(self):
+            download = download_dict.get(self.uid)
+            engine, handle = None, None
+            if isinstance(download, Aria2Status):
+                engine, handle = "aria2", download.gid()
+            elif isinstance(download, QbittorrentStatus):
+                engine, handle = "qbit", download.hash()
+            await journal_task(
+                self,
+                "queued" if getattr(download, "queued", False) else "downloading",
+                cid=self.message.chat.id,
+                msg_id=self.message.id,
+                user_id=self.user_id,
+                options=listener_options(self),
+                engine=engine,
+                handle=handle,
+            )
 
     async def onDownloadComplete(self):
         multi_links = False
@@ -296,6 +328,7 @@ class MirrorLeechListener:
         dl_path = f"{self.dir}/{name}"
         up_path = ""
         size = await get_path_size(dl_path)
+        disk_ledger.release(self.uid, size)
         async with queue_dict_lock:
             if self.uid in non_queued_dl:
                 non_queued_dl.remove(self.uid)
@@ -311,8 +344,11 @@ class MirrorLeechListener:
                 if await aiopath.isfile(dl_path):
                     up_path = get_base_name(dl_path)
                 LOGGER.info(f"Extracting: {name}")
+                await journal_task(self, "extracting", name=name, gid=gid)
+                extract_status = ExtractStatus(name, size, gid, self)
                 async with download_dict_lock:
-                    download_dict[self.uid] = ExtractStatus(name, size, gid, self)
+                    download_dict[self.uid] = extract_status
+                extracted = 0
                 if await aiopath.isdir(dl_path):
                     if self.seed:
                         self.newDir = f"{self.dir}10000"
@@ -351,8 +387,15 @@ class MirrorLeechListener:
                                     and self.suproc.returncode == -9
                                 ):
                                     return
-                                self.suproc = await create_subprocess_exec(*cmd)
-                                code = await self.suproc.wait()
+                                weight = 0
+                                for volume in archive_volumes(file_, files):
+                                    weight += await aiopath.getsize(
+                                        ospath.join(dirpath, volume)
+                                    )
+                                code = await run_7z(
+                                    self, cmd, extract_status, extracted, weight
+                                )
+                                extracted += weight
                                 if code == -9:
                                     return
                                 elif code != 0:
@@ -386,8 +429,7 @@ class MirrorLeechListener:
                         del cmd[2]
                     if self.suproc == "cancelled":
                         return
-                    self.suproc = await create_subprocess_exec(*cmd)
-                    code = await self.suproc.wait()
+                    code = await run_7z(self, cmd, extract_status, weight=size)
                     if code == -9:
                         return
                     elif code == 0:
@@ -410,6 +452,7 @@ class MirrorLeechListener:
             meta_path = up_path or dl_path
             self.newDir = f"{self.dir}10000"
             await makedirs(self.newDir, exist_ok=True)
+            await journal_task(self, "metadata", name=name, gid=gid)
             async with download_dict_lock:
                 download_dict[self.uid] = MetadataStatus(name, size, gid, self)
             if (
@@ -443,8 +486,10 @@ class MirrorLeechListener:
                 up_path = f"{self.newDir}/{name}.zip"
             else:
                 up_path = f"{dl_path}.zip"
+            await journal_task(self, "archiving", name=name, gid=gid)
+            zip_status = ZipStatus(name, size, gid, self)
             async with download_dict_lock:
-                download_dict[self.uid] = ZipStatus(name, size, gid, self)
+                download_dict[self.uid] = zip_status
             LEECH_SPLIT_SIZE = (
                 user_dict.get("split_size", False) or config_dict["LEECH_SPLIT_SIZE"]
             )
@@ -471,8 +516,7 @@ class MirrorLeechListener:
                 LOGGER.info(f"Zip: orig_path: {dl_path}, zip_path: {up_path}")
             if self.suproc == "cancelled":
                 return
-            self.suproc = await create_subprocess_exec(*cmd)
-            code = await self.suproc.wait()
+            code = await run_7z(self, cmd, zip_status, weight=size)
             if code == -9:
                 return
             elif not self.seed:
@@ -481,11 +525,23 @@ class MirrorLeechListener:
         if not self.compress and not self.extract:
             up_path = dl_path
 
+        await self.start_upload(up_path, name, gid)
+
+    async def start_upload(self, up_path, name, gid):
+        await journal_task(
+            self,
+            "splitting" if self.isLeech else "uploading",
+            name=name,
+            gid=gid,
+            up_path=up_path,
+        )
+        user_dict = user_data.get(self.message.from_user.id, {})
         up_dir, up_name = up_path.rsplit("/", 1)
         size = await get_path_size(up_dir)
         if self.isLeech:
             m_size = []
             o_files = []
+            split_jobs = []
             if not self.compress:
                 checked = False
                 LEECH_SPLIT_SIZE = (
@@ -499,6 +555,9 @@ class MirrorLeechListener:
                         f_path = ospath.join(dirpath, file_)
                         f_size = await aiopath.getsize(f_path)
                         if f_size > LEECH_SPLIT_SIZE:
+                            if config_dict["LEECH_SPLIT_LOOKAHEAD"]:
+                                split_jobs.append((f_path, f_size, file_, dirpath))
+                                continue
                             if not checked:
                                 checked = True
                                 async with download_dict_lock:
@@ -527,15 +586,10 @@ class MirrorLeechListener:
                                 m_size.append(f_size)
                                 o_files.append(file_)
 
-        up_limit = config_dict["QUEUE_UPLOAD"]
-        all_limit = config_dict["QUEUE_ALL"]
+        disk_ledger.release(self.uid)
         added_to_queue = False
         async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            if (
-                all_limit and dl + up >= all_limit and (not up_limit or up >= up_limit)
-            ) or (up_limit and up >= up_limit):
+            if should_queue("up"):
                 added_to_queue = True
                 LOGGER.info(f"Added to Queue/Upload: {name}")
                 event = Event()
@@ -551,6 +605,7 @@ class MirrorLeechListener:
         async with queue_dict_lock:
             non_queued_up.add(self.uid)
         if self.isLeech:
+            await journal_task(self, "uploading")
             size = await get_path_size(up_dir)
             for s in m_size:
                 size = size - s
@@ -562,7 +617,26 @@ class MirrorLeechListener:
             async with download_dict_lock:
                 download_dict[self.uid] = tg_upload_status
             await update_all_messages()
-            await tg.upload(o_files, m_size, size)
+            if not split_jobs:
+                await tg.upload(o_files, m_size, size)
+                return
+            LOGGER.info(f"Splitting while uploading: {up_name}")
+            split_jobs.sort(key=lambda job: (job[3], natsort_key(job[2])))
+            split_parts = {
+                job[0]: Queue(config_dict["LEECH_SPLIT_LOOKAHEAD"])
+                for job in split_jobs
+            }
+            splitter = create_task(
+                self.__split_for_upload(split_jobs, split_parts, LEECH_SPLIT_SIZE, tg)
+            )
+            try:
+                await tg.upload(o_files, m_size, size, split_parts)
+            finally:
+                if not splitter.done():
+                    splitter.cancel()
+                    if self.suproc is not None and self.suproc != "cancelled":
+                        with suppress(Exception):
+                            self.suproc.kill()
         elif self.upPath == "gd":
             size = await get_path_size(up_path)
             LOGGER.info(f"Upload Name: {up_name}")
@@ -597,9 +671,40 @@ class MirrorLeechListener:
             await update_all_messages()
             await RCTransfer.upload(up_path, size)
 
+    async def __split_for_upload(self, jobs, split_parts, split_size, tg):
+        # parts are handed over in the same order TgUploader walks the files
+        await tg.files_listed.wait()
+        pending = list(jobs)
+        try:
+            while pending:
+                f_path, f_size, file_, dirpath = pending[0]
+                parts = split_parts[f_path]
+                res = await split_file(
+                    f_path, f_size, file_, dirpath, split_size, self, on_part=parts.put
+                )
+                if not res:
+                    break
+                if res == "errored":
+                    if f_size <= MAX_SPLIT_SIZE:
+                        await parts.put(f_path)
+                    else:
+                        with suppress(Exception):
+                            await aioremove(f_path)
+                elif not self.seed or self.newDir:
+                    with suppress(Exception):
+                        await aioremove(f_path)
+                await parts.put(None)
+                pending.pop(0)
+        except Exception as e:
+            LOGGER.error(f"{e}: Error while splitting {pending[0][0]}")
+        for job in pending:
+            await split_parts[job[0]].put(None)
+
     async def onUploadComplete(
         self, link, size, files, folders, mime_type, name, rclonePath="", private=False
     ):
+        batch_finished(self.uid, True)
+        await journal_done(self)
         if (
             self.isSuperGroup
             and config_dict["INCOMPLETE_TASK_NOTIFIER"]
@@ -890,6 +995,7 @@ class MirrorLeechListener:
         async with download_dict_lock:
             if self.uid in download_dict.keys():
                 del download_dict[self.uid]
+            disk_ledger.release(self.uid)
             count = len(download_dict)
         if count == 0:
             await self.clean()
@@ -904,9 +1010,12 @@ class MirrorLeechListener:
         await delete_links(self.message)
 
     async def onDownloadError(self, error, button=None):
+        batch_finished(self.uid, False)
+        await journal_done(self)
         async with download_dict_lock:
             if self.uid in download_dict.keys():
                 del download_dict[self.uid]
+            disk_ledger.release(self.uid)
             count = len(download_dict)
             if self.sameDir and self.uid in self.sameDir["tasks"]:
                 self.sameDir["tasks"].remove(self.uid)
@@ -949,9 +1058,12 @@ class MirrorLeechListener:
             await clean_download(self.newDir)
 
     async def onUploadError(self, error):
+        batch_finished(self.uid, False)
+        await journal_done(self)
         async with download_dict_lock:
             if self.uid in download_dict.keys():
                 del download_dict[self.uid]
+            disk_ledger.release(self.uid)
             count = len(download_dict)
         msg = f"""<i><b>Upload Stopped!</b></i>
 ┠ <b>Task for:</b> {self.tag}
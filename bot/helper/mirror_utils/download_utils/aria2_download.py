@@ -15,6 +15,7 @@ from bot import (
 from bot.helper.ext_utils.bot_utils import bt_selection_buttons, sync_to_async
 from bot.helper.mirror_utils.status_utils.aria2_status import Aria2Status
 from bot.helper.telegram_helper.message_utils import sendStatusMessage, sendMessage
+from bot.helper.ext_utils.disk_ledger import reserve_task
 from bot.helper.ext_utils.task_manager import is_queued
 
 
@@ -54,6 +55,7 @@ async def add_aria2c_download(link, path, listener, filename, header, ratio, see
 
     gid = download.gid
     name = download.name
+    size = download.total_length
     async with download_dict_lock:
         download_dict[listener.uid] = Aria2Status(gid, listener, queued=added_to_queue)
     if added_to_queue:
@@ -63,6 +65,7 @@ async def add_aria2c_download(link, path, listener, filename, header, ratio, see
     else:
         async with queue_dict_lock:
             non_queued_dl.add(listener.uid)
+        await reserve_task(listener, size)
         LOGGER.info(f"Aria2Download started: {name}. Gid: {gid}")
 
     await listener.onDownloadStart()
@@ -85,7 +88,9 @@ async def add_aria2c_download(link, path, listener, filename, header, ratio, see
             download = download_dict[listener.uid]
             download.queued = False
             new_gid = download.gid()
+            download_dict.reindex(listener.uid)
 
+        await reserve_task(listener, size)
         await sync_to_async(aria2.client.unpause, new_gid)
         LOGGER.info(f"Start Queued Download from Aria2c: {name}. Gid: {gid}")
 
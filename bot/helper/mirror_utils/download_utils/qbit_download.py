@@ -19,6 +19,7 @@ from bot.helper.telegram_helper.message_utils import (
 )
 from bot.helper.ext_utils.bot_utils import bt_selection_buttons, sync_to_async
 from bot.helper.listeners.qbit_listener import onDownloadStart
+from bot.helper.ext_utils.disk_ledger import reserve_task
 from bot.helper.ext_utils.task_manager import is_queued
 
 
@@ -96,6 +97,7 @@ async def add_qb_torrent(link, path, listener, ratio, seed_time):
         else:
             async with queue_dict_lock:
                 non_queued_dl.add(listener.uid)
+            await reserve_task(listener, tor_info.size)
             LOGGER.info(f"QbitDownload started: {tor_info.name} - Hash: {ext_hash}")
 
         await listener.onDownloadStart()
@@ -140,7 +142,9 @@ async def add_qb_torrent(link, path, listener, ratio, seed_time):
                 if listener.uid not in download_dict:
                     return
                 download_dict[listener.uid].queued = False
+                download_dict.reindex(listener.uid)
 
+            await reserve_task(listener, tor_info.size)
             await sync_to_async(client.torrents_resume, torrent_hashes=ext_hash)
             LOGGER.info(
                 f"Start Queued Download from Qbittorrent: {tor_info.name} - Hash: {ext_hash}"
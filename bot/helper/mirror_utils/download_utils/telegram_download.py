@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 from logging import getLogger, ERROR
 from time import time
-from asyncio import Lock
-from pyrogram import Client
+from os import open as osopen, close as osclose, pwrite, ftruncate, O_WRONLY, O_CREAT
+from os import path as ospath
+from asyncio import Lock, Condition, gather, sleep, create_task
+from collections import deque
+from aiofiles.os import makedirs
+from pyrogram.errors import FloodWait
 
 from bot import (
     LOGGER,
@@ -12,8 +16,12 @@ from bot import (
     queue_dict_lock,
     bot,
     user,
+    helper_bots,
+    config_dict,
     IS_PREMIUM_USER,
 )
+from bot.helper.ext_utils.bot_utils import sync_to_async
+from bot.helper.telegram_helper.session_pool import user_sessions
 from bot.helper.mirror_utils.status_utils.telegram_status import TelegramStatus
 from bot.helper.mirror_utils.status_utils.queue_status import QueueStatus
 from bot.helper.telegram_helper.message_utils import (
@@ -31,6 +39,37 @@ global_lock = Lock()
 GLOBAL_GID = set()
 getLogger("pyrogram").setLevel(ERROR)
 
+# upload.GetFile serves 1 MiB chunks, a connection fetches a segment of them at a time
+CHUNK_SIZE = 1024 * 1024
+SEGMENT_CHUNKS = 16
+PARALLEL_MIN_SIZE = 2 * SEGMENT_CHUNKS * CHUNK_SIZE
+MAX_SEGMENT_RETRIES = 3
+
+
+class ConnectionSlots:
+    # caps the Telegram download connections across all tasks
+
+    def __init__(self):
+        self.__active = 0
+        self.__changed = Condition()
+
+    def __free(self):
+        limit = config_dict["TG_DOWNLOAD_CONNECTIONS_ALL"]
+        return not limit or self.__active < limit
+
+    async def __aenter__(self):
+        async with self.__changed:
+            await self.__changed.wait_for(self.__free)
+            self.__active += 1
+
+    async def __aexit__(self, *args):
+        async with self.__changed:
+            self.__active -= 1
+            self.__changed.notify_all()
+
+
+connection_slots = ConnectionSlots()
+
 
 class TelegramDownloadHelper:
 
@@ -40,7 +79,7 @@ class TelegramDownloadHelper:
         self.__start_time = time()
         self.__listener = listener
         self.__client = bot
-        self.__decrypter = None
+        self.__user_session = False
         self.__id = ""
         self.__is_cancelled = False
 
@@ -93,31 +132,109 @@ class TelegramDownloadHelper:
         async with global_lock:
             GLOBAL_GID.remove(self.__id)
 
-    async def __download(self, message, path):
+    async def __download_clients(self, message, media):
+        # clients which can see the message, each one fetches with its own file reference
+        clients = [(self.__client, message)]
+        if self.__user_session:
+            return clients
+
+        async def fetch(client):
+            try:
+                msg = await client.get_messages(message.chat.id, message.id)
+            except Exception:
+                return None
+            if (
+                msg
+                and not msg.empty
+                and msg.media
+                and getattr(msg, msg.media.value).file_unique_id == media.file_unique_id
+            ):
+                return client, msg
+
+        others = [c for c in (bot, user, *helper_bots) if c and c is not self.__client]
+        clients.extend(
+            client for client in await gather(*map(fetch, others)) if client is not None
+        )
+        return clients
+
+    async def __fetch_segments(self, client, message, fd, segments, total_chunks):
+        while segments and not self.__is_cancelled:
+            start, retries = segments.popleft()
+            limit = min(SEGMENT_CHUNKS, total_chunks - start)
+            position = start * CHUNK_SIZE
+            fetched = 0
+            try:
+                async with connection_slots:
+                    async for chunk in client.stream_media(
+                        message, limit=limit, offset=start
+                    ):
+                        if self.__is_cancelled:
+                            return
+                        await sync_to_async(pwrite, fd, chunk, position)
+                        position += len(chunk)
+                        fetched += len(chunk)
+                        self.__processed_bytes += len(chunk)
+            except Exception as e:
+                # the other connections take the segment again from its start
+                self.__processed_bytes -= fetched
+                if isinstance(e, FloodWait):
+                    await sleep(e.value * 1.2)
+                elif retries >= MAX_SEGMENT_RETRIES:
+                    raise
+                segments.append((start, retries + 1))
+
+    async def __parallel_download(self, message, media, path, connections):
+        clients = await self.__download_clients(message, media)
+        total_chunks = -(-media.file_size // CHUNK_SIZE)
+        segments = deque((start, 0) for start in range(0, total_chunks, SEGMENT_CHUNKS))
+        connections = min(connections, len(segments))
+        LOGGER.info(
+            f"Downloading {self.name} over {connections} connections from {len(clients)} clients"
+        )
+        await makedirs(ospath.dirname(path), exist_ok=True)
+        fd = await sync_to_async(osopen, path, O_WRONLY | O_CREAT, 0o644)
+        tasks = []
         try:
-            if self.__client is None and self.__decrypter is not None:
-                try:
-                    async with Client(
-                        str(self.__listener.user_id),
-                        session_string=self.__decrypter.decrypt(
-                            self.__listener.user_dict.get("usess")
-                        ).decode(),
-                        in_memory=True,
-                        no_updates=True,
-                    ) as self.__client:
-                        download = await self.__client.download_media(
-                            message=message,
-                            file_name=path,
-                            progress=self.__onDownloadProgress,
-                        )
-                except Exception as e:
-                    if not self.__is_cancelled:
-                        await self.__onDownloadError(f"ERROR: {e}")
-                        return
-            else:
-                download = await self.__client.download_media(
-                    message=message, file_name=path, progress=self.__onDownloadProgress
+            await sync_to_async(ftruncate, fd, media.file_size)
+            tasks = [
+                create_task(
+                    self.__fetch_segments(
+                        *clients[index % len(clients)], fd, segments, total_chunks
+                    )
                 )
+                for index in range(connections)
+            ]
+            await gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await gather(*tasks, return_exceptions=True)
+            await sync_to_async(osclose, fd)
+        return None if self.__is_cancelled else path
+
+    async def __download_media(self, message, path):
+        media = getattr(message, message.media.value)
+        connections = config_dict["TG_DOWNLOAD_CONNECTIONS"]
+        file_path = path
+        if path.endswith("/"):
+            file_name = getattr(media, "file_name", None)
+            file_path = f"{path}{file_name}" if file_name else ""
+        if (
+            connections
+            and connections > 1
+            and file_path
+            and media.file_size >= PARALLEL_MIN_SIZE
+        ):
+            return await self.__parallel_download(
+                message, media, file_path, connections
+            )
+        return await self.__client.download_media(
+            message=message, file_name=path, progress=self.__onDownloadProgress
+        )
+
+    async def __download(self, message, path):
+        try:
+            download = await self.__download_media(message, path)
             if self.__is_cancelled:
                 await self.__onDownloadError("Cancelled by user!")
                 return
@@ -131,6 +248,29 @@ class TelegramDownloadHelper:
             await self.__onDownloadError("Internal Error occurred")
 
     async def add_download(self, message, path, filename, session, decrypter):
+        if session != "user_sess":
+            await self.__add_download(message, path, filename, session)
+            return
+        # the pooled client stays running while the task waits in queue
+        user_id = self.__listener.user_id
+        try:
+            client = await user_sessions.get(
+                user_id, self.__listener.user_dict.get("usess"), decrypter
+            )
+        except Exception as e:
+            await self.__onDownloadError(f"ERROR: {e}")
+            return
+        if client is None:
+            await self.__onDownloadError("User Session expired, send the link again!")
+            return
+        self.__client = client
+        self.__user_session = True
+        try:
+            await self.__add_download(message, path, filename, session)
+        finally:
+            user_sessions.release(user_id, client)
+
+    async def __add_download(self, message, path, filename, session):
         if session == "user":
             self.__client = user
             if not self.__listener.isSuperGroup:
@@ -138,9 +278,6 @@ class TelegramDownloadHelper:
                     message, "Use SuperGroup to download this Link with User!"
                 )
                 return
-        elif session == "user_sess":
-            self.__client = None
-            self.__decrypter = decrypter
 
         media = getattr(message, message.media.value) if message.media else None
 
@@ -9,7 +9,12 @@ from random import randrange
 from logging import getLogger
 
 from bot import config_dict, GLOBAL_EXTENSION_FILTER
-from bot.helper.ext_utils.bot_utils import cmd_exec, sync_to_async
+from bot.helper.ext_utils.bot_utils import (
+    cmd_exec,
+    sync_to_async,
+    text_size_to_bytes,
+    time_to_seconds,
+)
 from bot.helper.ext_utils.fs_utils import get_mime_type, count_files_and_folders
 
 
@@ -25,6 +30,10 @@ class RcloneTransferHelper:
         self.__percentage = "0%"
         self.__speed = "0 B/s"
         self.__size = "0 B"
+        self.__transferred_bytes = 0
+        self.__size_bytes = 0
+        self.__speed_bytes = 0
+        self.__eta_seconds = None
         self.__is_cancelled = False
         self.__is_download = False
         self.__is_upload = False
@@ -53,6 +62,22 @@ class RcloneTransferHelper:
     def size(self):
         return self.__size
 
+    @property
+    def transferred_bytes(self):
+        return self.__transferred_bytes
+
+    @property
+    def size_bytes(self):
+        return self.__size_bytes
+
+    @property
+    def speed_bytes(self):
+        return self.__speed_bytes
+
+    @property
+    def eta_seconds(self):
+        return self.__eta_seconds
+
     async def __progress(self):
         while not (self.__proc is None or self.__is_cancelled):
             try:
@@ -72,6 +97,12 @@ class RcloneTransferHelper:
                     self.__speed,
                     self.__eta,
                 ) = data[0]
+                self.__transferred_bytes = text_size_to_bytes(self.__transferred_size)
+                self.__size_bytes = text_size_to_bytes(self.__size)
+                self.__speed_bytes = text_size_to_bytes(self.__speed)
+                self.__eta_seconds = (
+                    None if self.__eta == "-" else time_to_seconds(self.__eta)
+                )
 
     def __switchServiceAccount(self):
         if self.__sa_index == self.__sa_number - 1:
@@ -8,6 +8,7 @@ from bot.helper.ext_utils.bot_utils import (
     get_readable_time,
     sync_to_async,
 )
+from bot.helper.ext_utils.engine_poller import get_aria2_download
 
 
 def get_download(gid):
@@ -31,17 +32,36 @@ class Aria2Status:
         self.message = self.__listener.message
 
     def __update(self):
-        if self.__download is None:
+        if (download := get_aria2_download(self.__gid)) is not None:
+            self.__download = download
+        elif self.__download is None:
             self.__download = get_download(self.__gid)
         else:
             self.__download = self.__download.live
         if self.__download.followed_by_ids:
             self.__gid = self.__download.followed_by_ids[0]
-            self.__download = get_download(self.__gid)
+            self.__download = get_aria2_download(self.__gid) or get_download(self.__gid)
 
     def progress(self):
         return self.__download.progress_string()
 
+    def processed_raw(self):
+        return self.__download.completed_length
+
+    def size_raw(self):
+        return self.__download.total_length
+
+    def speed_raw(self):
+        return self.__download.download_speed
+
+    def upload_speed_raw(self):
+        return self.__download.upload_speed
+
+    def eta_raw(self):
+        if self.__download.download_speed == 0:
+            return None
+        return self.__download.eta.total_seconds()
+
     def processed_bytes(self):
         return self.__download.completed_length_string()
 
@@ -62,6 +82,20 @@ class Aria2Status:
 
     def status(self):
         self.__update()
+        return self.__state()
+
+    def index_keys(self):
+        # gid and status from the poller snapshot, never asks aria2 directly
+        if (download := get_aria2_download(self.__gid)) is not None:
+            self.__download = download
+            if download.followed_by_ids and (
+                followed := get_aria2_download(download.followed_by_ids[0])
+            ):
+                self.__gid = followed.gid
+                self.__download = followed
+        return self.__gid, self.__state()
+
+    def __state(self):
         if self.__download.is_waiting or self.queued:
             if self.seeding:
                 return MirrorStatus.STATUS_QUEUEUP
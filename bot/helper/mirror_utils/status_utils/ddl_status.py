@@ -14,8 +14,23 @@ class DDLStatus:
         self.upload_details = upload_details
         self.message = message
 
+    def processed_raw(self):
+        return self.__obj.processed_bytes
+
+    def size_raw(self):
+        return self.__size
+
+    def speed_raw(self):
+        return self.__obj.speed
+
+    def eta_raw(self):
+        try:
+            return (self.__size - self.__obj.processed_bytes) / self.__obj.speed
+        except Exception:
+            return None
+
     def processed_bytes(self):
-        return get_readable_file_size(self.__obj.processed_bytes)
+        return get_readable_file_size(self.processed_raw())
 
     def size(self):
         return get_readable_file_size(self.__size)
@@ -34,14 +49,12 @@ class DDLStatus:
         return f"{round(progress_raw, 2)}%"
 
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.speed)}/s"
+        return f"{get_readable_file_size(self.speed_raw())}/s"
 
     def eta(self):
-        try:
-            seconds = (self.__size - self.__obj.processed_bytes) / self.__obj.speed
-            return get_readable_time(seconds)
-        except Exception:
+        if (seconds := self.eta_raw()) is None:
             return "-"
+        return get_readable_time(seconds)
 
     def gid(self) -> str:
         return self.__gid
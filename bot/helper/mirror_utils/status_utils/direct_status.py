@@ -19,6 +19,23 @@ class DirectStatus:
     def gid(self):
         return self.__gid
 
+    def processed_raw(self):
+        return self.__obj.processed_bytes
+
+    def size_raw(self):
+        return self.__obj.total_size
+
+    def speed_raw(self):
+        return self.__obj.speed
+
+    def eta_raw(self):
+        try:
+            return (
+                self.__obj.total_size - self.__obj.processed_bytes
+            ) / self.__obj.speed
+        except Exception:
+            return None
+
     def progress_raw(self):
         try:
             return self.__obj.processed_bytes / self.__obj.total_size * 100
@@ -29,7 +46,7 @@ class DirectStatus:
         return f"{round(self.progress_raw(), 2)}%"
 
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.speed)}/s"
+        return f"{get_readable_file_size(self.speed_raw())}/s"
 
     def name(self):
         return self.__obj.name
@@ -38,13 +55,9 @@ class DirectStatus:
         return get_readable_file_size(self.__obj.total_size)
 
     def eta(self):
-        try:
-            seconds = (
-                self.__obj.total_size - self.__obj.processed_bytes
-            ) / self.__obj.speed
-            return get_readable_time(seconds)
-        except Exception:
+        if (seconds := self.eta_raw()) is None:
             return "-"
+        return get_readable_time(seconds)
 
     def status(self):
         if self.__obj.task and self.__obj.task.is_waiting:
@@ -52,7 +65,7 @@ class DirectStatus:
         return MirrorStatus.STATUS_DOWNLOADING
 
     def processed_bytes(self):
-        return get_readable_file_size(self.__obj.processed_bytes)
+        return get_readable_file_size(self.processed_raw())
 
     def download(self):
         return self.__obj
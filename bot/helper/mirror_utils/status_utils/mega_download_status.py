@@ -20,6 +20,21 @@ class MegaDownloadStatus:
     def name(self):
         return self.__name
 
+    def processed_raw(self):
+        return self.__obj.downloaded_bytes
+
+    def size_raw(self):
+        return self.__size
+
+    def speed_raw(self):
+        return self.__obj.speed
+
+    def eta_raw(self):
+        try:
+            return (self.__size - self.__obj.downloaded_bytes) / self.__obj.speed
+        except ZeroDivisionError:
+            return None
+
     def progress_raw(self):
         try:
             return round(self.__obj.downloaded_bytes / self.__size * 100, 2)
@@ -33,20 +48,18 @@ class MegaDownloadStatus:
         return MirrorStatus.STATUS_DOWNLOADING
 
     def processed_bytes(self):
-        return get_readable_file_size(self.__obj.downloaded_bytes)
+        return get_readable_file_size(self.processed_raw())
 
     def eta(self):
-        try:
-            seconds = (self.__size - self.__obj.downloaded_bytes) / self.__obj.speed
-            return get_readable_time(seconds)
-        except ZeroDivisionError:
+        if (seconds := self.eta_raw()) is None:
             return "-"
+        return get_readable_time(seconds)
 
     def size(self):
         return get_readable_file_size(self.__size)
 
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.speed)}/s"
+        return f"{get_readable_file_size(self.speed_raw())}/s"
 
     def gid(self):
         return self.__gid
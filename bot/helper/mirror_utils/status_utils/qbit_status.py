@@ -9,6 +9,7 @@ from bot.helper.ext_utils.bot_utils import (
     get_readable_time,
     sync_to_async,
 )
+from bot.helper.ext_utils.engine_poller import get_qbit_torrent
 
 
 def get_download(client, tag):
@@ -31,13 +32,30 @@ class QbittorrentStatus:
         self.message = listener.message
 
     def __update(self):
-        new_info = get_download(self.__client, f"{self.__listener.uid}")
+        new_info = get_qbit_torrent(f"{self.__listener.uid}")
+        if new_info is None:
+            new_info = get_download(self.__client, f"{self.__listener.uid}")
         if new_info is not None:
             self.__info = new_info
 
     def progress(self):
         return f"{round(self.__info.progress*100, 2)}%"
 
+    def processed_raw(self):
+        return self.__info.downloaded
+
+    def size_raw(self):
+        return self.__info.size
+
+    def speed_raw(self):
+        return self.__info.dlspeed
+
+    def upload_speed_raw(self):
+        return self.__info.upspeed
+
+    def eta_raw(self):
+        return None if self.__info.eta >= 8640000 else self.__info.eta
+
     def processed_bytes(self):
         return get_readable_file_size(self.__info.downloaded)
 
@@ -58,6 +76,15 @@ class QbittorrentStatus:
 
     def status(self):
         self.__update()
+        return self.__state()
+
+    def index_keys(self):
+        # gid and status from the poller snapshot, never asks qbittorrent directly
+        if (info := get_qbit_torrent(f"{self.__listener.uid}")) is not None:
+            self.__info = info
+        return self.__info.hash[:12], self.__state()
+
+    def __state(self):
         state = self.__info.state
         if state == "queuedDL" or self.queued:
             return MirrorStatus.STATUS_QUEUEDL
@@ -3,8 +3,10 @@ from bot import LOGGER
 from bot.helper.ext_utils.bot_utils import (
     EngineStatus,
     get_readable_file_size,
+    get_readable_time,
     MirrorStatus,
 )
+from bot.helper.ext_utils.task_manager import queue_position
 
 
 class QueueStatus:
@@ -34,6 +36,18 @@ class QueueStatus:
     def processed_bytes(self):
         return 0
 
+    def processed_raw(self):
+        return 0
+
+    def size_raw(self):
+        return self.__size
+
+    def speed_raw(self):
+        return 0
+
+    def eta_raw(self):
+        return queue_position(self.__listener.uid)[1]
+
     def progress(self):
         return "0%"
 
@@ -41,7 +55,12 @@ class QueueStatus:
         return "0B/s"
 
     def eta(self):
-        return "-"
+        position, start = queue_position(self.__listener.uid)
+        if position is None:
+            return "-"
+        if start is None:
+            return f"#{position} in queue"
+        return f"#{position} in queue, ~{get_readable_time(start)}"
 
     def download(self):
         return self
@@ -38,6 +38,18 @@ class RcloneStatus:
     def processed_bytes(self):
         return self.__obj.transferred_size
 
+    def processed_raw(self):
+        return self.__obj.transferred_bytes
+
+    def size_raw(self):
+        return self.__obj.size_bytes
+
+    def speed_raw(self):
+        return self.__obj.speed_bytes
+
+    def eta_raw(self):
+        return self.__obj.eta_seconds
+
     def download(self):
         return self.__obj
 
@@ -40,6 +40,18 @@ class SplitStatus:
     def processed_bytes(self):
         return 0
 
+    def processed_raw(self):
+        return 0
+
+    def size_raw(self):
+        return self.__size
+
+    def speed_raw(self):
+        return 0
+
+    def eta_raw(self):
+        return None
+
     def download(self):
         return self
 
@@ -29,8 +29,22 @@ class YtDlpDownloadStatus:
         else:
             return async_to_sync(get_path_size, self.__listener.dir)
 
+    def size_raw(self):
+        return self.__obj.size
+
+    def speed_raw(self):
+        return self.__obj.download_speed
+
+    def eta_raw(self):
+        if self.__obj.eta != "-":
+            return self.__obj.eta
+        try:
+            return (self.__obj.size - self.processed_raw()) / self.__obj.download_speed
+        except Exception:
+            return None
+
     def size(self):
-        return get_readable_file_size(self.__obj.size)
+        return get_readable_file_size(self.size_raw())
 
     def status(self):
         return MirrorStatus.STATUS_DOWNLOADING
@@ -42,18 +56,12 @@ class YtDlpDownloadStatus:
         return f"{round(self.__obj.progress, 2)}%"
 
     def speed(self):
-        return f"{get_readable_file_size(self.__obj.download_speed)}/s"
+        return f"{get_readable_file_size(self.speed_raw())}/s"
 
     def eta(self):
-        if self.__obj.eta != "-":
-            return get_readable_time(self.__obj.eta)
-        try:
-            seconds = (
-                self.__obj.size - self.processed_raw()
-            ) / self.__obj.download_speed
-            return get_readable_time(seconds)
-        except Exception:
+        if (seconds := self.eta_raw()) is None:
             return "-"
+        return get_readable_time(seconds)
 
     def download(self):
         return self.__obj
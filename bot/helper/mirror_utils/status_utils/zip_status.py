@@ -7,9 +7,7 @@ from bot.helper.ext_utils.bot_utils import (
     get_readable_file_size,
     MirrorStatus,
     get_readable_time,
-    async_to_sync,
 )
-from bot.helper.ext_utils.fs_utils import get_path_size
 
 
 class ZipStatus:
@@ -21,11 +19,21 @@ class ZipStatus:
         self.upload_details = listener.upload_details
         self.__uid = listener.uid
         self.__start_time = time()
+        self.__processed = 0
         self.message = listener.message
 
     def gid(self):
         return self.__gid
 
+    def size_raw(self):
+        return self.__size
+
+    def eta_raw(self):
+        try:
+            return (self.__size - self.processed_raw()) / self.speed_raw()
+        except Exception:
+            return None
+
     def speed_raw(self):
         return self.processed_raw() / (time() - self.__start_time)
 
@@ -48,20 +56,18 @@ class ZipStatus:
         return get_readable_file_size(self.__size)
 
     def eta(self):
-        try:
-            seconds = (self.__size - self.processed_raw()) / self.speed_raw()
-            return get_readable_time(seconds)
-        except Exception:
+        if (seconds := self.eta_raw()) is None:
             return "-"
+        return get_readable_time(seconds)
 
     def status(self):
         return MirrorStatus.STATUS_ARCHIVING
 
     def processed_raw(self):
-        if self.__listener.newDir:
-            return async_to_sync(get_path_size, self.__listener.newDir)
-        else:
-            return async_to_sync(get_path_size, self.__listener.dir) - self.__size
+        return min(self.__processed, self.__size)
+
+    def update_progress(self, processed):
+        self.__processed = processed
 
     def processed_bytes(self):
         return get_readable_file_size(self.processed_raw())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+from sqlite3 import connect
+from threading import Lock
+from time import monotonic
+
+from bot import LOGGER
+
+INDEX_PATH = "drive_index.db"
+INDEX_SYNC_INTERVAL = 60
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+FILE_FIELDS = "id, name, mimeType, size, md5Checksum, parents, trashed"
+SEARCH_LIMIT = 150
+MAX_DEPTH = 100
+
+
+class DriveIndex:
+    """
+    Names, ids, sizes, parents and md5 of every file in the indexed shared
+    drives. A drive is listed once, then its changes feed keeps it current.
+    service is anything with the files() and changes() calls of Drive v3.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.__path = path
+        self.__conn = None
+        self.__lock = Lock()
+        self.__synced = {}
+
+    def __db(self):
+        if self.__conn is None:
+            self.__conn = connect(self.__path, check_same_thread=False)
+            self.__conn.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    id TEXT PRIMARY KEY, drive TEXT, name TEXT, mime TEXT,
+                    size INTEGER, md5 TEXT, parent TEXT
+                );
+                CREATE INDEX IF NOT EXISTS files_name ON files (drive, name);
+                CREATE TABLE IF NOT EXISTS drives (id TEXT PRIMARY KEY, token TEXT);
+                """)
+        return self.__conn
+
+    @staticmethod
+    def indexable(drive_id):
+        # shared drives only, My Drive and folders are searched live
+        return bool(drive_id) and drive_id != "root" and len(drive_id) <= 23
+
+    def ready(self, drive_id):
+        return self.__token(drive_id) is not None
+
+    def fresh(self, drive_id):
+        return monotonic() - self.__synced.get(drive_id, 0) < INDEX_SYNC_INTERVAL
+
+    def mark_stale(self):
+        self.__synced.clear()
+
+    def __token(self, drive_id):
+        with self.__lock:
+            row = (
+                self.__db()
+                .execute("SELECT token FROM drives WHERE id = ?", (drive_id,))
+                .fetchone()
+            )
+        return row[0] if row else None
+
+    def __save_token(self, drive_id, token):
+        with self.__lock:
+            db = self.__db()
+            db.execute(
+                "INSERT OR REPLACE INTO drives (id, token) VALUES (?, ?)",
+                (drive_id, token),
+            )
+            db.commit()
+
+    def __apply(self, drive_id, files, removed=()):
+        rows = [
+            (
+                file["id"],
+                drive_id,
+                file.get("name", ""),
+                file.get("mimeType", ""),
+                int(file.get("size", 0)),
+                file.get("md5Checksum"),
+                (file.get("parents") or [None])[0],
+            )
+            for file in files
+        ]
+        with self.__lock:
+            db = self.__db()
+            db.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            db.executemany(
+                "DELETE FROM files WHERE id = ?", [(file_id,) for file_id in removed]
+            )
+            db.commit()
+
+    def sync(self, service, drive_id):
+        if (token := self.__token(drive_id)) is None:
+            self.__bootstrap(service, drive_id)
+        else:
+            self.__update(service, drive_id, token)
+        self.__synced[drive_id] = monotonic()
+
+    def __bootstrap(self, service, drive_id):
+        # the start token is taken first so changes made while listing aren't lost
+        token = (
+            service.changes()
+            .getStartPageToken(driveId=drive_id, supportsAllDrives=True)
+            .execute()["startPageToken"]
+        )
+        with self.__lock:
+            db = self.__db()
+            db.execute("DELETE FROM files WHERE drive = ?", (drive_id,))
+            db.commit()
+        page_token = None
+        total = 0
+        while True:
+            response = (
+                service.files()
+                .list(
+                    corpora="drive",
+                    driveId=drive_id,
+                    includeItemsFromAllDrives=True,
+                    supportsAllDrives=True,
+                    q="trashed = false",
+                    pageSize=1000,
+                    fields=f"nextPageToken, files({FILE_FIELDS})",
+                    pageToken=page_token,
+                )
+                .execute()
+            )
+            files = response.get("files", [])
+            self.__apply(drive_id, files)
+            total += len(files)
+            if (page_token := response.get("nextPageToken")) is None:
+                break
+        self.__save_token(drive_id, token)
+        LOGGER.info(f"Drive index of {drive_id} built with {total} items")
+
+    def __update(self, service, drive_id, token):
+        while True:
+            response = (
+                service.changes()
+                .list(
+                    driveId=drive_id,
+                    pageToken=token,
+                    includeItemsFromAllDrives=True,
+                    supportsAllDrives=True,
+                    pageSize=1000,
+                    fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({FILE_FIELDS}))",
+                )
+                .execute()
+            )
+            files = []
+            removed = []
+            for change in response.get("changes", []):
+                file = change.get("file")
+                if change.get("removed") or file is None or file.get("trashed"):
+                    removed.append(change["fileId"])
+                else:
+                    files.append(file)
+            self.__apply(drive_id, files, removed)
+            if token := response.get("newStartPageToken"):
+                self.__save_token(drive_id, token)
+                break
+            token = response["nextPageToken"]
+            self.__save_token(drive_id, token)
+
+    def search(self, drive_id, name, stopDup, itemType):
+        query = "SELECT id, name, mime, size, md5, parent FROM files WHERE drive = ?"
+        params = [drive_id]
+        if stopDup:
+            query += " AND name = ?"
+            params.append(name)
+        else:
+            for word in name.split():
+                word = (
+                    word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                )
+                query += " AND name LIKE ? ESCAPE '\\'"
+                params.append(f"%{word}%")
+            if itemType == "files":
+                query += " AND mime != ?"
+                params.append(FOLDER_MIME_TYPE)
+            elif itemType == "folders":
+                query += " AND mime = ?"
+                params.append(FOLDER_MIME_TYPE)
+        query += " ORDER BY mime != ?, name LIMIT ?"
+        params.extend([FOLDER_MIME_TYPE, SEARCH_LIMIT])
+        with self.__lock:
+            rows = self.__db().execute(query, params).fetchall()
+        return {
+            "files": [
+                {
+                    "id": file_id,
+                    "name": file_name,
+                    "mimeType": mime_type,
+                    "size": size,
+                    "md5Checksum": md5,
+                    "parents": [parent],
+                    "teamDriveId": drive_id,
+                }
+                for file_id, file_name, mime_type, size, md5, parent in rows
+            ]
+        }
+
+    def path(self, file_id, root_id):
+        # names from below root_id down to the file, None when a parent is missing
+        names = []
+        with self.__lock:
+            db = self.__db()
+            while file_id != root_id:
+                row = db.execute(
+                    "SELECT name, parent FROM files WHERE id = ?", (file_id,)
+                ).fetchone()
+                if row is None or len(names) >= MAX_DEPTH:
+                    return None
+                names.append(row[0])
+                file_id = row[1]
+        names.reverse()
+        return names
+
+
+drive_index = DriveIndex()
@@ -1,12 +1,27 @@
 #!/usr/bin/env python3
 from logging import getLogger, ERROR
-from time import time
+from time import time, sleep, monotonic
 from pickle import load as pload
-from os import makedirs, path as ospath, listdir, remove as osremove
+from os import (
+    makedirs,
+    path as ospath,
+    listdir,
+    remove as osremove,
+    walk,
+    open as osopen,
+    close as osclose,
+    pwrite,
+    O_WRONLY,
+)
+from contextlib import contextmanager
+from queue import Queue
+from threading import local, Lock, Condition, Thread
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import FileIO
-from re import search as re_search
+from re import search as re_search, sub as re_sub
 from urllib.parse import parse_qs, urlparse, quote as rquote
 from random import randrange
+from functools import partial
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -28,10 +43,151 @@ from bot.helper.ext_utils.bot_utils import (
 )
 from bot.helper.ext_utils.fs_utils import get_mime_type
 from bot.helper.ext_utils.leech_utils import format_filename
+from bot.helper.telegram_helper.edit_scheduler import TokenBucket
+from bot.helper.mirror_utils.upload_utils.drive_index import (
+    drive_index,
+    INDEX_SYNC_INTERVAL,
+)
 
 LOGGER = getLogger(__name__)
 getLogger("googleapiclient.discovery").setLevel(ERROR)
 
+# Drive answers userRateLimitExceeded above a few writes per second per account
+DRIVE_WRITE_RATE = 3
+DRIVE_WRITE_BURST = 10
+MAX_RATE_LIMIT_RETRIES = 5
+# sub-requests per batch request, Drive counts each one against the write rate
+BATCH_SIZE = DRIVE_WRITE_BURST
+QUERY_CACHE_TTL = 60
+MAX_CACHED_QUERIES = 500
+MAX_LIST_WORKERS = 10
+# bytes fetched by one ranged download request
+DOWNLOAD_CHUNK = 16 * 1024 * 1024
+
+
+class DriveUploadSlots:
+    # caps the files uploading to Drive at once across all tasks
+
+    def __init__(self):
+        self.__active = 0
+        self.__changed = Condition()
+
+    def __free(self):
+        limit = config_dict["GDRIVE_PARALLEL_UPLOADS_ALL"]
+        return not limit or self.__active < limit
+
+    def __enter__(self):
+        with self.__changed:
+            self.__changed.wait_for(self.__free)
+            self.__active += 1
+
+    def __exit__(self, *args):
+        with self.__changed:
+            self.__active -= 1
+            self.__changed.notify_all()
+
+
+upload_slots = DriveUploadSlots()
+
+
+class DriveRateLimiter:
+    # paces the write requests of every account, shared by all tasks
+
+    def __init__(self):
+        self.__buckets = {}
+        self.__paused = {}
+        self.__lock = Lock()
+
+    def acquire(self, key, count=1):
+        # a batch takes one token per sub-request, at most DRIVE_WRITE_BURST
+        while True:
+            with self.__lock:
+                bucket = self.__buckets.setdefault(
+                    key, TokenBucket(DRIVE_WRITE_RATE, DRIVE_WRITE_BURST)
+                )
+                wait = max(bucket.delay(count), self.__paused.get(key, 0) - monotonic())
+                if wait <= 0:
+                    bucket.consume(count)
+                    return
+            sleep(wait)
+
+    def backoff(self, key, seconds):
+        with self.__lock:
+            self.__paused[key] = max(self.__paused.get(key, 0), monotonic() + seconds)
+
+
+drive_limiter = DriveRateLimiter()
+
+
+class DriveQueryCache:
+    # search results of every drive, cleared whenever the bot changes Drive
+
+    def __init__(self):
+        self.__entries = {}
+        self.__lock = Lock()
+
+    def get(self, key):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < monotonic():
+                del self.__entries[key]
+                return None
+            return entry[1]
+
+    def set(self, key, response):
+        with self.__lock:
+            if len(self.__entries) >= MAX_CACHED_QUERIES:
+                now = monotonic()
+                self.__entries = {
+                    key_: entry
+                    for key_, entry in self.__entries.items()
+                    if entry[0] >= now
+                }
+            if len(self.__entries) < MAX_CACHED_QUERIES:
+                self.__entries[key] = (monotonic() + QUERY_CACHE_TTL, response)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+
+query_cache = DriveQueryCache()
+
+
+class DownloadBuffer:
+    # bytes of downloaded ranges held in memory at once across all tasks
+
+    def __init__(self):
+        self.__used = 0
+        self.__changed = Condition()
+
+    def __fits(self, size):
+        budget = (config_dict["GDRIVE_DOWNLOAD_MEMORY"] or 0) * 1024 * 1024
+        return not budget or not self.__used or self.__used + size <= budget
+
+    @contextmanager
+    def reserve(self, size):
+        with self.__changed:
+            self.__changed.wait_for(lambda: self.__fits(size))
+            self.__used += size
+        try:
+            yield
+        finally:
+            with self.__changed:
+                self.__used -= size
+                self.__changed.notify_all()
+
+
+download_buffer = DownloadBuffer()
+
+
+def drive_changed():
+    # our own uploads, clones and deletes show up in the next search
+    query_cache.clear()
+    drive_index.mark_stale()
+
 
 class GoogleDriveHelper:
 
@@ -59,17 +215,56 @@ class GoogleDriveHelper:
         self.__is_cloning = False
         self.__is_cancelled = False
         self.__is_errored = False
-        self.__status = None
         self.__updater = None
         self.__update_interval = 3
         self.__sa_index = 0
         self.__sa_count = 1
         self.__sa_number = 100
+        self.__local = local()
+        self.__lock = Lock()
+        self.__workers = 0
         self.__service = self.__authorize()
-        self.__file_processed_bytes = 0
+        # workers start from the account the task started with
+        self.__sa_base = self.__sa_index
         self.__processed_bytes = 0
+        self.__done_bytes = 0
+        self.__files_progress = {}
+        self.__permissions = []
+        self.__index_service = None
         self.name = name
 
+    @property
+    def __service(self):
+        # worker threads use their own client, httplib2 isn't thread safe
+        return getattr(self.__local, "service", None) or self.__main_service
+
+    @__service.setter
+    def __service(self, service):
+        if hasattr(self.__local, "service"):
+            self.__local.service = service
+        else:
+            self.__main_service = service
+
+    def __init_worker(self):
+        with self.__lock:
+            index = self.__workers
+            self.__workers += 1
+        self.__local.worker = True
+        if self.__alt_auth:
+            # the task moved to token.pickle after a File not found
+            self.__local.service = self.__token_service()
+            return
+        if not config_dict["USE_SERVICE_ACCOUNTS"]:
+            self.__local.service = self.__authorize()
+            return
+        # spread the workers over the service accounts
+        self.__local.service = self.__authorize(self.__sa_base + index)
+
+    def __sa_key(self):
+        if not config_dict["USE_SERVICE_ACCOUNTS"]:
+            return "token"
+        return getattr(self.__local, "sa_index", self.__sa_index)
+
     @property
     def speed(self):
         try:
@@ -81,17 +276,24 @@ class GoogleDriveHelper:
     def processed_bytes(self):
         return self.__processed_bytes
 
-    def __authorize(self):
+    def __authorize(self, sa_index=None):
         credentials = None
         if config_dict["USE_SERVICE_ACCOUNTS"]:
             json_files = listdir("accounts")
             self.__sa_number = len(json_files)
-            self.__sa_index = randrange(self.__sa_number)
-            LOGGER.info(
-                f"Authorizing with {json_files[self.__sa_index]} service account"
+            sa_index = (
+                randrange(self.__sa_number)
+                if sa_index is None
+                else sa_index % self.__sa_number
             )
+            # workers keep their account to themselves, see __sa_key
+            if getattr(self.__local, "worker", False):
+                self.__local.sa_index = sa_index
+            else:
+                self.__sa_index = sa_index
+            LOGGER.info(f"Authorizing with {json_files[sa_index]} service account")
             credentials = service_account.Credentials.from_service_account_file(
-                f"accounts/{json_files[self.__sa_index]}", scopes=self.__OAUTH_SCOPE
+                f"accounts/{json_files[sa_index]}", scopes=self.__OAUTH_SCOPE
             )
         elif ospath.exists("token.pickle"):
             LOGGER.info("Authorize with token.pickle")
@@ -104,25 +306,45 @@ class GoogleDriveHelper:
     def __alt_authorize(self):
         if not self.__alt_auth:
             self.__alt_auth = True
-            if ospath.exists("token.pickle"):
-                LOGGER.info("Authorize with token.pickle")
-                with open("token.pickle", "rb") as f:
-                    credentials = pload(f)
-                return build(
-                    "drive", "v3", credentials=credentials, cache_discovery=False
-                )
-            else:
-                LOGGER.error("token.pickle not found!")
+            return self.__token_service()
+        return None
+
+    @staticmethod
+    def __token_service():
+        if ospath.exists("token.pickle"):
+            LOGGER.info("Authorize with token.pickle")
+            with open("token.pickle", "rb") as f:
+                credentials = pload(f)
+            return build("drive", "v3", credentials=credentials, cache_discovery=False)
+        LOGGER.error("token.pickle not found!")
         return None
 
+    def __init_list_worker(self):
+        # searching several drives uses token.pickle like the single threaded search
+        self.__local.worker = True
+        self.__local.service = self.__token_service() or self.__authorize()
+
     def __switchServiceAccount(self):
-        if self.__sa_index == self.__sa_number - 1:
-            self.__sa_index = 0
-        else:
-            self.__sa_index += 1
+        sa_index = (self.__sa_key() + 1) % self.__sa_number
         self.__sa_count += 1
-        LOGGER.info(f"Switching to {self.__sa_index} index")
-        self.__service = self.__authorize()
+        LOGGER.info(f"Switching to {sa_index} index")
+        self.__service = self.__authorize(sa_index)
+
+    def __rate_limited(self, key, reason, attempt):
+        # the account is paused for every worker, the calling one moves to the
+        # next service account or waits to try again
+        drive_limiter.backoff(key, min(2**attempt, 64))
+        if config_dict["USE_SERVICE_ACCOUNTS"]:
+            if self.__sa_count < self.__sa_number:
+                self.__switchServiceAccount()
+                return True
+            LOGGER.info(
+                f"Reached maximum number of service accounts switching, which is {self.__sa_count}"
+            )
+        if reason != "userRateLimitExceeded" or attempt > MAX_RATE_LIMIT_RETRIES:
+            return False
+        LOGGER.info(f"Got: {reason}, Trying Again.")
+        return True
 
     @staticmethod
     def getIdFromUrl(link):
@@ -152,24 +374,90 @@ class GoogleDriveHelper:
         except Exception:
             return
 
-    @retry(
-        wait=wait_exponential(multiplier=2, min=3, max=6),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(Exception),
-    )
+    @staticmethod
+    def __retryable(err):
+        if not isinstance(err, HttpError):
+            return True
+        if err.resp.status in [429, 500, 502, 503, 504]:
+            return True
+        return err.resp.status == 403 and b"ratelimitexceeded" in err.content.lower()
+
+    def __execute_batch(self, requests):
+        # requests: {key: function building the request from a service}, sent as
+        # many per call as the write bucket holds, failed sub-requests are sent
+        # again when retryable
+        results = {}
+        errors = {}
+        pending = list(requests.items())
+        responses = {}
+
+        def collect(request_id, response, exception):
+            responses[request_id] = (response, exception)
+
+        attempt = 0
+        while pending and not self.__is_cancelled:
+            failed = []
+            for start in range(0, len(pending), BATCH_SIZE):
+                chunk = pending[start : start + BATCH_SIZE]
+                responses.clear()
+                batch = self.__service.new_batch_http_request(callback=collect)
+                for index, (_, request) in enumerate(chunk):
+                    batch.add(request(self.__service), request_id=str(index))
+                drive_limiter.acquire(self.__sa_key(), len(chunk))
+                try:
+                    batch.execute()
+                except Exception as e:
+                    responses.update(
+                        {str(index): (None, e) for index in range(len(chunk))}
+                    )
+                for index, (key, request) in enumerate(chunk):
+                    response, exception = responses.get(str(index), (None, None))
+                    if exception is None:
+                        results[key] = response
+                        errors.pop(key, None)
+                    else:
+                        errors[key] = exception
+                        if self.__retryable(exception):
+                            failed.append((key, request))
+            attempt += 1
+            if not failed or attempt > MAX_RATE_LIMIT_RETRIES:
+                break
+            LOGGER.info(f"Retrying {len(failed)} failed batch requests")
+            drive_limiter.backoff(self.__sa_key(), min(2**attempt, 64))
+            pending = failed
+        return results, errors
+
     def __set_permission(self, file_id):
+        # permissions are set together by __flush_permissions
+        with self.__lock:
+            self.__permissions.append(file_id)
+
+    @staticmethod
+    def __permission_request(file_id, service):
         permissions = {
             "role": "reader",
             "type": "anyone",
             "value": None,
             "withLink": True,
         }
-        return (
-            self.__service.permissions()
-            .create(fileId=file_id, body=permissions, supportsAllDrives=True)
-            .execute()
+        return service.permissions().create(
+            fileId=file_id, body=permissions, supportsAllDrives=True
         )
 
+    def __flush_permissions(self):
+        with self.__lock:
+            file_ids, self.__permissions = self.__permissions, []
+        if not file_ids:
+            return
+        _, errors = self.__execute_batch(
+            {
+                file_id: partial(self.__permission_request, file_id)
+                for file_id in file_ids
+            }
+        )
+        for file_id, err in errors.items():
+            LOGGER.error(f"Permission not set for {file_id}: {err}")
+
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
         stop=stop_after_attempt(3),
@@ -216,16 +504,10 @@ class GoogleDriveHelper:
         return files
 
     async def __progress(self):
-        if self.__status is not None:
-            chunk_size = (
-                self.__status.total_size * self.__status.progress()
-                - self.__file_processed_bytes
-            )
-            self.__file_processed_bytes = (
-                self.__status.total_size * self.__status.progress()
-            )
-            self.__processed_bytes += chunk_size
-            self.__total_time += self.__update_interval
+        self.__processed_bytes = self.__done_bytes + sum(
+            list(self.__files_progress.values())
+        )
+        self.__total_time += self.__update_interval
 
     def deletefile(self, link: str):
         try:
@@ -239,6 +521,7 @@ class GoogleDriveHelper:
             ).execute()
             msg = "Successfully deleted"
             LOGGER.info(f"Delete Result: {msg}")
+            drive_changed()
         except HttpError as err:
             if "File not found" in str(err) or "insufficientFilePermissions" in str(
                 err
@@ -253,6 +536,14 @@ class GoogleDriveHelper:
             msg = str(err)
         return msg
 
+    @staticmethod
+    def __clean_request(file_id, trash, service):
+        if trash:
+            return service.files().update(
+                fileId=file_id, body={"trashed": True}, supportsAllDrives=True
+            )
+        return service.files().delete(fileId=file_id, supportsAllDrives=True)
+
     def driveclean(self, drive_id: str, trash: bool):
         msg = ""
         query = f"'{drive_id}' in parents and trashed = false"
@@ -272,17 +563,18 @@ class GoogleDriveHelper:
                     .execute()
                 )
                 files = drive_query.get("files", [])
+                results, errors = self.__execute_batch(
+                    {
+                        file["id"]: partial(self.__clean_request, file["id"], trash)
+                        for file in files
+                    }
+                )
                 for file in files:
-                    self.__total_files += 1
-                    self.__total_bytes += int(file.get("size", 0))
-                    if trash:
-                        self.__service.files().update(
-                            fileId=file["id"], body={"trashed": True}
-                        ).execute()
-                    else:
-                        self.__service.files().delete(
-                            fileId=file["id"], supportsAllDrives=True
-                        ).execute()
+                    if file["id"] in results:
+                        self.__total_files += 1
+                        self.__total_bytes += int(file.get("size", 0))
+                for file_id, err in errors.items():
+                    LOGGER.error(f"Drive clean failed for {file_id}: {err}")
                 page_token = drive_query.get("nextPageToken", None)
                 if page_token is None:
                     msg = (
@@ -296,6 +588,7 @@ class GoogleDriveHelper:
                 msg = str(err).replace(">", "").replace("<", "")
                 LOGGER.error(err)
                 break
+        drive_changed()
         return msg
 
     def upload(self, file_name, size, gdrive_id):
@@ -332,6 +625,8 @@ class GoogleDriveHelper:
                 if self.__is_cancelled:
                     return
                 LOGGER.info(f"Uploaded To G-Drive: {file_name}")
+            self.__flush_permissions()
+            drive_changed()
         except Exception as err:
             if isinstance(err, RetryError):
                 LOGGER.info(f"Total Attempts: {err.last_attempt.attempt_number}")
@@ -360,29 +655,52 @@ class GoogleDriveHelper:
             )
 
     def __upload_dir(self, input_directory, dest_id):
-        list_dirs = listdir(input_directory)
-        if len(list_dirs) == 0:
+        # the folder tree is created first, then the files are uploaded by a worker pool
+        folders = {input_directory: dest_id}
+        levels = {}
+        files = []
+        for dirpath, dirnames, filenames in walk(input_directory):
+            for dirname in dirnames:
+                path = ospath.join(dirpath, dirname)
+                levels.setdefault(path.count("/"), []).append((path, dirname, dirpath))
+            for file_ in filenames:
+                file_path = ospath.join(dirpath, file_)
+                if file_.lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
+                    osremove(file_path)
+                else:
+                    files.append((file_path, file_, dirpath))
+        # the folders of every level are created with batch requests
+        for depth in sorted(levels):
+            level = levels[depth]
+            dir_ids = self.__create_directories(
+                [(dirname, folders[parent]) for _, dirname, parent in level]
+            )
+            if dir_ids is None:
+                return None
+            for (path, _, _), dir_id in zip(level, dir_ids):
+                folders[path] = dir_id
+            self.__total_folders += len(level)
+        files = [(path, name, folders[parent]) for path, name, parent in files]
+        if not files:
             return dest_id
-        new_id = None
-        for item in list_dirs:
-            current_file_name = ospath.join(input_directory, item)
-            if ospath.isdir(current_file_name):
-                current_dir_id = self.__create_directory(item, dest_id)
-                new_id = self.__upload_dir(current_file_name, current_dir_id)
-                self.__total_folders += 1
-            elif not item.lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
-                mime_type = get_mime_type(current_file_name)
-                file_name = current_file_name.split("/")[-1]
-                # current_file_name will have the full path
-                self.__upload_file(current_file_name, file_name, mime_type, dest_id)
-                self.__total_files += 1
-                new_id = dest_id
-            else:
-                osremove(current_file_name)
-                new_id = "filter"
+        workers = min(config_dict["GDRIVE_PARALLEL_UPLOADS"] or 1, len(files))
+        pool = ThreadPoolExecutor(max_workers=workers, initializer=self.__init_worker)
+        try:
+            futures = [pool.submit(self.__upload_dir_file, *file) for file in files]
+            for future in as_completed(futures):
+                future.result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+        return None if self.__is_cancelled else dest_id
+
+    def __upload_dir_file(self, file_path, file_name, dest_id):
+        with upload_slots:
             if self.__is_cancelled:
-                break
-        return new_id
+                return
+            mime_type = get_mime_type(file_path)
+            self.__upload_file(file_path, file_name, mime_type, dest_id)
+            with self.__lock:
+                self.__total_files += 1
 
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
@@ -390,6 +708,20 @@ class GoogleDriveHelper:
         retry=retry_if_exception_type(Exception),
     )
     def __create_directory(self, directory_name, dest_id):
+        file_metadata = self.__directory_metadata(directory_name, dest_id)
+        drive_limiter.acquire(self.__sa_key())
+        file = (
+            self.__service.files()
+            .create(body=file_metadata, supportsAllDrives=True)
+            .execute()
+        )
+        file_id = file.get("id")
+        if not config_dict["IS_TEAM_DRIVE"]:
+            self.__set_permission(file_id)
+        LOGGER.info(f'Created G-Drive Folder:\nName: {file.get("name")}\nID: {file_id}')
+        return file_id
+
+    def __directory_metadata(self, directory_name, dest_id):
         directory_name, _ = async_to_sync(
             format_filename, directory_name, self.__user_id, isMirror=True
         )
@@ -400,16 +732,38 @@ class GoogleDriveHelper:
         }
         if dest_id is not None:
             file_metadata["parents"] = [dest_id]
-        file = (
-            self.__service.files()
-            .create(body=file_metadata, supportsAllDrives=True)
-            .execute()
+        return file_metadata
+
+    @staticmethod
+    def __directory_request(file_metadata, service):
+        return service.files().create(body=file_metadata, supportsAllDrives=True)
+
+    def __create_directories(self, folders):
+        # folders: (name, parent id), returns the ids in the same order
+        results, errors = self.__execute_batch(
+            {
+                index: partial(
+                    self.__directory_request,
+                    self.__directory_metadata(directory_name, dest_id),
+                )
+                for index, (directory_name, dest_id) in enumerate(folders)
+            }
         )
-        file_id = file.get("id")
-        if not config_dict["IS_TEAM_DRIVE"]:
-            self.__set_permission(file_id)
-        LOGGER.info(f'Created G-Drive Folder:\nName: {file.get("name")}\nID: {file_id}')
-        return file_id
+        if errors:
+            raise next(iter(errors.values()))
+        dir_ids = []
+        for index in range(len(folders)):
+            file = results.get(index)
+            if file is None:
+                return None
+            file_id = file.get("id")
+            if not config_dict["IS_TEAM_DRIVE"]:
+                self.__set_permission(file_id)
+            LOGGER.info(
+                f'Created G-Drive Folder:\nName: {file.get("name")}\nID: {file_id}'
+            )
+            dir_ids.append(file_id)
+        return dir_ids
 
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
@@ -429,7 +783,8 @@ class GoogleDriveHelper:
         if dest_id is not None:
             file_metadata["parents"] = [dest_id]
 
-        if ospath.getsize(file_path) == 0:
+        file_size = ospath.getsize(file_path)
+        if file_size == 0:
             media_body = MediaFileUpload(file_path, mimetype=mime_type, resumable=False)
             response = (
                 self.__service.files()
@@ -459,7 +814,9 @@ class GoogleDriveHelper:
         retries = 0
         while response is None and not self.__is_cancelled:
             try:
-                self.__status, response = drive_file.next_chunk()
+                status, response = drive_file.next_chunk()
+                if status is not None:
+                    self.__files_progress[file_path] = status.resumable_progress
             except HttpError as err:
                 if err.resp.status in [500, 502, 503, 504] and retries < 10:
                     retries += 1
@@ -492,12 +849,14 @@ class GoogleDriveHelper:
                         raise err
         if self.__is_cancelled:
             return
+        with self.__lock:
+            self.__files_progress.pop(file_path, None)
+            self.__done_bytes += file_size
         if not self.__listener.seed or self.__listener.newDir:
             try:
                 osremove(file_path)
             except Exception:
                 pass
-        self.__file_processed_bytes = 0
         # Insert new permissions
         if not config_dict["IS_TEAM_DRIVE"]:
             self.__set_permission(response["id"])
@@ -537,6 +896,7 @@ class GoogleDriveHelper:
                     LOGGER.info("Deleting cloned data from Drive...")
                     self.deletefile(durl)
                     return None, None, None, None, None
+                self.__flush_permissions()
                 mime_type = "Folder"
                 size = self.__processed_bytes
             else:
@@ -546,6 +906,7 @@ class GoogleDriveHelper:
                 if mime_type is None:
                     mime_type = "File"
                 size = int(meta.get("size", 0))
+            drive_changed()
             return durl, size, mime_type, self.__total_files, self.__total_folders
         except Exception as err:
             if isinstance(err, RetryError):
@@ -568,25 +929,57 @@ class GoogleDriveHelper:
             return None, None, None, None, None
 
     def __cloneFolder(self, name, local_path, folder_id, dest_id):
-        LOGGER.info(f"Syncing: {local_path}")
-        files = self.__getFilesByFolderId(folder_id)
-        if len(files) == 0:
-            return dest_id
-        for file in files:
-            if file.get("mimeType") == self.__G_DRIVE_DIR_MIME_TYPE:
-                self.__total_folders += 1
-                file_path = ospath.join(local_path, file.get("name"))
-                current_dir_id = self.__create_directory(file.get("name"), dest_id)
-                self.__cloneFolder(
-                    file.get("name"), file_path, file.get("id"), current_dir_id
+        # folders are listed level by level and the subfolders of a level are
+        # created together, files are copied by another pool while listing goes on
+        workers = config_dict["GDRIVE_PARALLEL_COPIES"] or 1
+        lister = ThreadPoolExecutor(max_workers=workers, initializer=self.__init_worker)
+        copier = ThreadPoolExecutor(max_workers=workers, initializer=self.__init_worker)
+        copies = []
+        try:
+            level = [(local_path, folder_id, dest_id)]
+            while level and not self.__is_cancelled:
+                listings = lister.map(
+                    lambda folder: self.__getFilesByFolderId(folder[1]), level
                 )
-            elif not file.get("name").lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
-                self.__total_files += 1
-                self.__copyFile(file.get("id"), dest_id, file.get("name"))
-                self.__processed_bytes += int(file.get("size", 0))
-                self.__total_time = int(time() - self.__start_time)
-            if self.__is_cancelled:
-                break
+                subfolders = []
+                for (path, _, parent_id), files in zip(level, listings):
+                    LOGGER.info(f"Syncing: {path}")
+                    for file in files:
+                        file_name = file.get("name")
+                        if file.get("mimeType") == self.__G_DRIVE_DIR_MIME_TYPE:
+                            subfolders.append(
+                                (ospath.join(path, file_name), file, parent_id)
+                            )
+                        elif not file_name.lower().endswith(
+                            tuple(GLOBAL_EXTENSION_FILTER)
+                        ):
+                            copies.append(
+                                copier.submit(self.__clone_file, file, parent_id)
+                            )
+                created = self.__create_directories(
+                    [(file.get("name"), parent_id) for _, file, parent_id in subfolders]
+                )
+                if created is None:
+                    break
+                level = [
+                    (path, file.get("id"), dir_id)
+                    for (path, file, _), dir_id in zip(subfolders, created)
+                ]
+                self.__total_folders += len(level)
+            for future in as_completed(copies):
+                future.result()
+        finally:
+            lister.shutdown(cancel_futures=True)
+            copier.shutdown(cancel_futures=True)
+
+    def __clone_file(self, file, dest_id):
+        if self.__is_cancelled:
+            return
+        self.__copyFile(file.get("id"), dest_id, file.get("name"))
+        with self.__lock:
+            self.__total_files += 1
+            self.__processed_bytes += int(file.get("size", 0))
+            self.__total_time = int(time() - self.__start_time)
 
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
@@ -598,14 +991,19 @@ class GoogleDriveHelper:
             format_filename, file_name, self.__user_id, isMirror=True
         )
         body = {"name": file_name, "parents": [dest_id]}
-        try:
-            return (
-                self.__service.files()
-                .copy(fileId=file_id, body=body, supportsAllDrives=True)
-                .execute()
-            )
-        except HttpError as err:
-            if err.resp.get("content-type", "").startswith("application/json"):
+        attempt = 0
+        while not self.__is_cancelled:
+            key = self.__sa_key()
+            drive_limiter.acquire(key)
+            try:
+                return (
+                    self.__service.files()
+                    .copy(fileId=file_id, body=body, supportsAllDrives=True)
+                    .execute()
+                )
+            except HttpError as err:
+                if not err.resp.get("content-type", "").startswith("application/json"):
+                    return
                 reason = eval(err.content).get("error").get("errors")[0].get("reason")
                 if reason not in [
                     "userRateLimitExceeded",
@@ -615,18 +1013,9 @@ class GoogleDriveHelper:
                     raise err
                 if reason == "cannotCopyFile":
                     LOGGER.error(err)
-                elif config_dict["USE_SERVICE_ACCOUNTS"]:
-                    if self.__sa_count >= self.__sa_number:
-                        LOGGER.info(
-                            f"Reached maximum number of service accounts switching, which is {self.__sa_count}"
-                        )
-                        raise err
-                    else:
-                        if self.__is_cancelled:
-                            return
-                        self.__switchServiceAccount()
-                        return self.__copyFile(file_id, dest_id, file_name)
-                else:
+                    return
+                attempt += 1
+                if not self.__rate_limited(key, reason, attempt):
                     LOGGER.error(f"Got: {reason}")
                     raise err
 
@@ -647,6 +1036,10 @@ class GoogleDriveHelper:
                 .execute()
                 .get("id")
             )
+        if config_dict["DRIVE_INDEX"] and (
+            names := drive_index.path(file.get("id"), rootid)
+        ):
+            return names
         x = file.get("name")
         y = file.get("id")
         while y != rootid:
@@ -666,6 +1059,32 @@ class GoogleDriveHelper:
         return rtnlist
 
     def __drive_query(self, dir_id, fileName, stopDup, isRecursive, itemType):
+        if (
+            isRecursive
+            and config_dict["DRIVE_INDEX"]
+            and drive_index.indexable(dir_id)
+            and drive_index.ready(dir_id)
+        ):
+            if not drive_index.fresh(dir_id):
+                try:
+                    drive_index.sync(self.__service, dir_id)
+                except Exception as e:
+                    LOGGER.error(f"Drive index sync of {dir_id} failed: {e}")
+            # the name was escaped for a Drive query
+            name = re_sub(r"\\(.)", r"\1", fileName)
+            return drive_index.search(dir_id, name, stopDup, itemType)
+        # duplicate checks match the exact name, a contains search only the words
+        name = fileName if stopDup else " ".join(fileName.lower().split())
+        key = (dir_id, name, stopDup, isRecursive, itemType)
+        if (response := query_cache.get(key)) is None:
+            response = self.__run_drive_query(
+                dir_id, fileName, stopDup, isRecursive, itemType
+            )
+            if response is not None:
+                query_cache.set(key, response)
+        return response or {"files": []}
+
+    def __run_drive_query(self, dir_id, fileName, stopDup, isRecursive, itemType):
         try:
             if isRecursive:
                 if stopDup:
@@ -740,7 +1159,71 @@ class GoogleDriveHelper:
         except Exception as err:
             err = str(err).replace(">", "").replace("<", "")
             LOGGER.error(err)
-            return {"files": []}
+            return None
+
+    def __drive_items(self, drive, fileName, stopDup, isRecursive, itemType, userId):
+        dir_id = drive["drive_id"]
+        index_url = drive["index_link"]
+        isRecur = False if isRecursive and len(dir_id) > 23 else isRecursive
+        response = self.__drive_query(dir_id, fileName, stopDup, isRecur, itemType)
+        items = []
+        for file in response.get("files", []):
+            mime_type = file.get("mimeType")
+            item = "<li>"
+            if mime_type == "application/vnd.google-apps.folder":
+                furl = f"https://drive.google.com/drive/folders/{file.get('id')}"
+                item += f"📁 <code>{file.get('name')}<br>(folder)</code><br>"
+                drive_link = False
+                if userId == OWNER_ID or not config_dict["DISABLE_DRIVE_LINK"]:
+                    item += f"<b>🗃 <a href={furl}>Drive Link</a></b>"
+                    drive_link = True
+                if index_url:
+                    if drive_link:
+                        item += "<b> |</b>"
+                    if isRecur:
+                        url_path = "/".join(
+                            [
+                                rquote(n, safe="")
+                                for n in self.__get_recursive_list(file, dir_id)
+                            ]
+                        )
+                    else:
+                        url_path = rquote(f'{file.get("name")}', safe="")
+                    url = f"{index_url}/{url_path}/"
+                    item += f' <b>⚡️ <a href="{url}">Index Link</a></b>'
+            elif mime_type == "application/vnd.google-apps.shortcut":
+                furl = f"https://drive.google.com/drive/folders/{file.get('id')}"
+                item += (
+                    f"⁍<a href='https://drive.google.com/drive/folders/{file.get('id')}'>{file.get('name')}"
+                    f"</a> (shortcut)"
+                )
+            else:
+                furl = (
+                    f"https://drive.google.com/uc?id={file.get('id')}&export=download"
+                )
+                item += f"📄 <code>{file.get('name')}<br>({get_readable_file_size(int(file.get('size', 0)))})</code><br>"
+                drive_link = False
+                if userId == OWNER_ID or not config_dict["DISABLE_DRIVE_LINK"]:
+                    item += f"<b>🗃 <a href={furl}>Drive Link</a></b>"
+                    drive_link = True
+                if index_url:
+                    if drive_link:
+                        item += "<b> |</b>"
+                    if isRecur:
+                        url_path = "/".join(
+                            rquote(n, safe="")
+                            for n in self.__get_recursive_list(file, dir_id)
+                        )
+                    else:
+                        url_path = rquote(f'{file.get("name")}')
+                    url = f"{index_url}/{url_path}"
+                    item += f' <b>⚡️ <a href="{url}">Index Link</a></b>'
+                    if mime_type.startswith(("image", "video", "audio")):
+                        urlv = f"{index_url}/{url_path}?a=view"
+                        item += f' <b>| 🔍 <a href="{urlv}">View Link</a></b>'
+            item += "</li><br><br>"
+            items.append(item)
+        return items
 
     def drive_list(
         self,
@@ -759,92 +1242,56 @@ class GoogleDriveHelper:
         merged_dict = list_drives_dict
         if userId and (user_tds := async_to_sync(fetch_user_tds, userId)):
             merged_dict = {**list_drives_dict, **user_tds}
-        if len(merged_dict) > 1:
-            token_service = self.__alt_authorize()
-            if token_service is not None:
-                self.__service = token_service
-        for no, (drive_name, drives_dict) in enumerate(merged_dict.items(), start=1):
-            dir_id = drives_dict["drive_id"]
-            index_url = drives_dict["index_link"]
-            isRecur = False if isRecursive and len(dir_id) > 23 else isRecursive
-            response = self.__drive_query(dir_id, fileName, stopDup, isRecur, itemType)
-            if not response["files"]:
-                if noMulti:
-                    break
-                else:
+        drives = list(merged_dict.items())
+        if noMulti:
+            drives = drives[:1]
+        args = (fileName, stopDup, isRecursive, itemType, userId)
+        # drives are searched together, the pages are built in drive order
+        with ThreadPoolExecutor(
+            max_workers=min(len(drives), MAX_LIST_WORKERS) or 1,
+            initializer=self.__init_list_worker if len(drives) > 1 else None,
+        ) as pool:
+            futures = [
+                pool.submit(self.__drive_items, drives_dict, *args)
+                for _, drives_dict in drives
+            ]
+            for no, ((drive_name, _), future) in enumerate(
+                zip(drives, futures), start=1
+            ):
+                items = future.result()
+                if not items:
                     continue
-            if not Title:
-                msg += f"<h4>📌 Drive Query : {fileName}</h4>"
-                Title = True
-            if drive_name:
-                msg += f"<aside>╾──────────────────────╼</aside><br><aside><b>#{no} {drive_name} Drive</b></aside><br><aside>╾──────────────────────╼</aside><br>"
-            msg += "<ol>"
-            for file in response.get("files", []):
-                mime_type = file.get("mimeType")
-                msg += "<li>"
-                if mime_type == "application/vnd.google-apps.folder":
-                    furl = f"https://drive.google.com/drive/folders/{file.get('id')}"
-                    msg += f"📁 <code>{file.get('name')}<br>(folder)</code><br>"
-                    drive_link = False
-                    if userId == OWNER_ID or not config_dict["DISABLE_DRIVE_LINK"]:
-                        msg += f"<b>🗃 <a href={furl}>Drive Link</a></b>"
-                        drive_link = True
-                    if index_url:
-                        if drive_link:
-                            msg += "<b> |</b>"
-                        if isRecur:
-                            url_path = "/".join(
-                                [
-                                    rquote(n, safe="")
-                                    for n in self.__get_recursive_list(file, dir_id)
-                                ]
-                            )
-                        else:
-                            url_path = rquote(f'{file.get("name")}', safe="")
-                        url = f"{index_url}/{url_path}/"
-                        msg += f' <b>⚡️ <a href="{url}">Index Link</a></b>'
-                elif mime_type == "application/vnd.google-apps.shortcut":
-                    furl = f"https://drive.google.com/drive/folders/{file.get('id')}"
-                    msg += (
-                        f"⁍<a href='https://drive.google.com/drive/folders/{file.get('id')}'>{file.get('name')}"
-                        f"</a> (shortcut)"
-                    )
-                else:
-                    furl = f"https://drive.google.com/uc?id={file.get('id')}&export=download"
-                    msg += f"📄 <code>{file.get('name')}<br>({get_readable_file_size(int(file.get('size', 0)))})</code><br>"
-                    drive_link = False
-                    if userId == OWNER_ID or not config_dict["DISABLE_DRIVE_LINK"]:
-                        msg += f"<b>🗃 <a href={furl}>Drive Link</a></b>"
-                        drive_link = True
-                    if index_url:
-                        if drive_link:
-                            msg += "<b> |</b>"
-                        if isRecur:
-                            url_path = "/".join(
-                                rquote(n, safe="")
-                                for n in self.__get_recursive_list(file, dir_id)
-                            )
-                        else:
-                            url_path = rquote(f'{file.get("name")}')
-                        url = f"{index_url}/{url_path}"
-                        msg += f' <b>⚡️ <a href="{url}">Index Link</a></b>'
-                        if mime_type.startswith(("image", "video", "audio")):
-                            urlv = f"{index_url}/{url_path}?a=view"
-                            msg += f' <b>| 🔍 <a href="{urlv}">View Link</a></b>'
-                msg += "</li><br><br>"
-                contents_no += 1
-                if len(msg.encode("utf-8")) > 39000:
-                    telegraph_content.append(msg)
-                    msg = ""
-            msg += "</ol>"
-            if noMulti:
-                break
+                if not Title:
+                    msg += f"<h4>📌 Drive Query : {fileName}</h4>"
+                    Title = True
+                if drive_name:
+                    msg += f"<aside>╾──────────────────────╼</aside><br><aside><b>#{no} {drive_name} Drive</b></aside><br><aside>╾──────────────────────╼</aside><br>"
+                msg += "<ol>"
+                for item in items:
+                    msg += item
+                    contents_no += 1
+                    if len(msg.encode("utf-8")) > 39000:
+                        telegraph_content.append(msg)
+                        msg = ""
+                msg += "</ol>"
 
         if msg != f"""<figure><img src='{config_dict["COVER_IMAGE"]}'></figure>""":
             telegraph_content.append(msg)
 
         return telegraph_content, contents_no
 
+    def sync_index(self):
+        if self.__index_service is None:
+            self.__index_service = self.__token_service() or self.__service
+        for drive in list(list_drives_dict.values()):
+            dir_id = drive["drive_id"]
+            if not drive_index.indexable(dir_id):
+                continue
+            try:
+                drive_index.sync(self.__index_service, dir_id)
+            except Exception as e:
+                LOGGER.error(f"Drive index sync of {dir_id} failed: {e}")
+
     def count(self, link):
         try:
             file_id = self.getIdFromUrl(link)
@@ -901,38 +1348,94 @@ class GoogleDriveHelper:
         size = int(filee.get("size", 0))
         self.__total_bytes += size
 
+    @property
+    def count_progress(self):
+        return self.__total_files, self.__total_folders, self.__total_bytes
+
     def __gDrive_directory(self, drive_folder):
-        files = self.__getFilesByFolderId(drive_folder["id"])
-        if len(files) == 0:
+        # breadth first over a shared queue, every page of a folder and every
+        # shortcut target is a job of its own so the workers never wait on a folder
+        jobs = Queue()
+        errors = []
+        jobs.put((drive_folder["id"], None, None))
+        workers = [
+            Thread(target=self.__count_worker, args=(jobs, errors), daemon=True)
+            for _ in range(MAX_LIST_WORKERS)
+        ]
+        for worker in workers:
+            worker.start()
+        jobs.join()
+        for _ in workers:
+            jobs.put(None)
+        if errors:
+            raise errors[0]
+
+    def __count_worker(self, jobs, errors):
+        self.__init_worker()
+        while (job := jobs.get()) is not None:
+            try:
+                if not errors:
+                    self.__count_job(jobs, *job)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                jobs.task_done()
+
+    def __count_job(self, jobs, folder_id, page_token, shortcut_id):
+        if shortcut_id is not None:
+            self.__count_item(jobs, self.__getFileMetadata(shortcut_id))
             return
-        for filee in files:
-            shortcut_details = filee.get("shortcutDetails")
-            if shortcut_details is not None:
-                mime_type = shortcut_details["targetMimeType"]
-                file_id = shortcut_details["targetId"]
-                filee = self.__getFileMetadata(file_id)
+        response = self.__list_page(folder_id, page_token)
+        if next_page := response.get("nextPageToken"):
+            jobs.put((folder_id, next_page, None))
+        for filee in response.get("files", []):
+            if (shortcut_details := filee.get("shortcutDetails")) is not None:
+                jobs.put((None, None, shortcut_details["targetId"]))
             else:
-                mime_type = filee.get("mimeType")
-            if mime_type == self.__G_DRIVE_DIR_MIME_TYPE:
+                self.__count_item(jobs, filee)
+
+    def __count_item(self, jobs, filee):
+        with self.__lock:
+            if filee.get("mimeType") == self.__G_DRIVE_DIR_MIME_TYPE:
                 self.__total_folders += 1
-                self.__gDrive_directory(filee)
+                jobs.put((filee["id"], None, None))
             else:
                 self.__total_files += 1
                 self.__gDrive_file(filee)
 
+    @retry(
+        wait=wait_exponential(multiplier=2, min=3, max=6),
+        stop=stop_after_attempt(3),
+        retry=retry_if_exception_type(Exception),
+    )
+    def __list_page(self, folder_id, page_token):
+        return (
+            self.__service.files()
+            .list(
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+                q=f"'{folder_id}' in parents and trashed = false",
+                spaces="drive",
+                pageSize=1000,
+                fields="nextPageToken, files(id, mimeType, size, shortcutDetails)",
+                pageToken=page_token,
+            )
+            .execute()
+        )
+
     def download(self, link):
         self.__is_downloading = True
         file_id = self.getIdFromUrl(link)
         self.__updater = setInterval(self.__update_interval, self.__progress)
         try:
             meta = self.__getFileMetadata(file_id)
+            files = []
             if meta.get("mimeType") == self.__G_DRIVE_DIR_MIME_TYPE:
-                self.__download_folder(file_id, self.__path, self.name)
+                self.__list_folder(file_id, self.__path, self.name, files)
             else:
                 makedirs(self.__path, exist_ok=True)
-                self.__download_file(
-                    file_id, self.__path, self.name, meta.get("mimeType")
-                )
+                files.append((file_id, self.__path, self.name, meta.get("size")))
+            self.__download_files(files)
         except Exception as err:
             if isinstance(err, RetryError):
                 LOGGER.info(f"Total Attempts: {err.last_attempt.attempt_number}")
@@ -957,7 +1460,7 @@ class GoogleDriveHelper:
                 return
             async_to_sync(self.__listener.onDownloadComplete)
 
-    def __download_folder(self, folder_id, path, folder_name):
+    def __list_folder(self, folder_id, path, folder_name, files):
         folder_name = folder_name.replace("/", "")
         if not ospath.exists(f"{path}/{folder_name}"):
             makedirs(f"{path}/{folder_name}")
@@ -973,75 +1476,164 @@ class GoogleDriveHelper:
             if shortcut_details is not None:
                 file_id = shortcut_details["targetId"]
                 mime_type = shortcut_details["targetMimeType"]
+                size = None
             else:
                 mime_type = item.get("mimeType")
+                size = item.get("size")
             if mime_type == self.__G_DRIVE_DIR_MIME_TYPE:
-                self.__download_folder(file_id, path, filename)
+                self.__list_folder(file_id, path, filename, files)
             elif not ospath.isfile(
                 f"{path}{filename}"
             ) and not filename.lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
-                self.__download_file(file_id, path, filename, mime_type)
+                files.append((file_id, path, filename, size))
             if self.__is_cancelled:
                 break
 
-    @retry(
-        wait=wait_exponential(multiplier=2, min=3, max=6),
-        stop=stop_after_attempt(3),
-        retry=(retry_if_exception_type(Exception)),
-    )
-    def __download_file(self, file_id, path, filename, mime_type):
-        request = self.__service.files().get_media(
-            fileId=file_id, supportsAllDrives=True
-        )
+    def __local_name(self, filename):
         filename = filename.replace("/", "")
         if len(filename.encode()) > 255:
             ext = ospath.splitext(filename)[1]
             filename = f"{filename[:245]}{ext}"
             if self.name.endswith(ext):
                 self.name = filename
+        return filename
+
+    @staticmethod
+    def __unique_path(path, filename, taken):
+        # Drive allows several files of one name in a folder, later ones get a suffix
+        base, ext = ospath.splitext(filename)
+        file_path = f"{path}/{filename}"
+        count = 0
+        while file_path in taken:
+            count += 1
+            file_path = f"{path}/{base} ({count}){ext}"
+        taken.add(file_path)
+        return file_path
+
+    def __download_files(self, files):
+        # files with a known size are split in ranges written at their offsets,
+        # the workers take the ranges in order so several files download together
+        jobs = []
+        taken = set()
+        for file_id, path, filename, size in files:
+            file_path = self.__unique_path(path, self.__local_name(filename), taken)
+            if size is None:
+                jobs.append((self.__download_file, file_id, file_path))
+                continue
+            size = int(size)
+            with open(file_path, "wb") as f:
+                f.truncate(size)
+            jobs.extend(
+                (
+                    self.__download_range,
+                    file_id,
+                    file_path,
+                    offset,
+                    min(DOWNLOAD_CHUNK, size - offset),
+                )
+                for offset in range(0, size, DOWNLOAD_CHUNK)
+            )
+        if not jobs:
+            return
+        workers = min(config_dict["GDRIVE_PARALLEL_DOWNLOADS"] or 1, len(jobs))
+        pool = ThreadPoolExecutor(max_workers=workers, initializer=self.__init_worker)
+        try:
+            futures = [pool.submit(*job) for job in jobs]
+            for future in as_completed(futures):
+                future.result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def __download_range(self, file_id, file_path, offset, length):
         if self.__is_cancelled:
             return
-        fh = FileIO(f"{path}/{filename}", "wb")
-        downloader = MediaIoBaseDownload(fh, request, chunksize=100 * 1024 * 1024)
-        done = False
+        with download_buffer.reserve(length):
+            data = self.__fetch_range(file_id, offset, length)
+            if data is None:
+                return
+            fd = osopen(file_path, O_WRONLY)
+            try:
+                pwrite(fd, data, offset)
+            finally:
+                osclose(fd)
+        with self.__lock:
+            self.__done_bytes += len(data)
+
+    def __quota_switch(self, err):
+        # download quota errors move the worker to the next service account
+        if not err.resp.get("content-type", "").startswith("application/json"):
+            return False
+        reason = eval(err.content).get("error").get("errors")[0].get("reason")
+        if reason not in [
+            "downloadQuotaExceeded",
+            "dailyLimitExceeded",
+        ]:
+            return False
+        if not config_dict["USE_SERVICE_ACCOUNTS"]:
+            LOGGER.error(f"Got: {reason}")
+            return False
+        if self.__sa_count >= self.__sa_number:
+            LOGGER.info(
+                f"Reached maximum number of service accounts switching, which is {self.__sa_count}"
+            )
+            return False
+        self.__switchServiceAccount()
+        LOGGER.info(f"Got: {reason}, Trying Again...")
+        return True
+
+    @retry(
+        wait=wait_exponential(multiplier=2, min=3, max=6),
+        stop=stop_after_attempt(3),
+        retry=(retry_if_exception_type(Exception)),
+    )
+    def __fetch_range(self, file_id, offset, length):
         retries = 0
-        while not done:
-            if self.__is_cancelled:
-                fh.close()
-                break
+        while not self.__is_cancelled:
+            request = self.__service.files().get_media(
+                fileId=file_id, supportsAllDrives=True
+            )
+            request.headers["Range"] = f"bytes={offset}-{offset + length - 1}"
             try:
-                self.__status, done = downloader.next_chunk()
+                return request.execute()
             except HttpError as err:
                 if err.resp.status in [500, 502, 503, 504] and retries < 10:
                     retries += 1
                     continue
-                if err.resp.get("content-type", "").startswith("application/json"):
-                    reason = (
-                        eval(err.content).get("error").get("errors")[0].get("reason")
-                    )
-                    if reason not in [
-                        "downloadQuotaExceeded",
-                        "dailyLimitExceeded",
-                    ]:
-                        raise err
-                    if config_dict["USE_SERVICE_ACCOUNTS"]:
-                        if self.__sa_count >= self.__sa_number:
-                            LOGGER.info(
-                                f"Reached maximum number of service accounts switching, which is {self.__sa_count}"
-                            )
-                            raise err
-                        else:
-                            if self.__is_cancelled:
-                                return
-                            self.__switchServiceAccount()
-                            LOGGER.info(f"Got: {reason}, Trying Again...")
-                            return self.__download_file(
-                                file_id, path, filename, mime_type
-                            )
-                    else:
-                        LOGGER.error(f"Got: {reason}")
+                if not self.__quota_switch(err):
+                    raise err
+
+    @retry(
+        wait=wait_exponential(multiplier=2, min=3, max=6),
+        stop=stop_after_attempt(3),
+        retry=(retry_if_exception_type(Exception)),
+    )
+    def __download_file(self, file_id, file_path):
+        # files without a size, like shortcut targets, are streamed in chunks
+        request = self.__service.files().get_media(
+            fileId=file_id, supportsAllDrives=True
+        )
+        if self.__is_cancelled:
+            return
+        with FileIO(file_path, "wb") as fh:
+            downloader = MediaIoBaseDownload(fh, request, chunksize=DOWNLOAD_CHUNK)
+            done = False
+            retries = 0
+            while not done:
+                if self.__is_cancelled:
+                    return
+                try:
+                    status, done = downloader.next_chunk()
+                    if status is not None:
+                        self.__files_progress[file_path] = status.resumable_progress
+                except HttpError as err:
+                    if err.resp.status in [500, 502, 503, 504] and retries < 10:
+                        retries += 1
+                        continue
+                    if not self.__quota_switch(err):
                         raise err
-        self.__file_processed_bytes = 0
+                    return self.__download_file(file_id, file_path)
+        with self.__lock:
+            self.__done_bytes += self.__files_progress.pop(file_path, 0)
 
     async def cancel_download(self):
         self.__is_cancelled = True
@@ -1058,3 +1650,25 @@ class GoogleDriveHelper:
             await self.__listener.onUploadError(
                 "your upload has been stopped and uploaded data has been deleted!"
             )
+
+
+__index_syncer = None
+
+
+def __index_sync_loop():
+    drive = None
+    while True:
+        if config_dict["DRIVE_INDEX"]:
+            try:
+                drive = drive or GoogleDriveHelper()
+                drive.sync_index()
+            except Exception as e:
+                LOGGER.error(f"Drive index: {e}")
+        sleep(INDEX_SYNC_INTERVAL)
+
+
+def start_drive_index():
+    global __index_syncer
+    if __index_syncer is None:
+        __index_syncer = Thread(target=__index_sync_loop, daemon=True)
+        __index_syncer.start()
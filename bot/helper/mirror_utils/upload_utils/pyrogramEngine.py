@@ -13,8 +13,9 @@ from os import walk, path as ospath
 from time import time
 from PIL import Image
 from pyrogram.types import InputMediaVideo, InputMediaDocument, InlineKeyboardMarkup
-from pyrogram.errors import FloodWait, RPCError, PeerIdInvalid, ChannelInvalid
-from asyncio import sleep
+from pyrogram.errors import FloodWait, RPCError
+from asyncio import sleep, Event, Semaphore, Condition, create_task
+from collections import deque
 from tenacity import (
     retry,
     wait_exponential,
@@ -36,15 +37,17 @@ from bot import (
 )
 from bot.helper.themes import BotTheme
 from bot.helper.telegram_helper.button_build import ButtonMaker
+from bot.helper.telegram_helper.client_pool import upload_clients
+from bot.helper.telegram_helper.copy_sender import copy_sender
 from bot.helper.telegram_helper.message_utils import (
     sendCustomMsg,
-    editReplyMarkup,
     sendMultiMessage,
     chat_info,
     deleteMessage,
     get_tg_link_content,
 )
 from bot.helper.ext_utils.fs_utils import clean_unwanted, is_archive, get_base_name
+from bot.helper.ext_utils.task_journal import journal_upload
 from bot.helper.ext_utils.bot_utils import (
     get_readable_file_size,
     is_telegram_link,
@@ -66,11 +69,49 @@ LOGGER = getLogger(__name__)
 getLogger("pyrogram").setLevel(ERROR)
 
 
+class UploadSlots:
+    # caps the files uploading at once across all leech tasks
+
+    def __init__(self):
+        self.__active = 0
+        self.__changed = Condition()
+
+    def __free(self):
+        limit = config_dict["LEECH_PARALLEL_UPLOADS_ALL"]
+        return not limit or self.__active < limit
+
+    async def __aenter__(self):
+        async with self.__changed:
+            await self.__changed.wait_for(self.__free)
+            self.__active += 1
+
+    async def __aexit__(self, *args):
+        async with self.__changed:
+            self.__active -= 1
+            self.__changed.notify_all()
+
+
+upload_slots = UploadSlots()
+
+
+class UploadItem:
+
+    def __init__(self, dirpath, file_, reply_to):
+        self.dirpath = dirpath
+        self.file_ = file_
+        self.up_path = ospath.join(dirpath, file_)
+        self.src_path = self.up_path
+        self.reply_to = reply_to
+        self.client = None
+        self.prm_media = False
+        self.last_uploaded = 0
+        self.sent_msg = None
+
+
 class TgUploader:
 
     def __init__(self, name=None, path=None, listener=None):
         self.name = name
-        self.__last_uploaded = 0
         self.__processed_bytes = 0
         self.__listener = listener
         self.__path = path
@@ -86,9 +127,6 @@ class TgUploader:
         self.__is_corrupted = False
         self.__media_dict = {"videos": {}, "documents": {}}
         self.__last_msg_in_group = False
-        self.__prm_media = False
-        self.__client = bot
-        self.__up_path = ""
         self.__mediainfo = False
         self.__as_doc = False
         self.__media_group = False
@@ -96,7 +134,19 @@ class TgUploader:
         self.__bot_pm = False
         self.__user_id = listener.message.from_user.id
         self.__leechmsg = {}
+        self.__leechmsg_deleted = False
+        self.files_listed = Event()
+        self.__copies = []
+        self.__dumps = None
+        self.__parallel = config_dict["LEECH_PARALLEL_UPLOADS"] or 1
+        self.__slots = Semaphore(self.__parallel)
         self.__leech_utils = self.__listener.leech_utils
+        # files uploaded before a restart, see task_journal
+        self.__resumed = {up["path"] for up in listener.resumed_uploads}
+        for up in listener.resumed_uploads:
+            self.__total_files += 1
+            if listener.isSuperGroup or config_dict["LEECH_LOG_ID"]:
+                self.__msgs_dict[up["link"]] = up["name"]
 
     async def get_custom_thumb(self, thumb):
         if is_telegram_link(thumb):
@@ -156,102 +206,106 @@ class TgUploader:
             return buttons.build_menu(1)
         return None
 
-    async def __copy_file(self):
-        try:
-            if self.__bot_pm and (
-                self.__leechmsg
-                and not self.__listener.excep_chat
-                or self.__listener.isSuperGroup
-            ):
-                copied = await bot.copy_message(
-                    chat_id=self.__user_id,
-                    from_chat_id=self.__sent_msg.chat.id,
-                    message_id=self.__sent_msg.id,
-                    reply_to_message_id=(
-                        self.__listener.botpmmsg.id
-                        if self.__listener.botpmmsg
-                        else None
-                    ),
-                )
-                if copied and self.__has_buttons:
-                    btn_markup = (
-                        InlineKeyboardMarkup(BTN)
-                        if (BTN := self.__sent_msg.reply_markup.inline_keyboard[:-1])
-                        else None
-                    )
-                    await editReplyMarkup(
-                        copied,
-                        (
-                            btn_markup
-                            if config_dict["SAVE_MSG"]
-                            else self.__sent_msg.reply_markup
-                        ),
-                    )
-        except Exception as err:
-            if not self.__is_cancelled:
-                LOGGER.error(f"Failed To Send in BotPM:\n{str(err)}")
+    async def __copy_to(self, chat_id, source, clean_msg=None, **kwargs):
+        copied = await bot.copy_message(
+            chat_id=chat_id,
+            from_chat_id=source.chat.id,
+            message_id=source.id,
+            **kwargs,
+        )
+        # Layer 161 Needed for Topics !
+        if clean_msg is not None and config_dict["CLEAN_LOG_MSG"] and clean_msg.text:
+            await deleteMessage(clean_msg)
+        return copied
 
-        try:
-            if len(self.__leechmsg) > 1 and not self.__listener.excep_chat:
-                for chat_id, msg in list(self.__leechmsg.items())[1:]:
-                    chat_id, *topics = chat_id.split(":")
-                    leech_copy = await bot.copy_message(
-                        chat_id=int(chat_id),
-                        from_chat_id=self.__sent_msg.chat.id,
-                        message_id=self.__sent_msg.id,
-                        reply_to_message_id=msg.id,
-                    )
-                    # Layer 161 Needed for Topics !
-                    if config_dict["CLEAN_LOG_MSG"] and msg.text:
-                        await deleteMessage(msg)
-                    if leech_copy and self.__has_buttons:
-                        await editReplyMarkup(leech_copy, self.__sent_msg.reply_markup)
-        except Exception as err:
-            if not self.__is_cancelled:
-                LOGGER.error(f"Failed To Send in Leech Log [ {chat_id} ]:\n{str(err)}")
+    async def __copy_group(self, chat_id, source):
+        return await bot.copy_media_group(
+            chat_id=chat_id, from_chat_id=source.chat.id, message_id=source.id
+        )
+
+    def __queue_copy(self, error_msg, func, chat_id, source, **kwargs):
+        future = copy_sender.submit(chat_id, func, chat_id, source, **kwargs)
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.__copies.append((source.id, future, error_msg))
 
+    async def __wait_copies(self, msg_ids=None):
+        waiting = [c for c in self.__copies if msg_ids is None or c[0] in msg_ids]
+        self.__copies = [c for c in self.__copies if c not in waiting]
+        for _, future, error_msg in waiting:
+            try:
+                await future
+            except Exception as err:
+                if not self.__is_cancelled:
+                    LOGGER.error(f"{error_msg}:\n{str(err)}")
+
+    async def __dump_chats(self):
+        if self.__dumps is None:
+            self.__dumps = []
+            for channel_id in self.__upload_dest:
+                if chat := (await chat_info(channel_id)):
+                    self.__dumps.append(chat)
+        return self.__dumps
+
+    def __saved_markup(self, sent_msg):
+        if not self.__has_buttons:
+            return None
+        if not config_dict["SAVE_MSG"]:
+            return sent_msg.reply_markup
+        return (
+            InlineKeyboardMarkup(BTN)
+            if (BTN := sent_msg.reply_markup.inline_keyboard[:-1])
+            else None
+        )
+
+    async def __copy_file(self, sent_msg):
+        # copies are sent in the background, in upload order for every chat
+        if self.__bot_pm and (
+            self.__leechmsg
+            and not self.__listener.excep_chat
+            or self.__listener.isSuperGroup
+        ):
+            self.__queue_copy(
+                "Failed To Send in BotPM",
+                self.__copy_to,
+                self.__user_id,
+                sent_msg,
+                reply_to_message_id=(
+                    self.__listener.botpmmsg.id if self.__listener.botpmmsg else None
+                ),
+                reply_markup=self.__saved_markup(sent_msg),
+            )
+        if len(self.__leechmsg) > 1 and not self.__listener.excep_chat:
+            for chat_id, msg in list(self.__leechmsg.items())[1:]:
+                chat_id, *topics = chat_id.split(":")
+                self.__queue_copy(
+                    f"Failed To Send in Leech Log [ {chat_id} ]",
+                    self.__copy_to,
+                    int(chat_id),
+                    sent_msg,
+                    clean_msg=msg,
+                    reply_to_message_id=msg.id,
+                    reply_markup=sent_msg.reply_markup if self.__has_buttons else None,
+                )
         try:
-            if self.__upload_dest:
-                for channel_id in self.__upload_dest:
-                    if chat := (await chat_info(channel_id)):
-                        try:
-                            dump_copy = await bot.copy_message(
-                                chat_id=chat.id,
-                                from_chat_id=self.__sent_msg.chat.id,
-                                message_id=self.__sent_msg.id,
-                            )
-                            if dump_copy and self.__has_buttons:
-                                btn_markup = (
-                                    InlineKeyboardMarkup(BTN)
-                                    if (
-                                        BTN := self.__sent_msg.reply_markup.inline_keyboard[
-                                            :-1
-                                        ]
-                                    )
-                                    else None
-                                )
-                                await editReplyMarkup(
-                                    dump_copy,
-                                    (
-                                        btn_markup
-                                        if config_dict["SAVE_MSG"]
-                                        else self.__sent_msg.reply_markup
-                                    ),
-                                )
-                        except (ChannelInvalid, PeerIdInvalid) as e:
-                            LOGGER.error(f"{e.NAME}: {e.MESSAGE} for {channel_id}")
-                            continue
+            for chat in await self.__dump_chats():
+                self.__queue_copy(
+                    "Failed To Send in User Dump",
+                    self.__copy_to,
+                    chat.id,
+                    sent_msg,
+                    reply_markup=self.__saved_markup(sent_msg),
+                )
         except Exception as err:
             if not self.__is_cancelled:
                 LOGGER.error(f"Failed To Send in User Dump:\n{str(err)}")
 
-    async def __upload_progress(self, current, total):
+    async def __upload_progress(self, current, total, item):
         if self.__is_cancelled:
             if IS_PREMIUM_USER:
                 user.stop_transmission()
             bot.stop_transmission()
-        chunk_size = current - self.__last_uploaded
-        self.__last_uploaded = current
+        chunk_size = current - item.last_uploaded
+        item.last_uploaded = current
         self.__processed_bytes += chunk_size
 
     async def __user_settings(self):
@@ -308,7 +362,7 @@ class TgUploader:
             self.__sent_msg = self.__listener.message
         return True
 
-    async def __prepare_file(self, prefile_, dirpath):
+    async def __prepare_file(self, item, prefile_, dirpath):
         try:
             file_, cap_mono = await format_filename(prefile_, self.__user_id, dirpath)
         except Exception as err:
@@ -325,11 +379,11 @@ class TgUploader:
                 dirpath = f"{dirpath}/copied_mltb"
                 await makedirs(dirpath, exist_ok=True)
                 new_path = ospath.join(dirpath, file_)
-                self.__up_path = await copy(self.__up_path, new_path)
+                item.up_path = await copy(item.up_path, new_path)
             else:
                 new_path = ospath.join(dirpath, file_)
-                await aiorename(self.__up_path, new_path)
-                self.__up_path = new_path
+                await aiorename(item.up_path, new_path)
+                item.up_path = new_path
         if len(file_) > 64:
             if is_archive(file_):
                 name = get_base_name(file_)
@@ -354,13 +408,33 @@ class TgUploader:
                 dirpath = f"{dirpath}/copied_mltb"
                 await makedirs(dirpath, exist_ok=True)
                 new_path = ospath.join(dirpath, f"{name}{ext}")
-                self.__up_path = await copy(self.__up_path, new_path)
+                item.up_path = await copy(item.up_path, new_path)
             else:
                 new_path = ospath.join(dirpath, f"{name}{ext}")
-                await aiorename(self.__up_path, new_path)
-                self.__up_path = new_path
+                await aiorename(item.up_path, new_path)
+                item.up_path = new_path
         return cap_mono, file_
 
+    async def __rehome(self, item, nrml_media, buttons):
+        # messages of the user or a helper bot are copied to be owned by the bot
+        if item.client is bot or (
+            item.client is user and not self.__has_buttons and self.__leechmsg
+        ):
+            item.sent_msg = nrml_media
+            return
+        try:
+            item.sent_msg = await bot.copy_message(
+                nrml_media.chat.id,
+                nrml_media.chat.id,
+                nrml_media.id,
+                reply_to_message_id=item.reply_to.id,
+                reply_markup=buttons,
+            )
+            if item.sent_msg:
+                await deleteMessage(nrml_media)
+        except Exception:
+            item.sent_msg = nrml_media
+
     def __get_input_media(self, subkey, key):
         rlist = []
         for msg in self.__media_dict[key][subkey]:
@@ -375,11 +449,15 @@ class TgUploader:
             rlist.append(input_media)
         return rlist
 
-    async def __switching_client(self):
+    async def __switching_client(self, item):
+        item.client = (
+            user
+            if (item.prm_media and IS_PREMIUM_USER)
+            else upload_clients.acquire(item.reply_to.chat.id)
+        )
         LOGGER.info(
-            f'Uploading Media {">" if self.__prm_media else "<"} 2GB by {"User" if self.__prm_media else "Bot"} Client'
+            f'Uploading Media {">" if item.prm_media else "<"} 2GB by {"User" if item.client is user else "Bot"} Client [@{item.client.me.username}]'
         )
-        self.__client = user if (self.__prm_media and IS_PREMIUM_USER) else bot
 
     async def __send_media_group(self, subkey, key, msgs):
         msgs_list = await msgs[0].reply_to_message.reply_media_group(
@@ -387,6 +465,7 @@ class TgUploader:
             quote=True,
             disable_notification=True,
         )
+        await self.__wait_copies({msg.id for msg in msgs})
         for msg in msgs:
             if msg.link in self.__msgs_dict:
                 del self.__msgs_dict[msg.link]
@@ -396,123 +475,226 @@ class TgUploader:
             for m in msgs_list:
                 self.__msgs_dict[m.link] = m.caption
         self.__sent_msg = msgs_list[-1]
+        if self.__bot_pm and (
+            self.__leechmsg
+            and not self.__listener.excep_chat
+            or self.__listener.isSuperGroup
+        ):
+            self.__queue_copy(
+                "Failed To Send in Bot PM",
+                self.__copy_group,
+                self.__user_id,
+                self.__sent_msg,
+            )
         try:
-            if self.__bot_pm and (
-                self.__leechmsg
-                and not self.__listener.excep_chat
-                or self.__listener.isSuperGroup
-            ):
-                await bot.copy_media_group(
-                    chat_id=self.__user_id,
-                    from_chat_id=self.__sent_msg.chat.id,
-                    message_id=self.__sent_msg.id,
+            for chat in await self.__dump_chats():
+                self.__queue_copy(
+                    "Failed To Send in User Dump",
+                    self.__copy_group,
+                    chat.id,
+                    self.__sent_msg,
                 )
         except Exception as err:
             if not self.__is_cancelled:
-                LOGGER.error(f"Failed To Send in Bot PM:\n{str(err)}")
+                LOGGER.error(f"Failed To Send in User Dump:\n{str(err)}")
+
+    async def __upload_path(self, item, o_files, m_size):
+        if item.file_.lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
+            await aioremove(item.up_path)
+            return True
         try:
-            if self.__upload_dest:
-                for channel_id in self.__upload_dest:
-                    if dump_chat := (await chat_info(channel_id)):
-                        try:
-                            await bot.copy_media_group(
-                                chat_id=dump_chat.id,
-                                from_chat_id=self.__sent_msg.chat.id,
-                                message_id=self.__sent_msg.id,
-                            )
-                        except (ChannelInvalid, PeerIdInvalid) as e:
-                            LOGGER.error(f"{e.NAME}: {e.MESSAGE} for {channel_id}")
-                            continue
+            f_size = await aiopath.getsize(item.up_path)
+            if self.__listener.seed and item.file_ in o_files and f_size in m_size:
+                return True
+            self.__total_files += 1
+            if f_size == 0:
+                LOGGER.error(
+                    f"{item.up_path} size is zero, telegram don't upload zero size files"
+                )
+                self.__corrupted += 1
+                return True
+            if self.__is_cancelled:
+                return False
+            item.prm_media = True if f_size > 2097152000 else False
+            cap_mono, item.file_ = await self.__prepare_file(
+                item, item.file_, item.dirpath
+            )
+            await self.__switching_client(item)
+            await self.__upload_file(item, cap_mono, item.file_)
+            if self.__is_cancelled:
+                return False
+            await sleep(1)
         except Exception as err:
-            if not self.__is_cancelled:
-                LOGGER.error(f"Failed To Send in User Dump:\n{str(err)}")
+            item.sent_msg = None
+            if isinstance(err, RetryError):
+                LOGGER.info(f"Total Attempts: {err.last_attempt.attempt_number}")
+            else:
+                LOGGER.error(f"{format_exc()}. Path: {item.up_path}")
+            if self.__is_cancelled:
+                return False
+        finally:
+            if item.client is not None:
+                upload_clients.release(item.client)
+            if (
+                not self.__is_cancelled
+                and await aiopath.exists(item.up_path)
+                and (
+                    not self.__listener.seed
+                    or self.__listener.newDir
+                    or item.dirpath.endswith("/splited_files_mltb")
+                    or "/copied_mltb/" in item.up_path
+                )
+            ):
+                await aioremove(item.up_path)
+        return True
 
-    async def upload(self, o_files, m_size, size):
-        await self.__user_settings()
-        res = await self.__msg_to_reply()
-        if not res:
+    async def __run_item(self, item, o_files, m_size):
+        try:
+            async with upload_slots:
+                return await self.__upload_path(item, o_files, m_size)
+        finally:
+            self.__slots.release()
+
+    async def __move_to_end(self, msg):
+        # a later file finished first, repost this one after the last published
+        try:
+            moved = await bot.copy_message(
+                chat_id=msg.chat.id,
+                from_chat_id=msg.chat.id,
+                message_id=msg.id,
+                reply_to_message_id=self.__sent_msg.id,
+                reply_markup=msg.reply_markup,
+            )
+        except FloodWait as f:
+            LOGGER.warning(str(f))
+            await sleep(f.value * 1.2)
+            return await self.__move_to_end(msg)
+        except Exception as err:
+            LOGGER.error(f"Failed To Reorder Upload: {err}")
+            return msg
+        await deleteMessage(msg)
+        return moved
+
+    async def __clean_log_msg(self):
+        if (
+            self.__leechmsg
+            and not self.__leechmsg_deleted
+            and config_dict["CLEAN_LOG_MSG"]
+        ):
+            await deleteMessage(list(self.__leechmsg.values())[0])
+            self.__leechmsg_deleted = True
+
+    async def __publish(self, item):
+        # runs in upload order, whatever order the files finished in
+        if item.sent_msg is None or self.__is_cancelled:
             return
-        isDeleted = False
-        for dirpath, _, files in sorted(await sync_to_async(walk, self.__path)):
+        if self.__last_msg_in_group:
+            group_lists = [x for v in self.__media_dict.values() for x in v.keys()]
+            if (
+                match := re_match(r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+)", item.up_path)
+            ) and match.group(0) not in group_lists:
+                for key, value in list(self.__media_dict.items()):
+                    for subkey, msgs in list(value.items()):
+                        if len(msgs) > 1:
+                            await self.__send_media_group(subkey, key, msgs)
+        self.__last_msg_in_group = False
+        if item.sent_msg.id < self.__sent_msg.id:
+            item.sent_msg = await self.__move_to_end(item.sent_msg)
+        self.__sent_msg = item.sent_msg
+        if self.__media_group and (self.__sent_msg.video or self.__sent_msg.document):
+            key = "documents" if self.__sent_msg.document else "videos"
+            if match := re_match(r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+)", item.up_path):
+                pname = match.group(0)
+                if pname in self.__media_dict[key].keys():
+                    self.__media_dict[key][pname].append(self.__sent_msg)
+                else:
+                    self.__media_dict[key][pname] = [self.__sent_msg]
+                msgs = self.__media_dict[key][pname]
+                if len(msgs) == 10:
+                    await self.__send_media_group(pname, key, msgs)
+                else:
+                    self.__last_msg_in_group = True
+        await self.__copy_file(self.__sent_msg)
+        if self.__parallel == 1:
+            await self.__clean_log_msg()
+        if not self.__is_corrupted and (
+            self.__listener.isSuperGroup or config_dict["LEECH_LOG_ID"]
+        ):
+            self.__msgs_dict[self.__sent_msg.link] = item.file_
+        await journal_upload(
+            self.__listener,
+            ospath.relpath(item.src_path, self.__path),
+            self.__sent_msg.link,
+            item.file_,
+        )
+
+    async def __finish_item(self, item, task):
+        if not await task:
+            return False
+        try:
+            await self.__publish(item)
+        except Exception:
+            LOGGER.error(f"{format_exc()}. Path: {item.up_path}")
+        return not self.__is_cancelled
+
+    async def __walk_files(self, tree, split_parts):
+        # split_parts: path of a file being split -> queue of its parts, ends with None
+        for dirpath, _, files in tree:
             if dirpath.endswith("/yt-dlp-thumb"):
                 continue
             for file_ in natsorted(files):
-                self.__up_path = ospath.join(dirpath, file_)
-                if file_.lower().endswith(tuple(GLOBAL_EXTENSION_FILTER)):
-                    await aioremove(self.__up_path)
+                if (
+                    split_parts
+                    and (f_path := ospath.join(dirpath, file_)) in split_parts
+                ):
+                    while (part := await split_parts[f_path].get()) is not None:
+                        if not self.__is_resumed(part):
+                            yield ospath.split(part)
                     continue
-                try:
-                    f_size = await aiopath.getsize(self.__up_path)
-                    if self.__listener.seed and file_ in o_files and f_size in m_size:
-                        continue
-                    self.__total_files += 1
-                    if f_size == 0:
-                        LOGGER.error(
-                            f"{self.__up_path} size is zero, telegram don't upload zero size files"
-                        )
-                        self.__corrupted += 1
-                        continue
-                    if self.__is_cancelled:
-                        return
-                    self.__prm_media = True if f_size > 2097152000 else False
-                    cap_mono, file_ = await self.__prepare_file(file_, dirpath)
-                    if self.__last_msg_in_group:
-                        group_lists = [
-                            x for v in self.__media_dict.values() for x in v.keys()
-                        ]
-                        if (
-                            match := re_match(
-                                r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+)", self.__up_path
-                            )
-                        ) and match.group(0) not in group_lists:
-                            for key, value in list(self.__media_dict.items()):
-                                for subkey, msgs in list(value.items()):
-                                    if len(msgs) > 1:
-                                        await self.__send_media_group(subkey, key, msgs)
-                    self.__last_msg_in_group = False
-                    self.__last_uploaded = 0
-                    await self.__switching_client()
-                    await self.__upload_file(cap_mono, file_)
-                    if (
-                        self.__leechmsg
-                        and not isDeleted
-                        and config_dict["CLEAN_LOG_MSG"]
-                    ):
-                        await deleteMessage(list(self.__leechmsg.values())[0])
-                        isDeleted = True
-                    if self.__is_cancelled:
-                        return
-                    if not self.__is_corrupted and (
-                        self.__listener.isSuperGroup or config_dict["LEECH_LOG_ID"]
-                    ):
-                        self.__msgs_dict[self.__sent_msg.link] = file_
-                    await sleep(1)
-                except Exception as err:
-                    if isinstance(err, RetryError):
-                        LOGGER.info(
-                            f"Total Attempts: {err.last_attempt.attempt_number}"
-                        )
-                    else:
-                        LOGGER.error(f"{format_exc()}. Path: {self.__up_path}")
-                    if self.__is_cancelled:
+                if not self.__is_resumed(ospath.join(dirpath, file_)):
+                    yield dirpath, file_
+
+    def __is_resumed(self, path):
+        # uploaded before a restart, parts of a split file are split again
+        return (
+            bool(self.__resumed) and ospath.relpath(path, self.__path) in self.__resumed
+        )
+
+    async def upload(self, o_files, m_size, size, split_parts=None):
+        tree = sorted(await sync_to_async(walk, self.__path))
+        self.files_listed.set()
+        await self.__user_settings()
+        res = await self.__msg_to_reply()
+        if not res:
+            return
+        anchor = self.__sent_msg
+        pending = deque()
+        try:
+            async for dirpath, file_ in self.__walk_files(tree, split_parts):
+                await self.__slots.acquire()
+                while pending and pending[0][1].done():
+                    if not await self.__finish_item(*pending.popleft()):
                         return
-                    continue
-                finally:
-                    if (
-                        not self.__is_cancelled
-                        and await aiopath.exists(self.__up_path)
-                        and (
-                            not self.__listener.seed
-                            or self.__listener.newDir
-                            or dirpath.endswith("/splited_files_mltb")
-                            or "/copied_mltb/" in self.__up_path
-                        )
-                    ):
-                        await aioremove(self.__up_path)
+                # files uploaded in parallel reply to the task message, not to each other
+                item = UploadItem(
+                    dirpath, file_, self.__sent_msg if self.__parallel == 1 else anchor
+                )
+                pending.append(
+                    (item, create_task(self.__run_item(item, o_files, m_size)))
+                )
+            while pending:
+                if not await self.__finish_item(*pending.popleft()):
+                    return
+        finally:
+            for _, task in pending:
+                task.cancel()
+        if self.__sent_msg is not anchor:
+            await self.__clean_log_msg()
         for key, value in list(self.__media_dict.items()):
             for subkey, msgs in list(value.items()):
                 if len(msgs) > 1:
                     await self.__send_media_group(subkey, key, msgs)
+        await self.__wait_copies()
         if self.__is_cancelled:
             return
         if self.__listener.seed and not self.__listener.newDir:
@@ -547,13 +729,13 @@ class TgUploader:
         stop=stop_after_attempt(3),
         retry=retry_if_exception_type(Exception),
     )
-    async def __upload_file(self, cap_mono, file, force_document=False):
+    async def __upload_file(self, item, cap_mono, file, force_document=False):
         if self.__thumb is not None and not await aiopath.exists(self.__thumb):
             self.__thumb = None
         thumb = self.__thumb
         self.__is_corrupted = False
         try:
-            is_video, is_audio, is_image = await get_document_type(self.__up_path)
+            is_video, is_audio, is_image = await get_document_type(item.up_path)
 
             if self.__leech_utils["thumb"]:
                 thumb = await self.get_custom_thumb(self.__leech_utils["thumb"])
@@ -564,7 +746,7 @@ class TgUploader:
                 if await aiopath.isfile(thumb_path):
                     thumb = thumb_path
                 elif is_audio and not is_video:
-                    thumb = await get_audio_thumb(self.__up_path)
+                    thumb = await get_audio_thumb(item.up_path)
 
             if (
                 self.__as_doc
@@ -573,50 +755,37 @@ class TgUploader:
             ):
                 key = "documents"
                 if is_video and thumb is None:
-                    thumb = await take_ss(self.__up_path, None)
+                    thumb = await take_ss(item.up_path, None)
                 if self.__is_cancelled:
                     return
-                buttons = await self.__buttons(self.__up_path, is_video)
-                nrml_media = await self.__client.send_document(
-                    chat_id=self.__sent_msg.chat.id,
-                    # reply_to_message_id=int(self.__sent_msg.id),
-                    document=self.__up_path,
+                buttons = await self.__buttons(item.up_path, is_video)
+                nrml_media = await item.client.send_document(
+                    chat_id=item.reply_to.chat.id,
+                    # reply_to_message_id=int(item.reply_to.id),
+                    document=item.up_path,
                     thumb=thumb,
                     caption=cap_mono,
                     force_document=True,
                     disable_notification=True,
                     progress=self.__upload_progress,
+                    progress_args=(item,),
                     reply_markup=buttons,
                 )
 
-                if self.__prm_media and (self.__has_buttons or not self.__leechmsg):
-                    try:
-                        self.__sent_msg = await bot.copy_message(
-                            nrml_media.chat.id,
-                            nrml_media.chat.id,
-                            nrml_media.id,
-                            reply_to_message_id=self.__sent_msg.id,
-                            reply_markup=buttons,
-                        )
-                        if self.__sent_msg:
-                            await deleteMessage(nrml_media)
-                    except Exception:
-                        self.__sent_msg = nrml_media
-                else:
-                    self.__sent_msg = nrml_media
+                await self.__rehome(item, nrml_media, buttons)
             elif is_video:
                 key = "videos"
-                duration = (await get_media_info(self.__up_path))[0]
+                duration = (await get_media_info(item.up_path))[0]
                 if thumb is None:
-                    thumb = await take_ss(self.__up_path, duration)
+                    thumb = await take_ss(item.up_path, duration)
                 if thumb is not None:
                     with Image.open(thumb) as img:
                         width, height = img.size
                 else:
                     width = 480
                     height = 320
-                if not self.__up_path.upper().endswith(("MKV", "MP4")):
-                    dirpath, file_ = self.__up_path.rsplit("/", 1)
+                if not item.up_path.upper().endswith(("MKV", "MP4")):
+                    dirpath, file_ = item.up_path.rsplit("/", 1)
                     if (
                         self.__listener.seed
                         and not self.__listener.newDir
@@ -627,18 +796,18 @@ class TgUploader:
                         new_path = ospath.join(
                             dirpath, f"{ospath.splitext(file_)[0]}.mp4"
                         )
-                        self.__up_path = await copy(self.__up_path, new_path)
+                        item.up_path = await copy(item.up_path, new_path)
                     else:
-                        new_path = f"{ospath.splitext(self.__up_path)[0]}.mp4"
-                        await aiorename(self.__up_path, new_path)
-                        self.__up_path = new_path
+                        new_path = f"{ospath.splitext(item.up_path)[0]}.mp4"
+                        await aiorename(item.up_path, new_path)
+                        item.up_path = new_path
                 if self.__is_cancelled:
                     return
-                buttons = await self.__buttons(self.__up_path, is_video)
-                nrml_media = await self.__client.send_video(
-                    chat_id=self.__sent_msg.chat.id,
-                    reply_to_message_id=self.__sent_msg.id,
-                    video=self.__up_path,
+                buttons = await self.__buttons(item.up_path, is_video)
+                nrml_media = await item.client.send_video(
+                    chat_id=item.reply_to.chat.id,
+                    reply_to_message_id=item.reply_to.id,
+                    video=item.up_path,
                     caption=cap_mono,
                     duration=duration,
                     width=width,
@@ -647,32 +816,20 @@ class TgUploader:
                     supports_streaming=True,
                     disable_notification=True,
                     progress=self.__upload_progress,
+                    progress_args=(item,),
                     reply_markup=buttons,
                 )
-                if self.__prm_media and (self.__has_buttons or not self.__leechmsg):
-                    try:
-                        self.__sent_msg = await bot.copy_message(
-                            nrml_media.chat.id,
-                            nrml_media.chat.id,
-                            nrml_media.id,
-                            reply_to_message_id=self.__sent_msg.id,
-                            reply_markup=buttons,
-                        )
-                        if self.__sent_msg:
-                            await deleteMessage(nrml_media)
-                    except Exception:
-                        self.__sent_msg = nrml_media
-                else:
-                    self.__sent_msg = nrml_media
+                await self.__rehome(item, nrml_media, buttons)
             elif is_audio:
                 key = "audios"
-                duration, artist, title = await get_media_info(self.__up_path)
+                duration, artist, title = await get_media_info(item.up_path)
                 if self.__is_cancelled:
                     return
-                self.__sent_msg = await self.__client.send_audio(
-                    chat_id=self.__sent_msg.chat.id,
-                    reply_to_message_id=self.__sent_msg.id,
-                    audio=self.__up_path,
+                buttons = await self.__buttons(item.up_path)
+                nrml_media = await item.client.send_audio(
+                    chat_id=item.reply_to.chat.id,
+                    reply_to_message_id=item.reply_to.id,
+                    audio=item.up_path,
                     caption=cap_mono,
                     duration=duration,
                     performer=artist,
@@ -680,43 +837,26 @@ class TgUploader:
                     thumb=thumb,
                     disable_notification=True,
                     progress=self.__upload_progress,
-                    reply_markup=await self.__buttons(self.__up_path),
+                    progress_args=(item,),
+                    reply_markup=buttons,
                 )
+                await self.__rehome(item, nrml_media, buttons)
             else:
                 key = "photos"
                 if self.__is_cancelled:
                     return
-                self.__sent_msg = await self.__client.send_photo(
-                    chat_id=self.__sent_msg.chat.id,
-                    reply_to_message_id=self.__sent_msg.id,
-                    photo=self.__up_path,
+                buttons = await self.__buttons(item.up_path)
+                nrml_media = await item.client.send_photo(
+                    chat_id=item.reply_to.chat.id,
+                    reply_to_message_id=item.reply_to.id,
+                    photo=item.up_path,
                     caption=cap_mono,
                     disable_notification=True,
                     progress=self.__upload_progress,
-                    reply_markup=await self.__buttons(self.__up_path),
+                    progress_args=(item,),
+                    reply_markup=buttons,
                 )
-
-            if (
-                not self.__is_cancelled
-                and self.__media_group
-                and (self.__sent_msg.video or self.__sent_msg.document)
-            ):
-                key = "documents" if self.__sent_msg.document else "videos"
-                if match := re_match(
-                    r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+)", self.__up_path
-                ):
-                    pname = match.group(0)
-                    if pname in self.__media_dict[key].keys():
-                        self.__media_dict[key][pname].append(self.__sent_msg)
-                    else:
-                        self.__media_dict[key][pname] = [self.__sent_msg]
-                    msgs = self.__media_dict[key][pname]
-                    if len(msgs) == 10:
-                        await self.__send_media_group(pname, key, msgs)
-                    else:
-                        self.__last_msg_in_group = True
-            if self.__sent_msg:
-                await self.__copy_file()
+                await self.__rehome(item, nrml_media, buttons)
 
             if (
                 self.__thumb is None
@@ -733,6 +873,13 @@ class TgUploader:
             self.__retry_error = False
         except FloodWait as f:
             LOGGER.warning(str(f))
+            upload_clients.flood(item.client, f.value)
+            if item.client is not user and upload_clients.available(
+                item.reply_to.chat.id, item.client
+            ):
+                upload_clients.release(item.client)
+                item.client = upload_clients.acquire(item.reply_to.chat.id)
+                raise f
             await sleep(f.value)
         except Exception as err:
             self.__retry_error = True
@@ -748,10 +895,13 @@ class TgUploader:
                     and await aiopath.exists(dir_name)
                 ):
                     await rmdir(dir_name)
-            LOGGER.error(f"{format_exc()}. Path: {self.__up_path}")
+            LOGGER.error(f"{format_exc()}. Path: {item.up_path}")
+            if item.client not in (bot, user):
+                # retry with the main bot, the helper may have lost access
+                item.client = upload_clients.fall_back(item.client)
             if "Telegram says: [400" in str(err) and key != "documents":
-                LOGGER.error(f"Retrying As Document. Path: {self.__up_path}")
-                return await self.__upload_file(cap_mono, file, True)
+                LOGGER.error(f"Retrying As Document. Path: {item.up_path}")
+                return await self.__upload_file(item, cap_mono, file, True)
             raise err
 
     @property
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+from time import monotonic
+
+from pyrogram.enums import ChatMemberStatus
+
+from bot import bot, helper_bots, LOGGER
+
+
+class ClientPool:
+    """
+    Bot clients leech uploads are spread across. The main bot is always part
+    of the pool and takes every chat, helper bots only take the leech log
+    chats verify() found them admin in. A client in flood wait is skipped
+    until the wait is over.
+    """
+
+    def __init__(self, main, *helpers):
+        self.__main = main
+        self.__clients = {
+            client: {"active": 0, "flood_until": 0, "last_used": 0, "chats": set()}
+            for client in (main, *helpers)
+        }
+
+    def __len__(self):
+        return len(self.__clients)
+
+    async def verify(self, chat_ids):
+        """chat_ids is LEECH_LOG_ID, chat ids with optional :topic_id"""
+        chat_ids = {chat_id.split(":")[0] for chat_id in chat_ids.split()}
+        for client, state in self.__clients.items():
+            if client is self.__main:
+                continue
+            chats = set()
+            for chat_id in chat_ids:
+                try:
+                    chat_id = int(chat_id)
+                    member = await client.get_chat_member(chat_id, "me")
+                except Exception as e:
+                    LOGGER.error(
+                        f"Helper Bot @{client.me.username} can't access {chat_id}: {e}"
+                    )
+                    continue
+                if member.status not in [
+                    ChatMemberStatus.OWNER,
+                    ChatMemberStatus.ADMINISTRATOR,
+                ] or (
+                    member.privileges and member.privileges.can_post_messages is False
+                ):
+                    LOGGER.error(
+                        f"Helper Bot @{client.me.username} is not admin in {chat_id}"
+                    )
+                    continue
+                chats.add(chat_id)
+            state["chats"] = chats
+
+    def __serves(self, client, chat_id):
+        return client is self.__main or chat_id in self.__clients[client]["chats"]
+
+    def acquire(self, chat_id):
+        now = monotonic()
+        ready = [
+            client
+            for client, state in self.__clients.items()
+            if state["flood_until"] <= now and self.__serves(client, chat_id)
+        ]
+        if ready:
+            client = min(
+                ready,
+                key=lambda c: (
+                    self.__clients[c]["active"],
+                    self.__clients[c]["last_used"],
+                ),
+            )
+        else:
+            client = min(
+                (c for c in self.__clients if self.__serves(c, chat_id)),
+                key=lambda c: self.__clients[c]["flood_until"],
+            )
+        state = self.__clients[client]
+        state["active"] += 1
+        state["last_used"] = now
+        return client
+
+    def release(self, client):
+        if (state := self.__clients.get(client)) is not None:
+            state["active"] = max(state["active"] - 1, 0)
+
+    def fall_back(self, client):
+        """Swap a helper bot for the main bot, which can reach every chat."""
+        self.release(client)
+        state = self.__clients[self.__main]
+        state["active"] += 1
+        state["last_used"] = monotonic()
+        return self.__main
+
+    def flood(self, client, seconds):
+        if (state := self.__clients.get(client)) is not None:
+            state["flood_until"] = max(state["flood_until"], monotonic() + seconds)
+            LOGGER.warning(
+                f"Upload client @{client.me.username} in flood wait for {seconds}s"
+            )
+
+    def available(self, chat_id, client=None):
+        now = monotonic()
+        return any(
+            state["flood_until"] <= now
+            for c, state in self.__clients.items()
+            if c is not client and self.__serves(c, chat_id)
+        )
+
+    def stats(self):
+        now = monotonic()
+        return {
+            client.me.username: {
+                "active": state["active"],
+                "flood_wait": max(round(state["flood_until"] - now), 0),
+            }
+            for client, state in self.__clients.items()
+        }
+
+
+upload_clients = ClientPool(bot, *helper_bots)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+from asyncio import sleep, create_task, get_running_loop
+from collections import deque
+from time import monotonic
+from pyrogram.errors import FloodWait
+
+from bot import LOGGER
+from bot.helper.telegram_helper.edit_scheduler import (
+    TokenBucket,
+    global_bucket,
+    CHAT_RATE,
+    CHAT_BURST,
+)
+
+# private chats take about one message per second, groups 20 per minute
+PRIVATE_RATE = 1
+MAX_FLOOD_RETRIES = 3
+
+
+class CopySender:
+    """
+    Sends leech copies in the background. Jobs for one chat run in the order
+    they were submitted, different chats are served concurrently.
+    """
+
+    def __init__(self):
+        self.__queues = {}
+        self.__workers = {}
+        self.__buckets = {}
+        self.__flood_until = {}
+        self.stats = {"sent": 0, "failed": 0, "flood_waited": 0}
+
+    def __bucket(self, chat_key):
+        if chat_key not in self.__buckets:
+            private = isinstance(chat_key, int) and chat_key > 0
+            self.__buckets[chat_key] = TokenBucket(
+                PRIVATE_RATE if private else CHAT_RATE, CHAT_BURST
+            )
+        return self.__buckets[chat_key]
+
+    def submit(self, chat_key, func, *args, **kwargs):
+        future = get_running_loop().create_future()
+        self.__queues.setdefault(chat_key, deque()).append((future, func, args, kwargs))
+        if chat_key not in self.__workers:
+            self.__workers[chat_key] = create_task(self.__worker(chat_key))
+        return future
+
+    async def __worker(self, chat_key):
+        queue = self.__queues[chat_key]
+        bucket = self.__bucket(chat_key)
+        retries = 0
+        try:
+            while queue:
+                wait = max(
+                    bucket.delay(),
+                    global_bucket.delay(),
+                    self.__flood_until.get(chat_key, 0) - monotonic(),
+                )
+                if wait > 0:
+                    await sleep(wait)
+                    continue
+                future, func, args, kwargs = queue[0]
+                bucket.consume()
+                global_bucket.consume()
+                try:
+                    result = await func(*args, **kwargs)
+                except FloodWait as f:
+                    LOGGER.warning(f"Leech copy to {chat_key}: {f}")
+                    self.stats["flood_waited"] += 1
+                    self.__flood_until[chat_key] = monotonic() + f.value * 1.2
+                    retries += 1
+                    if retries <= MAX_FLOOD_RETRIES:
+                        continue
+                    error = f
+                except Exception as e:
+                    error = e
+                else:
+                    error = None
+                queue.popleft()
+                retries = 0
+                if error is None:
+                    self.stats["sent"] += 1
+                    if not future.done():
+                        future.set_result(result)
+                else:
+                    self.stats["failed"] += 1
+                    if not future.done():
+                        future.set_exception(error)
+        except Exception as e:
+            LOGGER.error(f"Leech copy sender error in {chat_key}: {e}")
+            while queue:
+                # a caller may have cancelled its own future meanwhile
+                if not (future := queue.popleft()[0]).done():
+                    future.set_exception(e)
+        finally:
+            self.__workers.pop(chat_key, None)
+            self.__queues.pop(chat_key, None)
+
+
+copy_sender = CopySender()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+from asyncio import sleep, create_task
+from time import time, monotonic
+from pyrogram.errors import FloodWait
+
+from bot import status_reply_dict, status_reply_dict_lock, LOGGER
+
+# Telegram allows roughly one edit per second in a chat, 20 per minute in
+# groups and about 30 requests per second for the whole bot.
+CHAT_RATE = 1 / 3
+CHAT_BURST = 3
+GLOBAL_RATE = 25
+GLOBAL_BURST = 25
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.__updated = monotonic()
+
+    def __refill(self):
+        now = monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.__updated) * self.rate
+        )
+        self.__updated = now
+
+    def delay(self, count=1):
+        self.__refill()
+        return 0 if self.tokens >= count else (count - self.tokens) / self.rate
+
+    def consume(self, count=1):
+        self.__refill()
+        self.tokens -= count
+
+
+# shared by every sender of the bot client
+global_bucket = TokenBucket(GLOBAL_RATE, GLOBAL_BURST)
+
+
+class EditScheduler:
+    def __init__(self, edit_func):
+        self.__edit = edit_func
+        self.__pending = {}
+        self.__workers = {}
+        self.__buckets = {}
+        self.__flood_until = {}
+        self.__global = global_bucket
+        self.stats = {"sent": 0, "skipped": 0, "coalesced": 0, "flood_waited": 0}
+
+    def submit(self, chat_id, message, text, buttons=None):
+        if text == message.text:
+            self.stats["skipped"] += 1
+            self.__pending.pop(chat_id, None)
+            return
+        if chat_id in self.__pending:
+            self.stats["coalesced"] += 1
+        self.__pending[chat_id] = (message, text, buttons)
+        if chat_id not in self.__workers:
+            self.__workers[chat_id] = create_task(self.__worker(chat_id))
+
+    def forget(self, chat_id):
+        self.__pending.pop(chat_id, None)
+
+    async def __worker(self, chat_id):
+        try:
+            while chat_id in self.__pending:
+                bucket = self.__buckets.setdefault(
+                    chat_id, TokenBucket(CHAT_RATE, CHAT_BURST)
+                )
+                wait = max(
+                    bucket.delay(),
+                    self.__global.delay(),
+                    self.__flood_until.get(chat_id, 0) - monotonic(),
+                )
+                if wait > 0:
+                    await sleep(wait)
+                    continue
+                message, text, buttons = self.__pending.pop(chat_id)
+                if status_reply_dict.get(chat_id, [None])[0] is not message:
+                    continue
+                if text == message.text:
+                    self.stats["skipped"] += 1
+                    continue
+                bucket.consume()
+                self.__global.consume()
+                try:
+                    rmsg = await self.__edit(
+                        message, text, buttons, "IMAGES", wait_flood=False
+                    )
+                except FloodWait as f:
+                    LOGGER.warning(f"Status edit in {chat_id}: {f}")
+                    self.stats["flood_waited"] += 1
+                    self.__flood_until[chat_id] = monotonic() + f.value * 1.2
+                    self.__pending.setdefault(chat_id, (message, text, buttons))
+                    continue
+                async with status_reply_dict_lock:
+                    data = status_reply_dict.get(chat_id, [None])
+                    if data[0] is not message:
+                        continue
+                    if isinstance(rmsg, str) and rmsg.startswith("Telegram says: [400"):
+                        del status_reply_dict[chat_id]
+                        self.forget(chat_id)
+                        continue
+                    message.text = text
+                    data[1] = time()
+                self.stats["sent"] += 1
+        except Exception as e:
+            LOGGER.error(f"Status edit scheduler error in {chat_id}: {e}")
+        finally:
+            self.__workers.pop(chat_id, None)
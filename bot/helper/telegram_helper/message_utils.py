@@ -7,7 +7,6 @@ from time import time
 from re import match as re_match
 from cryptography.fernet import InvalidToken
 
-from pyrogram import Client
 from pyrogram.enums import ParseMode
 from pyrogram.types import InputMediaPhoto
 from pyrogram.errors import (
@@ -48,6 +47,8 @@ from bot.helper.ext_utils.bot_utils import (
     new_thread,
 )
 from bot.helper.telegram_helper.button_build import ButtonMaker
+from bot.helper.telegram_helper.edit_scheduler import EditScheduler
+from bot.helper.telegram_helper.session_pool import user_sessions
 from bot.helper.ext_utils.exceptions import TgLinkException
 
 
@@ -206,7 +207,7 @@ async def sendMultiMessage(chat_ids, text, buttons=None, photo=None):
     return msg_dict
 
 
-async def editMessage(message, text, buttons=None, photo=None):
+async def editMessage(message, text, buttons=None, photo=None, wait_flood=True):
     try:
         if message.media:
             if photo:
@@ -219,18 +220,23 @@ async def editMessage(message, text, buttons=None, photo=None):
             text=text, disable_web_page_preview=True, reply_markup=buttons
         )
     except FloodWait as f:
+        if not wait_flood:
+            raise
         LOGGER.warning(str(f))
         await sleep(f.value * 1.2)
         return await editMessage(message, text, buttons, photo)
     except (MessageNotModified, MessageEmpty):
         pass
     except ReplyMarkupInvalid:
-        return await editMessage(message, text, None, photo)
+        return await editMessage(message, text, None, photo, wait_flood)
     except Exception as e:
         LOGGER.error(str(e))
         return str(e)
 
 
+status_editor = EditScheduler(editMessage)
+
+
 async def editReplyMarkup(message, reply_markup):
     try:
         return await message.edit_reply_markup(reply_markup=reply_markup)
@@ -312,6 +318,7 @@ async def delete_all_messages():
         for key, data in list(status_reply_dict.items()):
             try:
                 del status_reply_dict[key]
+                status_editor.forget(key)
                 await deleteMessage(data[0])
             except Exception as e:
                 LOGGER.error(str(e))
@@ -370,24 +377,22 @@ async def get_tg_link_content(link, user_id, decrypter=None):
                 ) from e
 
     if private and user_sess:
-        if decrypter is None:
-            return None, ""
         try:
-            async with Client(
-                user_id,
-                session_string=decrypter.decrypt(user_sess).decode(),
-                in_memory=True,
-                no_updates=True,
-            ) as usession:
-                user_message = await usession.get_messages(
-                    chat_id=chat, message_ids=msg_id
-                )
+            usession = await user_sessions.get(user_id, user_sess, decrypter)
         except InvalidToken:
             raise TgLinkException("Provided Decryption Key is Invalid, Recheck & Retry")
+        except Exception as e:
+            raise TgLinkException(f"User Session not started!. ERROR: {e}") from e
+        if usession is None:
+            return None, ""
+        try:
+            user_message = await usession.get_messages(chat_id=chat, message_ids=msg_id)
         except Exception as e:
             raise TgLinkException(
                 f"User Session don't have access to this chat!. ERROR: {e}"
             ) from e
+        finally:
+            user_sessions.release(user_id, usession)
         if not user_message.empty:
             return user_message, "user_sess"
         else:
@@ -415,16 +420,9 @@ async def update_all_messages(force=False):
     if msg is None:
         return
     async with status_reply_dict_lock:
-        for chat_id in list(status_reply_dict.keys()):
-            if status_reply_dict[chat_id] and msg != status_reply_dict[chat_id][0].text:
-                rmsg = await editMessage(
-                    status_reply_dict[chat_id][0], msg, buttons, "IMAGES"
-                )
-                if isinstance(rmsg, str) and rmsg.startswith("Telegram says: [400"):
-                    del status_reply_dict[chat_id]
-                    continue
-                status_reply_dict[chat_id][0].text = msg
-                status_reply_dict[chat_id][1] = time()
+        for chat_id, data in list(status_reply_dict.items()):
+            if data:
+                status_editor.submit(chat_id, data[0], msg, buttons)
 
 
 async def sendStatusMessage(msg):
@@ -438,6 +436,7 @@ async def sendStatusMessage(msg):
             message = status_reply_dict[chat_id][0]
             await deleteMessage(message)
             del status_reply_dict[chat_id]
+            status_editor.forget(chat_id)
         if message := await sendMessage(msg, progress, buttons, photo="IMAGES"):
             if hasattr(message, "caption"):
                 message.caption = progress
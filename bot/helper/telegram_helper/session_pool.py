@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+from asyncio import Lock, sleep, create_task
+from time import monotonic
+from pyrogram import Client
+
+from bot import LOGGER
+
+SESSION_IDLE_TIMEOUT = 600
+MAX_SESSIONS = 10
+
+
+class UserSessionPool:
+    """
+    Clients of the users' own sessions, kept running between link lookups and
+    downloads. A client unused for SESSION_IDLE_TIMEOUT is stopped, the least
+    recently used idle client makes room when MAX_SESSIONS are running.
+    A client whose session string was replaced while in use is retired: it
+    keeps serving its current holders and is stopped after the last release.
+    """
+
+    def __init__(self):
+        self.__sessions = {}
+        self.__retired = {}
+        self.__lock = Lock()
+        self.__evictor = None
+
+    def __len__(self):
+        return len(self.__sessions)
+
+    async def get(self, user_id, user_sess, decrypter=None):
+        # None when the client isn't running and there is no key to start it
+        async with self.__lock:
+            entry = self.__sessions.get(user_id)
+            if entry is not None and entry["session"] != user_sess:
+                if entry["active"]:
+                    self.__retired[entry["client"]] = self.__sessions.pop(user_id)
+                else:
+                    await self.__stop(user_id)
+                entry = None
+            if entry is None:
+                if decrypter is None:
+                    return None
+                session_string = decrypter.decrypt(user_sess).decode()
+                await self.__make_room()
+                client = Client(
+                    str(user_id),
+                    session_string=session_string,
+                    in_memory=True,
+                    no_updates=True,
+                )
+                await client.start()
+                entry = self.__sessions[user_id] = {
+                    "client": client,
+                    "session": user_sess,
+                    "active": 0,
+                    "last_used": 0,
+                }
+                if self.__evictor is None:
+                    self.__evictor = create_task(self.__evict())
+            entry["active"] += 1
+            entry["last_used"] = monotonic()
+            return entry["client"]
+
+    def release(self, user_id, client):
+        if (entry := self.__retired.get(client)) is not None:
+            entry["active"] -= 1
+            if not entry["active"]:
+                del self.__retired[client]
+                create_task(self.__stop_client(user_id, client))
+        elif (entry := self.__sessions.get(user_id)) is not None:
+            entry["active"] = max(entry["active"] - 1, 0)
+            entry["last_used"] = monotonic()
+
+    async def __stop(self, user_id):
+        await self.__stop_client(user_id, self.__sessions.pop(user_id)["client"])
+
+    @staticmethod
+    async def __stop_client(user_id, client):
+        try:
+            await client.stop()
+        except Exception as e:
+            LOGGER.error(f"User session of {user_id} not stopped: {e}")
+
+    async def __make_room(self):
+        while len(self.__sessions) >= MAX_SESSIONS:
+            idle = [
+                uid for uid, entry in self.__sessions.items() if not entry["active"]
+            ]
+            if not idle:
+                break
+            await self.__stop(
+                min(idle, key=lambda uid: self.__sessions[uid]["last_used"])
+            )
+
+    async def __evict(self):
+        try:
+            while self.__sessions:
+                await sleep(60)
+                async with self.__lock:
+                    now = monotonic()
+                    for user_id, entry in list(self.__sessions.items()):
+                        if (
+                            not entry["active"]
+                            and now - entry["last_used"] > SESSION_IDLE_TIMEOUT
+                        ):
+                            await self.__stop(user_id)
+        finally:
+            self.__evictor = None
+
+    async def stop_all(self):
+        async with self.__lock:
+            for user_id in list(self.__sessions):
+                await self.__stop(user_id)
+            for client in list(self.__retired):
+                del self.__retired[client]
+                await self.__stop_client(client.name, client)
+
+
+user_sessions = UserSessionPool()
@@ -4,29 +4,46 @@ from importlib import import_module
 from random import choice as rchoice
 from bot import config_dict, LOGGER
 from bot.helper.themes import wzml_minimal
+from bot.helper.themes.template_cache import ThemeTemplates
 
 AVL_THEMES = {}
 for theme in listdir("bot/helper/themes"):
     if theme.startswith("wzml_") and theme.endswith(".py"):
         AVL_THEMES[theme[5:-3]] = import_module(f"bot.helper.themes.{theme[:-3]}")
 
+COMPILED_THEMES = {}
 
-def BotTheme(var_name, **format_vars):
-    text = None
-    theme_ = config_dict["BOT_THEME"]
 
-    if theme_ in AVL_THEMES:
-        text = getattr(AVL_THEMES[theme_].WZMLStyle(), var_name, None)
-        if text is None:
-            LOGGER.error(
-                f"{var_name} not Found in {theme_}. Please recheck with Official Repo"
-            )
+def compile_theme(theme_):
+    templates = ThemeTemplates(AVL_THEMES[theme_].WZMLStyle, wzml_minimal.WZMLStyle)
+    for var_name in templates.missing:
+        LOGGER.error(
+            f"{var_name} not Found in {theme_}. Please recheck with Official Repo"
+        )
+    COMPILED_THEMES[theme_] = templates
+    return templates
+
+
+for theme in AVL_THEMES:
+    compile_theme(theme)
+
+
+def __get_templates():
+    theme_ = config_dict["BOT_THEME"]
+    if theme_ in COMPILED_THEMES:
+        return COMPILED_THEMES[theme_]
+    elif theme_ in AVL_THEMES:
+        return compile_theme(theme_)
     elif theme_ == "random":
-        rantheme = rchoice(list(AVL_THEMES.values()))
+        rantheme = rchoice(list(COMPILED_THEMES.keys()))
         LOGGER.info(f"Random Theme Chosen: {rantheme}")
-        text = getattr(rantheme.WZMLStyle(), var_name, None)
+        return COMPILED_THEMES[rantheme]
+    return COMPILED_THEMES["minimal"]
+
+
+def BotTheme(var_name, **format_vars):
+    return __get_templates().render(var_name, **format_vars)
 
-    if text is None:
-        text = getattr(wzml_minimal.WZMLStyle(), var_name)
 
-    return text.format_map(format_vars)
+def BotThemeBlock(var_names, **format_vars):
+    return __get_templates().render_block(var_names, **format_vars)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+class ThemeTemplates:
+    def __init__(self, style, fallback=None):
+        self.templates = {}
+        self.missing = []
+        self.__blocks = {}
+        if fallback is not None and fallback is not style:
+            self.templates.update(self.__collect(fallback))
+            own = self.__collect(style)
+            self.missing = [name for name in self.templates if name not in own]
+            self.templates.update(own)
+        else:
+            self.templates.update(self.__collect(style))
+
+    @staticmethod
+    def __collect(style):
+        return {
+            name: value
+            for name in dir(style)
+            if not name.startswith("__")
+            and isinstance(value := getattr(style, name), str)
+        }
+
+    def get(self, var_name):
+        return self.templates[var_name]
+
+    def render(self, var_name, **format_vars):
+        return self.templates[var_name].format_map(format_vars)
+
+    def block(self, var_names):
+        var_names = tuple(var_names)
+        if (template := self.__blocks.get(var_names)) is None:
+            template = "".join(self.templates[name] for name in var_names)
+            self.__blocks[var_names] = template
+        return template
+
+    def render_block(self, var_names, **format_vars):
+        return self.block(var_names).format_map(format_vars)
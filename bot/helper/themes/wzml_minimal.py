@@ -59,6 +59,7 @@ class WZMLStyle:
 ┃ {disk_bar} {disk}%
 ┃ <b>Total Disk Read :</b> {disk_read}
 ┃ <b>Total Disk Write :</b> {disk_write}
+┃ <b>Reserved :</b> {disk_rsv} for {disk_rsv_t} Task(s)
 ┖ <b>U :</b> {disk_u} | <b>F :</b> {disk_f} | <b>T :</b> {disk_t}
     
     """
@@ -234,6 +235,7 @@ class WZMLStyle:
 
     # async def countNode(_, message): ----> gd_count.py
     COUNT_MSG = "<b>Counting:</b> <code>{LINK}</code>"
+    COUNT_PROGRESS = "\n┃\n┠ <b>Counted: </b>{COUNT_FILE} Files, {COUNT_SUB} SubFolders\n┖ <b>Size: </b>{COUNT_SIZE}"
     COUNT_NAME = "<b><i>{COUNT_NAME}</i></b>\n┃\n"
     COUNT_SIZE = "┠ <b>Size: </b>{COUNT_SIZE}\n"
     COUNT_TYPE = "┠ <b>Type: </b>{COUNT_TYPE}\n"
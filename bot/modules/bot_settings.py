@@ -46,6 +46,7 @@ from bot.helper.telegram_helper.message_utils import (
 from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
+from bot.helper.telegram_helper.client_pool import upload_clients
 from bot.helper.ext_utils.bot_utils import setInterval, sync_to_async, new_thread
 from bot.helper.ext_utils.db_handler import DbManger
 from bot.helper.ext_utils.task_manager import start_from_queued
@@ -53,7 +54,7 @@ from bot.helper.ext_utils.help_messages import default_desp
 from bot.helper.mirror_utils.rclone_utils.serve import rclone_serve_booter
 from bot.modules.torrent_search import initiate_search_tools
 from bot.modules.rss import addJob
-from bot.helper.themes import AVL_THEMES
+from bot.helper.themes import AVL_THEMES, compile_theme
 
 START = 0
 STATE = "view"
@@ -64,6 +65,7 @@ default_values = {
     "DOWNLOAD_DIR": "/usr/src/app/downloads/",
     "LEECH_SPLIT_SIZE": MAX_SPLIT_SIZE,
     "RSS_DELAY": 600,
+    "QUEUE_AGING": 600,
     "STATUS_UPDATE_INTERVAL": 10,
     "SEARCH_LIMIT": 0,
     "UPSTREAM_BRANCH": "master",
@@ -79,6 +81,9 @@ bool_vars = [
     "AS_DOCUMENT",
     "BOT_PM",
     "STOP_DUPLICATE",
+    "DRIVE_INDEX",
+    "QUEUE_SJF",
+    "QUEUE_STRETCH",
     "SET_COMMANDS",
     "SAVE_MSG",
     "SHOW_MEDIAINFO",
@@ -94,6 +99,7 @@ bool_vars = [
     "CLEAN_LOG_MSG",
     "USER_TD_MODE",
     "INCOMPLETE_TASK_NOTIFIER",
+    "RESUME_TASKS",
     "UPGRADE_PACKAGES",
     "SCREENSHOTS_MODE",
 ]
@@ -296,6 +302,8 @@ async def load_config():
 
     USER_SESSION_STRING = environ.get("USER_SESSION_STRING", "")
 
+    HELPER_BOT_TOKENS = environ.get("HELPER_BOT_TOKENS", "")
+
     TORRENT_TIMEOUT = environ.get("TORRENT_TIMEOUT", "")
     downloads = aria2.get_downloads()
     if len(TORRENT_TIMEOUT) == 0:
@@ -338,14 +346,37 @@ async def load_config():
     QUEUE_UPLOAD = environ.get("QUEUE_UPLOAD", "")
     QUEUE_UPLOAD = "" if len(QUEUE_UPLOAD) == 0 else int(QUEUE_UPLOAD)
 
+    QUEUE_SJF = environ.get("QUEUE_SJF", "")
+    QUEUE_SJF = QUEUE_SJF.lower() == "true"
+
+    QUEUE_AGING = environ.get("QUEUE_AGING", "")
+    QUEUE_AGING = 600 if len(QUEUE_AGING) == 0 else int(QUEUE_AGING)
+
+    QUEUE_MAX_CPU = environ.get("QUEUE_MAX_CPU", "")
+    QUEUE_MAX_CPU = "" if len(QUEUE_MAX_CPU) == 0 else int(QUEUE_MAX_CPU)
+
+    LINK_CAPACITY = environ.get("LINK_CAPACITY", "")
+    LINK_CAPACITY = "" if len(LINK_CAPACITY) == 0 else int(LINK_CAPACITY)
+
+    QUEUE_STRETCH = environ.get("QUEUE_STRETCH", "")
+    QUEUE_STRETCH = QUEUE_STRETCH.lower() == "true"
+
     INCOMPLETE_TASK_NOTIFIER = environ.get("INCOMPLETE_TASK_NOTIFIER", "")
     INCOMPLETE_TASK_NOTIFIER = INCOMPLETE_TASK_NOTIFIER.lower() == "true"
     if not INCOMPLETE_TASK_NOTIFIER and DATABASE_URL:
         await DbManger().trunc_table("tasks")
 
+    RESUME_TASKS = environ.get("RESUME_TASKS", "")
+    RESUME_TASKS = RESUME_TASKS.lower() == "true"
+    if not RESUME_TASKS and DATABASE_URL:
+        await DbManger().trunc_table("journal")
+
     STOP_DUPLICATE = environ.get("STOP_DUPLICATE", "")
     STOP_DUPLICATE = STOP_DUPLICATE.lower() == "true"
 
+    DRIVE_INDEX = environ.get("DRIVE_INDEX", "")
+    DRIVE_INDEX = DRIVE_INDEX.lower() == "true"
+
     IS_TEAM_DRIVE = environ.get("IS_TEAM_DRIVE", "")
     IS_TEAM_DRIVE = IS_TEAM_DRIVE.lower() == "true"
 
@@ -379,6 +410,60 @@ async def load_config():
     EQUAL_SPLITS = environ.get("EQUAL_SPLITS", "")
     EQUAL_SPLITS = EQUAL_SPLITS.lower() == "true"
 
+    LEECH_SPLIT_LOOKAHEAD = environ.get("LEECH_SPLIT_LOOKAHEAD", "")
+    LEECH_SPLIT_LOOKAHEAD = (
+        "" if len(LEECH_SPLIT_LOOKAHEAD) == 0 else int(LEECH_SPLIT_LOOKAHEAD)
+    )
+
+    LEECH_PARALLEL_UPLOADS = environ.get("LEECH_PARALLEL_UPLOADS", "")
+    LEECH_PARALLEL_UPLOADS = (
+        "" if len(LEECH_PARALLEL_UPLOADS) == 0 else int(LEECH_PARALLEL_UPLOADS)
+    )
+
+    LEECH_PARALLEL_UPLOADS_ALL = environ.get("LEECH_PARALLEL_UPLOADS_ALL", "")
+    LEECH_PARALLEL_UPLOADS_ALL = (
+        "" if len(LEECH_PARALLEL_UPLOADS_ALL) == 0 else int(LEECH_PARALLEL_UPLOADS_ALL)
+    )
+
+    TG_DOWNLOAD_CONNECTIONS = environ.get("TG_DOWNLOAD_CONNECTIONS", "")
+    TG_DOWNLOAD_CONNECTIONS = (
+        "" if len(TG_DOWNLOAD_CONNECTIONS) == 0 else int(TG_DOWNLOAD_CONNECTIONS)
+    )
+
+    TG_DOWNLOAD_CONNECTIONS_ALL = environ.get("TG_DOWNLOAD_CONNECTIONS_ALL", "")
+    TG_DOWNLOAD_CONNECTIONS_ALL = (
+        ""
+        if len(TG_DOWNLOAD_CONNECTIONS_ALL) == 0
+        else int(TG_DOWNLOAD_CONNECTIONS_ALL)
+    )
+
+    GDRIVE_PARALLEL_UPLOADS = environ.get("GDRIVE_PARALLEL_UPLOADS", "")
+    GDRIVE_PARALLEL_UPLOADS = (
+        "" if len(GDRIVE_PARALLEL_UPLOADS) == 0 else int(GDRIVE_PARALLEL_UPLOADS)
+    )
+
+    GDRIVE_PARALLEL_UPLOADS_ALL = environ.get("GDRIVE_PARALLEL_UPLOADS_ALL", "")
+    GDRIVE_PARALLEL_UPLOADS_ALL = (
+        ""
+        if len(GDRIVE_PARALLEL_UPLOADS_ALL) == 0
+        else int(GDRIVE_PARALLEL_UPLOADS_ALL)
+    )
+
+    GDRIVE_PARALLEL_COPIES = environ.get("GDRIVE_PARALLEL_COPIES", "")
+    GDRIVE_PARALLEL_COPIES = (
+        "" if len(GDRIVE_PARALLEL_COPIES) == 0 else int(GDRIVE_PARALLEL_COPIES)
+    )
+
+    GDRIVE_PARALLEL_DOWNLOADS = environ.get("GDRIVE_PARALLEL_DOWNLOADS", "")
+    GDRIVE_PARALLEL_DOWNLOADS = (
+        "" if len(GDRIVE_PARALLEL_DOWNLOADS) == 0 else int(GDRIVE_PARALLEL_DOWNLOADS)
+    )
+
+    GDRIVE_DOWNLOAD_MEMORY = environ.get("GDRIVE_DOWNLOAD_MEMORY", "")
+    GDRIVE_DOWNLOAD_MEMORY = (
+        "" if len(GDRIVE_DOWNLOAD_MEMORY) == 0 else int(GDRIVE_DOWNLOAD_MEMORY)
+    )
+
     MEDIA_GROUP = environ.get("MEDIA_GROUP", "")
     MEDIA_GROUP = MEDIA_GROUP.lower() == "true"
 
@@ -719,9 +804,20 @@ async def load_config():
             "GDTOT_CRYPT": GDTOT_CRYPT,
             "JIODRIVE_TOKEN": JIODRIVE_TOKEN,
             "EQUAL_SPLITS": EQUAL_SPLITS,
+            "LEECH_SPLIT_LOOKAHEAD": LEECH_SPLIT_LOOKAHEAD,
+            "LEECH_PARALLEL_UPLOADS": LEECH_PARALLEL_UPLOADS,
+            "LEECH_PARALLEL_UPLOADS_ALL": LEECH_PARALLEL_UPLOADS_ALL,
+            "TG_DOWNLOAD_CONNECTIONS": TG_DOWNLOAD_CONNECTIONS,
+            "TG_DOWNLOAD_CONNECTIONS_ALL": TG_DOWNLOAD_CONNECTIONS_ALL,
+            "GDRIVE_PARALLEL_UPLOADS": GDRIVE_PARALLEL_UPLOADS,
+            "GDRIVE_PARALLEL_UPLOADS_ALL": GDRIVE_PARALLEL_UPLOADS_ALL,
+            "GDRIVE_PARALLEL_COPIES": GDRIVE_PARALLEL_COPIES,
+            "GDRIVE_PARALLEL_DOWNLOADS": GDRIVE_PARALLEL_DOWNLOADS,
+            "GDRIVE_DOWNLOAD_MEMORY": GDRIVE_DOWNLOAD_MEMORY,
             "EXTENSION_FILTER": EXTENSION_FILTER,
             "GDRIVE_ID": GDRIVE_ID,
             "INCOMPLETE_TASK_NOTIFIER": INCOMPLETE_TASK_NOTIFIER,
+            "RESUME_TASKS": RESUME_TASKS,
             "INDEX_URL": INDEX_URL,
             "IS_TEAM_DRIVE": IS_TEAM_DRIVE,
             "LEECH_FILENAME_PREFIX": LEECH_FILENAME_PREFIX,
@@ -743,6 +839,11 @@ async def load_config():
             "QUEUE_ALL": QUEUE_ALL,
             "QUEUE_DOWNLOAD": QUEUE_DOWNLOAD,
             "QUEUE_UPLOAD": QUEUE_UPLOAD,
+            "QUEUE_SJF": QUEUE_SJF,
+            "QUEUE_AGING": QUEUE_AGING,
+            "QUEUE_MAX_CPU": QUEUE_MAX_CPU,
+            "LINK_CAPACITY": LINK_CAPACITY,
+            "QUEUE_STRETCH": QUEUE_STRETCH,
             "RCLONE_FLAGS": RCLONE_FLAGS,
             "RCLONE_PATH": RCLONE_PATH,
             "RCLONE_SERVE_URL": RCLONE_SERVE_URL,
@@ -765,6 +866,7 @@ async def load_config():
             "STATUS_LIMIT": STATUS_LIMIT,
             "STATUS_UPDATE_INTERVAL": STATUS_UPDATE_INTERVAL,
             "STOP_DUPLICATE": STOP_DUPLICATE,
+            "DRIVE_INDEX": DRIVE_INDEX,
             "SUDO_USERS": SUDO_USERS,
             "TELEGRAM_API": TELEGRAM_API,
             "TELEGRAM_HASH": TELEGRAM_HASH,
@@ -774,6 +876,7 @@ async def load_config():
             "UPSTREAM_BRANCH": UPSTREAM_BRANCH,
             "UPGRADE_PACKAGES": UPGRADE_PACKAGES,
             "USER_SESSION_STRING": USER_SESSION_STRING,
+            "HELPER_BOT_TOKENS": HELPER_BOT_TOKENS,
             "USER_TD_MODE": USER_TD_MODE,
             "USER_TD_SA": USER_TD_SA,
             "USE_SERVICE_ACCOUNTS": USE_SERVICE_ACCOUNTS,
@@ -876,6 +979,7 @@ async def get_buttons(key=None, edit_type=None, edit_mode=None, mess=None):
             "CMD_SUFFIX",
             "OWNER_ID",
             "USER_SESSION_STRING",
+            "HELPER_BOT_TOKENS",
             "TELEGRAM_HASH",
             "TELEGRAM_API",
             "AUTHORIZED_CHATS",
@@ -949,9 +1053,12 @@ async def edit_variable(_, message, pre_message, key):
         aria2_options["bt-stop-timeout"] = f"{value}"
     elif key == "LEECH_SPLIT_SIZE":
         value = min(int(value), MAX_SPLIT_SIZE)
+    elif key == "LEECH_LOG_ID":
+        await upload_clients.verify(value)
     elif key == "BOT_THEME":
         if not value.strip() in AVL_THEMES.keys():
             value = "minimal"
+        compile_theme(value.strip())
     elif key == "CAP_FONT":
         value = value.strip().lower()
         if value not in ["b", "i", "u", "s", "spoiler", "code"]:
@@ -998,7 +1105,13 @@ async def edit_variable(_, message, pre_message, key):
         await DbManger().update_config({key: value})
     if key in ["SEARCH_PLUGINS", "SEARCH_API_LINK"]:
         await initiate_search_tools()
-    elif key in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD"]:
+    elif key in [
+        "QUEUE_ALL",
+        "QUEUE_DOWNLOAD",
+        "QUEUE_UPLOAD",
+        "QUEUE_MAX_CPU",
+        "LINK_CAPACITY",
+    ]:
         await start_from_queued()
     elif key in [
         "RCLONE_SERVE_URL",
@@ -1291,13 +1404,21 @@ async def edit_bot_settings(client, query):
                 categories_dict["Root"] = {"drive_id": GDRIVE_ID, "index_link": ""}
         elif data[2] == "INCOMPLETE_TASK_NOTIFIER" and DATABASE_URL:
             await DbManger().trunc_table("tasks")
+        elif data[2] == "RESUME_TASKS" and DATABASE_URL:
+            await DbManger().trunc_table("journal")
         config_dict[data[2]] = value
         await update_buttons(message, data[2], "editvar", False)
         if DATABASE_URL:
             await DbManger().update_config({data[2]: value})
         if data[2] in ["SEARCH_PLUGINS", "SEARCH_API_LINK"]:
             await initiate_search_tools()
-        elif data[2] in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD"]:
+        elif data[2] in [
+            "QUEUE_ALL",
+            "QUEUE_DOWNLOAD",
+            "QUEUE_UPLOAD",
+            "QUEUE_MAX_CPU",
+            "LINK_CAPACITY",
+        ]:
             await start_from_queued()
         elif data[2] in [
             "RCLONE_SERVE_URL",
@@ -1365,9 +1486,13 @@ async def edit_bot_settings(client, query):
         config_dict[data[2]] = value
         if not value and data[2] == "INCOMPLETE_TASK_NOTIFIER" and DATABASE_URL:
             await DbManger().trunc_table("tasks")
+        elif not value and data[2] == "RESUME_TASKS" and DATABASE_URL:
+            await DbManger().trunc_table("journal")
         await update_buttons(message, data[2], "editvar", False)
         if DATABASE_URL:
             await DbManger().update_config({data[2]: value})
+        if data[2] == "QUEUE_STRETCH":
+            await start_from_queued()
     elif data[1] == "editvar":
         handler_dict[message.chat.id] = False
         await query.answer()
@@ -2,7 +2,7 @@
 from pyrogram.handlers import MessageHandler
 from pyrogram.filters import command
 from secrets import token_hex
-from asyncio import sleep, gather
+from asyncio import gather, current_task
 from aiofiles.os import path as aiopath
 from cloudscraper import create_scraper as cget
 from json import loads, dumps as jdumps
@@ -44,6 +44,7 @@ from bot.helper.ext_utils.bot_utils import (
     arg_parser,
 )
 from bot.helper.ext_utils.exceptions import DirectDownloadLinkException
+from bot.helper.ext_utils.batch_engine import run_batch, multi_commands
 from bot.helper.mirror_utils.download_utils.direct_link_generator import (
     direct_link_generator,
 )
@@ -324,25 +325,14 @@ async def clone(client, message):
     if not link and (reply_to := message.reply_to_message) and reply_to.text:
         link = reply_to.text.split("\n", 1)[0].strip()
 
-    @new_task
-    async def __run_multi():
-        if multi > 1:
-            await sleep(5)
-            msg = [s.strip() for s in input_list]
-            index = msg.index("-i")
-            msg[index + 1] = f"{multi - 1}"
-            nextmsg = await client.get_messages(
-                chat_id=message.chat.id, message_ids=message.reply_to_message_id + 1
-            )
-            nextmsg = await sendMessage(nextmsg, " ".join(msg))
-            nextmsg = await client.get_messages(
-                chat_id=message.chat.id, message_ids=nextmsg.id
-            )
-            nextmsg.from_user = message.from_user
-            await sleep(5)
-            clone(client, nextmsg)
-
-    __run_multi()
+    if multi > 1:
+        run_batch(
+            message,
+            "Multi Task",
+            await multi_commands(client, message, input_list, multi),
+            lambda nextmsg: clone(client, nextmsg),
+            current=current_task(),
+        )
 
     if drive_id and is_gdrive_link(drive_id):
         drive_id = GoogleDriveHelper.getIdFromUrl(drive_id)
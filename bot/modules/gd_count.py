@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
+from asyncio import wait
 from pyrogram.handlers import MessageHandler
 from pyrogram.filters import command
 
-from bot import bot
+from bot import bot, config_dict
 from bot.helper.mirror_utils.upload_utils.gdriveTools import GoogleDriveHelper
-from bot.helper.telegram_helper.message_utils import deleteMessage, sendMessage
+from bot.helper.telegram_helper.message_utils import (
+    deleteMessage,
+    sendMessage,
+    editMessage,
+)
 from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.ext_utils.bot_utils import (
@@ -31,7 +36,26 @@ async def countNode(_, message):
     if is_gdrive_link(link):
         msg = await sendMessage(message, BotTheme("COUNT_MSG", LINK=link))
         gd = GoogleDriveHelper()
-        name, mime_type, size, files, folders = await sync_to_async(gd.count, link)
+        count = await sync_to_async(gd.count, link, wait=False)
+        # big folders take a while, show what is counted so far
+        while True:
+            done, _ = await wait({count}, timeout=config_dict["STATUS_UPDATE_INTERVAL"])
+            if done:
+                break
+            if isinstance(msg, str):
+                continue
+            files, folders, size = gd.count_progress
+            await editMessage(
+                msg,
+                BotTheme("COUNT_MSG", LINK=link)
+                + BotTheme(
+                    "COUNT_PROGRESS",
+                    COUNT_FILE=files,
+                    COUNT_SUB=folders,
+                    COUNT_SIZE=get_readable_file_size(size),
+                ),
+            )
+        name, mime_type, size, files, folders = count.result()
         if mime_type is None:
             await sendMessage(message, name)
             return
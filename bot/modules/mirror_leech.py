@@ -4,7 +4,7 @@ from html import escape
 from traceback import format_exc
 from base64 import b64encode
 from re import match as re_match
-from asyncio import sleep, wrap_future
+from asyncio import wrap_future, current_task
 from aiofiles import open as aiopen
 from aiofiles.os import path as aiopath
 from cloudscraper import create_scraper
@@ -71,13 +71,16 @@ from bot.helper.ext_utils.help_messages import (
     help_string,
 )
 from bot.helper.ext_utils.bulk_links import extract_bulk_links
+from bot.helper.ext_utils.batch_engine import (
+    run_batch,
+    bulk_commands,
+    multi_commands,
+)
 from bot.modules.gen_pyro_sess import get_decrypt_key
 
 
 @new_task
-async def _mirror_leech(
-    client, message, isQbit=False, isLeech=False, sameDir=None, bulk=[]
-):
+async def _mirror_leech(client, message, isQbit=False, isLeech=False, sameDir=None):
     text = message.text.split("\n")
     input_list = text[0].split(" ")
 
@@ -203,46 +206,26 @@ async def _mirror_leech(
                 "Reply to text file or tg message that have links seperated by new line!",
             )
             return
-        b_msg = input_list[:1]
-        b_msg.append(f"{bulk[0]} -i {len(bulk)}")
-        nextmsg = await sendMessage(message, " ".join(b_msg))
-        nextmsg = await client.get_messages(
-            chat_id=message.chat.id, message_ids=nextmsg.id
+        if folder_name:
+            sameDir = {"total": len(bulk), "tasks": set(), "name": f"/{folder_name}"}
+        run_batch(
+            message,
+            "Bulk Task",
+            [(message, command) for command in bulk_commands(input_list, bulk)],
+            lambda nextmsg: _mirror_leech(client, nextmsg, isQbit, isLeech, sameDir),
+            sameDir,
         )
-        nextmsg.from_user = message.from_user
-        _mirror_leech(client, nextmsg, isQbit, isLeech, sameDir, bulk)
         return
 
-    if len(bulk) != 0:
-        del bulk[0]
-
-    @new_task
-    async def __run_multi():
-        if multi <= 1:
-            return
-        await sleep(5)
-        if len(bulk) != 0:
-            msg = input_list[:1]
-            msg.append(f"{bulk[0]} -i {multi - 1}")
-            nextmsg = await sendMessage(message, " ".join(msg))
-        else:
-            msg = [s.strip() for s in input_list]
-            index = msg.index("-i")
-            msg[index + 1] = f"{multi - 1}"
-            nextmsg = await client.get_messages(
-                chat_id=message.chat.id, message_ids=message.reply_to_message_id + 1
-            )
-            nextmsg = await sendMessage(nextmsg, " ".join(msg))
-        nextmsg = await client.get_messages(
-            chat_id=message.chat.id, message_ids=nextmsg.id
+    if multi > 1:
+        run_batch(
+            message,
+            "Multi Task",
+            await multi_commands(client, message, input_list, multi),
+            lambda nextmsg: _mirror_leech(client, nextmsg, isQbit, isLeech, sameDir),
+            sameDir,
+            current_task(),
         )
-        if folder_name:
-            sameDir["tasks"].add(nextmsg.id)
-        nextmsg.from_user = message.from_user
-        await sleep(5)
-        _mirror_leech(client, nextmsg, isQbit, isLeech, sameDir, bulk)
-
-    __run_multi()
 
     path = f"{DOWNLOAD_DIR}{message.id}{folder_name}"
 
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
 from pyrogram.filters import command, regex
-from psutil import cpu_percent, virtual_memory, disk_usage
 from time import time
 from asyncio import sleep
 
@@ -34,6 +33,7 @@ from bot.helper.ext_utils.bot_utils import (
     setInterval,
     new_task,
 )
+from bot.helper.ext_utils.sys_metrics import get_metrics
 from bot.helper.themes import BotTheme
 
 
@@ -43,13 +43,14 @@ async def mirror_status(_, message):
         count = len(download_dict)
     if count == 0:
         currentTime = get_readable_time(time() - botStartTime)
-        free = get_readable_file_size(disk_usage(config_dict["DOWNLOAD_DIR"]).free)
+        metrics = get_metrics()
+        disk = metrics["dl_disk"]
         msg = BotTheme(
             "NO_ACTIVE_DL",
-            cpu=cpu_percent(),
-            free=free,
-            free_p=round(100 - disk_usage(config_dict["DOWNLOAD_DIR"]).percent, 1),
-            ram=virtual_memory().percent,
+            cpu=metrics["cpu"],
+            free=get_readable_file_size(disk.free),
+            free_p=round(100 - disk.percent, 1),
+            ram=metrics["memory"].percent,
             uptime=currentTime,
         )
         reply_message = await sendMessage(message, msg)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
 from pyrogram.filters import command, regex, user
-from asyncio import sleep, wait_for, Event, wrap_future
+from asyncio import wait_for, Event, wrap_future, current_task
 from aiohttp import ClientSession
 from aiofiles.os import path as aiopath
 from yt_dlp import YoutubeDL
@@ -42,6 +42,11 @@ from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.listeners.tasks_listener import MirrorLeechListener
 from bot.helper.ext_utils.help_messages import YT_HELP_MESSAGE
 from bot.helper.ext_utils.bulk_links import extract_bulk_links
+from bot.helper.ext_utils.batch_engine import (
+    run_batch,
+    bulk_commands,
+    multi_commands,
+)
 
 
 @new_task
@@ -272,7 +277,7 @@ async def _mdisk(link, name):
 
 
 @new_task
-async def _ytdl(client, message, isLeech=False, sameDir=None, bulk=[]):
+async def _ytdl(client, message, isLeech=False, sameDir=None):
     text = message.text.split("\n")
     input_list = text[0].split(" ")
     qual = ""
@@ -360,44 +365,27 @@ async def _ytdl(client, message, isLeech=False, sameDir=None, bulk=[]):
                 "Reply to text file or tg message that have links seperated by new line!",
             )
             return
-        b_msg = input_list[:1]
-        b_msg.append(f"{bulk[0]} -i {len(bulk)}")
-        nextmsg = await sendMessage(message, " ".join(b_msg))
-        nextmsg = await client.get_messages(
-            chat_id=message.chat.id, message_ids=nextmsg.id
+        if folder_name:
+            sameDir = {"total": len(bulk), "tasks": set(), "name": f"/{folder_name}"}
+        run_batch(
+            message,
+            "Bulk Task",
+            [(message, command) for command in bulk_commands(input_list, bulk)],
+            lambda nextmsg: _ytdl(client, nextmsg, isLeech, sameDir),
+            sameDir,
         )
-        nextmsg.from_user = message.from_user
-        _ytdl(client, nextmsg, isLeech, sameDir, bulk)
         return
 
-    if len(bulk) != 0:
-        del bulk[0]
-
-    @new_task
     async def __run_multi():
-        if multi <= 1:
-            return
-        await sleep(5)
-        if len(bulk) != 0:
-            msg = input_list[:1]
-            msg.append(f"{bulk[0]} -i {multi - 1}")
-            nextmsg = await sendMessage(message, " ".join(msg))
-        else:
-            msg = [s.strip() for s in input_list]
-            index = msg.index("-i")
-            msg[index + 1] = f"{multi - 1}"
-            nextmsg = await client.get_messages(
-                chat_id=message.chat.id, message_ids=message.reply_to_message_id + 1
+        if multi > 1:
+            run_batch(
+                message,
+                "Multi Task",
+                await multi_commands(client, message, input_list, multi),
+                lambda nextmsg: _ytdl(client, nextmsg, isLeech, sameDir),
+                sameDir,
+                current_task(),
             )
-            nextmsg = await sendMessage(nextmsg, " ".join(msg))
-        nextmsg = await client.get_messages(
-            chat_id=message.chat.id, message_ids=nextmsg.id
-        )
-        if folder_name:
-            sameDir["tasks"].add(nextmsg.id)
-        nextmsg.from_user = message.from_user
-        await sleep(5)
-        _ytdl(client, nextmsg, isLeech, sameDir, bulk)
 
     path = f"{DOWNLOAD_DIR}{message.id}{folder_name}"
 
@@ -585,11 +573,11 @@ async def _ytdl(client, message, isLeech=False, sameDir=None, bulk=[]):
     except Exception as e:
         msg = str(e).replace("<", " ").replace(">", " ")
         await sendMessage(message, f"{tag} {msg}")
-        __run_multi()
+        await __run_multi()
         await delete_links(message)
         return
 
-    __run_multi()
+    await __run_multi()
 
     if not select and (not qual and "format" in options):
         qual = options["format"]
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test Drive Index - checks the local shared drive index against a fake Drive service
+"""
+
+from tempfile import TemporaryDirectory
+
+from bot.helper.mirror_utils.upload_utils.drive_index import (
+    DriveIndex,
+    FOLDER_MIME_TYPE,
+)
+
+DRIVE_ID = "0AFakeSharedDrive"
+
+
+class Request:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+class FakeFiles:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def list(self, pageToken=None, **kwargs):
+        index = int(pageToken or 0)
+        response = {"files": self.pages[index]}
+        if index + 1 < len(self.pages):
+            response["nextPageToken"] = str(index + 1)
+        return Request(response)
+
+
+class FakeChanges:
+    def __init__(self, start_token):
+        self.start_token = start_token
+        self.feed = {}
+
+    def getStartPageToken(self, **kwargs):
+        return Request({"startPageToken": self.start_token})
+
+    def list(self, pageToken, **kwargs):
+        return Request(self.feed[pageToken])
+
+
+class FakeService:
+    """files() and changes() of Drive v3, served from memory"""
+
+    def __init__(self, pages, start_token="1"):
+        self.__files = FakeFiles(pages)
+        self.__changes = FakeChanges(start_token)
+
+    def files(self):
+        return self.__files
+
+    def changes(self):
+        return self.__changes
+
+
+def item(file_id, name, parent=DRIVE_ID, folder=False, size=0):
+    return {
+        "id": file_id,
+        "name": name,
+        "mimeType": FOLDER_MIME_TYPE if folder else "video/mp4",
+        "size": str(size),
+        "md5Checksum": None if folder else f"md5-{file_id}",
+        "parents": [parent],
+    }
+
+
+def names(result):
+    return sorted(file["name"] for file in result["files"])
+
+
+def build_index(db_path):
+    service = FakeService(
+        [
+            [
+                item("f1", "Movies", folder=True),
+                item("v1", "Big Buck Bunny.mp4", "f1", size=100),
+            ],
+            [
+                item("f2", "Bunny Extras", "f1", folder=True),
+                item("v2", "Sintel.mp4", "f2", size=200),
+            ],
+        ]
+    )
+    index = DriveIndex(db_path)
+    index.sync(service, DRIVE_ID)
+    return index, service
+
+
+def test_bootstrap(tmp_path):
+    index, _ = build_index(str(tmp_path / "index.db"))
+    assert index.ready(DRIVE_ID)
+    assert index.fresh(DRIVE_ID)
+    assert not index.ready("0AOtherDrive")
+    result = index.search(DRIVE_ID, "Sintel.mp4", True, "")
+    assert result["files"] == [
+        {
+            "id": "v2",
+            "name": "Sintel.mp4",
+            "mimeType": "video/mp4",
+            "size": 200,
+            "md5Checksum": "md5-v2",
+            "parents": ["f2"],
+            "teamDriveId": DRIVE_ID,
+        }
+    ]
+    index.mark_stale()
+    assert not index.fresh(DRIVE_ID)
+
+
+def test_update(tmp_path):
+    index, service = build_index(str(tmp_path / "index.db"))
+    service.changes().feed = {
+        "1": {
+            "changes": [
+                {"fileId": "v3", "file": item("v3", "Tears of Steel.mp4", "f1")},
+                {"fileId": "v1", "file": item("v1", "Bunny Remaster.mp4", "f1")},
+            ],
+            "nextPageToken": "2",
+        },
+        "2": {
+            "changes": [
+                {"fileId": "v2", "removed": True},
+                {
+                    "fileId": "f2",
+                    "file": dict(item("f2", "Bunny Extras"), trashed=True),
+                },
+                {"fileId": "gone", "file": None},
+            ],
+            "newStartPageToken": "3",
+        },
+    }
+    index.sync(service, DRIVE_ID)
+    assert names(index.search(DRIVE_ID, "mp4", False, "")) == [
+        "Bunny Remaster.mp4",
+        "Tears of Steel.mp4",
+    ]
+    assert index.search(DRIVE_ID, "Big Buck Bunny.mp4", True, "")["files"] == []
+    assert index.search(DRIVE_ID, "Bunny Extras", True, "")["files"] == []
+    # the next sync resumes from the saved token
+    service.changes().feed["3"] = {
+        "changes": [{"fileId": "v3", "removed": True}],
+        "newStartPageToken": "4",
+    }
+    index.sync(service, DRIVE_ID)
+    assert names(index.search(DRIVE_ID, "mp4", False, "")) == ["Bunny Remaster.mp4"]
+
+
+def test_search(tmp_path):
+    index, _ = build_index(str(tmp_path / "index.db"))
+    assert names(index.search(DRIVE_ID, "bunny", False, "")) == [
+        "Big Buck Bunny.mp4",
+        "Bunny Extras",
+    ]
+    assert names(index.search(DRIVE_ID, "bunny", False, "files")) == [
+        "Big Buck Bunny.mp4"
+    ]
+    assert names(index.search(DRIVE_ID, "bunny", False, "folders")) == ["Bunny Extras"]
+    assert names(index.search(DRIVE_ID, "buck mp4", False, "")) == [
+        "Big Buck Bunny.mp4"
+    ]
+    # stopDup wants the exact name, not a substring
+    assert index.search(DRIVE_ID, "bunny", True, "")["files"] == []
+    assert index.search(DRIVE_ID, "100%", False, "")["files"] == []
+    # folders sort first
+    result = index.search(DRIVE_ID, "", False, "")
+    assert [file["name"] for file in result["files"]][:3] == [
+        "Bunny Extras",
+        "Movies",
+        "Big Buck Bunny.mp4",
+    ]
+
+
+def test_path(tmp_path):
+    index, service = build_index(str(tmp_path / "index.db"))
+    assert index.path("v2", DRIVE_ID) == ["Movies", "Bunny Extras", "Sintel.mp4"]
+    assert index.path("v2", "f1") == ["Bunny Extras", "Sintel.mp4"]
+    assert index.path(DRIVE_ID, DRIVE_ID) == []
+    assert index.path("missing", DRIVE_ID) is None
+    service.changes().feed = {
+        "1": {
+            "changes": [{"fileId": "f1", "removed": True}],
+            "newStartPageToken": "2",
+        }
+    }
+    index.sync(service, DRIVE_ID)
+    assert index.path("v2", DRIVE_ID) is None
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+
+    for test in (test_bootstrap, test_update, test_search, test_path):
+        with TemporaryDirectory() as tmp:
+            test(Path(tmp))
+        print(f"   ✅ {test.__name__}")